@@ -0,0 +1,236 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Any, Tuple, AsyncIterator
+
+import httpx
+
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, lower is admitted first
+PRIORITY_CLASSES = {
+    "interactive": 0,  # A user is waiting on the response
+    "batch": 1,
+    "background": 2
+}
+
+class AdmissionRejected(Exception):
+    """
+    Raised when an AI call is not admitted
+    
+    Attributes:
+        retry_after: Suggested seconds before retrying
+        status_code: 429 if the wait queue is full, 503 if the call waited too long
+    """
+    
+    def __init__(self, message: str, retry_after: float, status_code: int = 503):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+class AdmissionController:
+    """
+    Bounds concurrent AI calls with an adaptive limit and a bounded priority queue
+    
+    The limit follows AIMD: it grows by one call per limit's worth of calls that
+    finish under the target latency and is cut multiplicatively when a call is
+    slower than the target or times out.
+    """
+    
+    def __init__(self, initial_limit: int = 8, min_limit: int = 1, max_limit: int = 64,
+                 max_queue: int = 64, queue_timeout: float = 30, target_latency: float = 30,
+                 backoff: float = 0.75):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.inflight = 0
+        # Waiting calls as (priority, arrival order, future)
+        self.waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        # EWMA of call latency, used to estimate Retry-After
+        self.avg_latency = target_latency / 2
+        self.rejected = 0
+        self.timed_out = 0
+        # Earliest time the next decrease may happen, so one slow burst cuts the limit once
+        self._next_decrease = 0.0
+        
+    def _priority(self, priority: str) -> int:
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+        return PRIORITY_CLASSES[priority]
+        
+    def _retry_after(self) -> float:
+        """
+        Estimate how long until the queue ahead of a new call has drained
+        """
+        waves = (len(self.waiters) + 1) / max(1.0, self.limit)
+        return min(60.0, max(1.0, waves * self.avg_latency))
+        
+    def _has_capacity(self) -> bool:
+        return self.inflight < int(self.limit)
+        
+    def check(self, priority: str = "interactive"):
+        """
+        Reject early, without queueing, if a call would be rejected right now
+        
+        Args:
+            priority: Priority class of the call
+            
+        Raises:
+            AdmissionRejected: If the wait queue is full
+        """
+        self._priority(priority)
+        if not self._has_capacity() and len(self.waiters) >= self.max_queue:
+            self.rejected += 1
+            raise AdmissionRejected("AI model is overloaded. Please try again later.",
+                                    self._retry_after(), status_code=429)
+    
+    async def acquire(self, priority: str = "interactive"):
+        """
+        Wait for a slot to call the AI model
+        
+        Args:
+            priority: Priority class of the call
+            
+        Raises:
+            AdmissionRejected: If the queue is full or no slot freed up in time
+        """
+        rank = self._priority(priority)
+        if self._has_capacity() and not self.waiters:
+            self.inflight += 1
+            return
+        self.check(priority)
+        
+        future = asyncio.get_running_loop().create_future()
+        entry = (rank, next(self._sequence), future)
+        heapq.heappush(self.waiters, entry)
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._abandon(entry)
+            self.timed_out += 1
+            raise AdmissionRejected("Timed out waiting for the AI model. Please try again later.",
+                                    self._retry_after(), status_code=503)
+        except asyncio.CancelledError:
+            self._abandon(entry)
+            raise
+            
+    def _abandon(self, entry: Tuple[int, int, asyncio.Future]):
+        """
+        Remove a waiter that gave up, handing its slot on if it was just granted one
+        """
+        future = entry[2]
+        if future.done():
+            self.release()
+            return
+        future.cancel()
+        self.waiters.remove(entry)
+        heapq.heapify(self.waiters)
+        
+    def release(self):
+        """
+        Free a slot and admit the highest-priority waiters that now fit
+        """
+        self.inflight -= 1
+        self._admit_waiters()
+        
+    def record(self, latency: float, overloaded: bool = False):
+        """
+        Adjust the limit from a finished call
+        
+        Args:
+            latency: Seconds the call took
+            overloaded: Whether the call timed out or otherwise signalled overload
+        """
+        self.avg_latency = 0.9 * self.avg_latency + 0.1 * latency
+        now = time.monotonic()
+        if overloaded or latency > self.target_latency:
+            if now >= self._next_decrease:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._next_decrease = now + min(latency, self.target_latency)
+                logger.warning(f"AI call took {latency:.1f}s, lowering concurrency limit to {int(self.limit)}")
+        elif self.inflight + 1 >= int(self.limit):
+            # Only grow while the limit is actually being used
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._admit_waiters()
+        
+    def _admit_waiters(self):
+        while self.waiters and self._has_capacity():
+            _, _, future = heapq.heappop(self.waiters)
+            if future.done():
+                continue
+            self.inflight += 1
+            future.set_result(None)
+            
+    @asynccontextmanager
+    async def slot(self, priority: str = "interactive") -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of an AI call and feed its latency back to the limit
+        
+        Args:
+            priority: Priority class of the call
+            
+        Raises:
+            AdmissionRejected: If the call is not admitted
+        """
+        with span("admission", priority=priority):
+            await self.acquire(priority)
+        start = time.monotonic()
+        overloaded = False
+        try:
+            yield
+        except httpx.TimeoutException:
+            overloaded = True
+            raise
+        finally:
+            self.release()
+            self.record(time.monotonic() - start, overloaded)
+            
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the current limit, load and rejection counters
+        
+        Returns:
+            Admission statistics
+        """
+        return {
+            "limit": int(self.limit),
+            "inflight": self.inflight,
+            "queued": len(self.waiters),
+            "avg_latency": round(self.avg_latency, 3),
+            "rejected": self.rejected,
+            "timed_out": self.timed_out
+        }
+
+def retry_after_header(error: AdmissionRejected) -> Dict[str, str]:
+    """
+    Build the Retry-After header for a rejected call
+    
+    Args:
+        error: Admission rejection
+        
+    Returns:
+        Response headers
+    """
+    return {"Retry-After": str(math.ceil(error.retry_after))}
+
+# Global admission controller for AI model calls
+admission_controller = AdmissionController(
+    initial_limit=int(os.getenv("AI_ADMISSION_INITIAL_LIMIT", "8")),
+    min_limit=int(os.getenv("AI_ADMISSION_MIN_LIMIT", "1")),
+    max_limit=int(os.getenv("AI_ADMISSION_MAX_LIMIT", "64")),
+    max_queue=int(os.getenv("AI_ADMISSION_QUEUE", "64")),
+    queue_timeout=float(os.getenv("AI_ADMISSION_QUEUE_TIMEOUT", "30")),
+    target_latency=float(os.getenv("AI_ADMISSION_TARGET_LATENCY", "30"))
+)
@@ -1,22 +1,186 @@
-import requests
+import asyncio
+import httpx
 import logging
-from typing import List, Dict, Any, Optional
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple, Callable, Awaitable
 from models import QuestionResponse
-from utils import get_adapter_for_interview_type, create_ai_prompt
+from admission import AdmissionController, AdmissionRejected, admission_controller
+from backend_pool import Backend, BackendPool, NoBackendAvailable, create_backend_pool
+from cache import TextCache, generation_cache
+from generation_budget import GenerationBudget, generation_budget
+from question_parser import (
+    StreamingQuestionParser, parse_questions, count_questions,
+    get_question_type, build_question, build_fallback_question
+)
+from utils import get_adapter_for_interview_type
+from prompt_builder import prompt_builder, estimate_tokens
+from tracing import span
+from metrics import (
+    ai_upstream_duration, ai_generations_in_flight, ai_upstream_errors, ai_prompt_characters, ai_prompt_tokens,
+    ai_output_characters, question_parse_duration, questions_parsed, questions_fallback
+)
 
 logger = logging.getLogger(__name__)
 
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight task
+    """
+    
+    def __init__(self):
+        self.calls: Dict[str, asyncio.Task] = {}
+        self.coalesced = 0
+        
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn once per key, sharing its result with every concurrent caller
+        
+        Args:
+            key: Fingerprint of the call
+            fn: Coroutine factory performing the call
+            
+        Returns:
+            Result of the shared call
+        """
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self.calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+            logger.info(f"Joining in-flight generation {key[:12]}")
+            
+        # Shield so one caller disconnecting doesn't cancel the call for the others
+        return await asyncio.shield(task)
+        
+    def _forget(self, key: str, task: asyncio.Task):
+        if self.calls.get(key) is task:
+            del self.calls[key]
+
+class ModelAPIError(Exception):
+    """Raised when the model server answers with an error status"""
+    
+    def __init__(self, status_code: int):
+        super().__init__(f"AI model API error: {status_code}")
+        self.status_code = status_code
+
 class AIClient:
     """
     Client for interacting with the AI model API
     """
     
-    def __init__(self, base_url: str = "https://derivable-agitatedly-ollie.ngrok-free.app"):
+    def __init__(self, base_url: str = "https://derivable-agitatedly-ollie.ngrok-free.app",
+                 max_connections: int = 100, max_keepalive_connections: int = 20,
+                 connect_timeout: float = 10.0, read_timeout: float = 600.0,
+                 write_timeout: float = 30.0, pool_timeout: float = 30.0,
+                 cache: Optional[TextCache] = None, pool: Optional[BackendPool] = None,
+                 admission: Optional[AdmissionController] = None, batch_size: int = 16,
+                 budget: Optional[GenerationBudget] = None):
         self.base_url = base_url
-        self.generate_endpoint = f"{base_url}/generate"
+        # Model servers requests are routed across; a single base_url by default
+        self.pool = pool or BackendPool([Backend(base_url)])
+        # Bounds concurrent model calls; cache hits and coalesced calls don't take a slot
+        self.admission = admission or AdmissionController()
+        # Sizes max_new_tokens from n and the tokens each adapter spends per question
+        self.budget = budget or GenerationBudget()
+        # Connection pool limits and per-phase timeouts for the shared HTTP client
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout,
+            read=read_timeout,  # 10 minute timeout for AI model generation
+            write=write_timeout,
+            pool=pool_timeout
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        # Cache of generated text keyed by the final prompt and sampling parameters
+        self.cache = cache
+        # In-flight upstream calls shared by identical concurrent requests
+        self.single_flight = SingleFlight()
+        # Requests per /generate_batch call; None until we know whether the server supports it
+        self.batch_size = batch_size
+        self.batch_supported: Optional[bool] = None
+        # Whether the server has /generate_stream; None until we know
+        self.stream_supported: Optional[bool] = None
         
-    def generate_questions(self, domain: str, interview_type: str, resume_text: Optional[str], 
-                          jd_text: Optional[str], n: int = 8) -> List[QuestionResponse]:
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        Shared async HTTP client, created lazily so it binds to the running event loop
+        
+        Returns:
+            Pooled keep-alive client used for all model calls
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                headers={"Content-Type": "application/json"}
+            )
+        return self._client
+        
+    async def aclose(self):
+        """
+        Stop health probes, close the shared HTTP client and release pooled connections
+        """
+        await self.pool.stop_probing()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            
+    def _build_payload(self, domain: str, interview_type: str, resume_text: Optional[str],
+                       jd_text: Optional[str], n: int) -> Dict[str, Any]:
+        """
+        Build the generation request payload for the AI model
+        
+        Args:
+            domain: Job domain
+            interview_type: Type of interview
+            resume_text: Resume content
+            jd_text: Job description
+            n: Number of questions to generate
+            
+        Returns:
+            Request payload with prompt, sampling parameters and adapter
+        """
+        # Get the appropriate adapter
+        adapter = get_adapter_for_interview_type(interview_type)
+        
+        # Create the prompt within the adapter's token budget
+        with span("prompt") as prompt_span:
+            prompt, prompt_tokens = prompt_builder.build(domain, resume_text, jd_text, interview_type, n, adapter)
+            if prompt_span:
+                prompt_span.attributes["tokens"] = prompt_tokens
+                
+        # Prepare the request payload with optimized parameters
+        return {
+            "prompt": prompt,
+            "max_new_tokens": self.budget.plan(adapter, interview_type, n),
+            "temperature": 0.3,  # Lower temperature for more focused, structured output
+            "top_p": 0.9,  # Slightly lower for more focused responses
+            "top_k": 50,  # Limit vocabulary for better structure
+            "repetition_penalty": 1.1,  # Reduce repetition
+            "return_full_text": False,
+            "adapter": adapter
+        }
+        
+    @staticmethod
+    def _fingerprint(payload: Dict[str, Any]) -> str:
+        """
+        Cache and coalescing key of a generation payload
+        
+        max_new_tokens is left out: it drifts as the token budget learns, and
+        only complete generations are cached, so any budget gives the same text.
+        """
+        return TextCache.make_key({key: value for key, value in payload.items() if key != "max_new_tokens"})
+        
+    async def generate_questions(self, domain: str, interview_type: str, resume_text: Optional[str], 
+                          jd_text: Optional[str], n: int = 8, priority: str = "interactive") -> List[QuestionResponse]:
         """
         Generate interview questions using the AI model
         
@@ -26,71 +190,552 @@ class AIClient:
             resume_text: Resume content
             jd_text: Job description
             n: Number of questions to generate
+            priority: Admission priority class (interactive, batch or background)
             
         Returns:
             List of generated questions
             
         Raises:
+            AdmissionRejected: If the call was not admitted or no backend is available
             Exception: If AI model call fails
         """
         try:
-            # Get the appropriate adapter
-            adapter = get_adapter_for_interview_type(interview_type)
-            
-            # Create the prompt
-            prompt = create_ai_prompt(domain, resume_text, jd_text, interview_type, n)
-            
-            # Prepare the request payload with optimized parameters
-            payload = {
-                "prompt": prompt,
-                "max_new_tokens": 2048,  # Increased for questions + answers
-                "temperature": 0.3,  # Lower temperature for more focused, structured output
-                "top_p": 0.9,  # Slightly lower for more focused responses
-                "top_k": 50,  # Limit vocabulary for better structure
-                "repetition_penalty": 1.1,  # Reduce repetition
-                "return_full_text": False,
-                "adapter": adapter
-            }
-            
-            logger.info(f"Calling AI model with adapter: {adapter}")
-            logger.info(f"Prompt length: {len(prompt)} characters")
-            
-            # Make the API call
-            response = requests.post(
-                self.generate_endpoint,
-                json=payload,
-                headers={"Content-Type": "application/json"},
-                timeout=600  # 10 minute timeout for AI model generation
-            )
+            payload = self._build_payload(domain, interview_type, resume_text, jd_text, n)
+            adapter = payload["adapter"]
+            
+            fingerprint = self._fingerprint(payload)
+            generated_text = self.cache.get(fingerprint) if self.cache else None
+            
+            if generated_text is not None:
+                logger.info(f"Using cached generation for adapter: {adapter}")
+                questions = self._parse_questions_from_text(generated_text, n, interview_type)
+            else:
+                # Concurrent identical requests share a single upstream call
+                questions = await self.single_flight.do(
+                    fingerprint,
+                    lambda: self._request_questions(payload, fingerprint, n, interview_type, priority)
+                )
+                questions = [question.copy() for question in questions]
+                
+            logger.info(f"Successfully generated {len(questions)} questions")
+            return questions
+            
+        except Exception as e:
+            raise self._wrap_error(e)
+            
+    async def _request_questions(self, payload: Dict[str, Any], fingerprint: str, n: int,
+                                 interview_type: str, priority: str = "interactive") -> List[QuestionResponse]:
+        """
+        Call the AI model and parse its output, caching the generated text
+        
+        Args:
+            payload: Generation request payload
+            fingerprint: Cache key of the payload
+            n: Number of questions requested
+            interview_type: Type of interview
+            priority: Admission priority class
+            
+        Returns:
+            List of generated questions
+        """
+        adapter = payload["adapter"]
+        logger.info(f"Calling AI model with adapter: {adapter}")
+        logger.info(f"Prompt length: {len(payload['prompt'])} characters, ~{estimate_tokens(payload['prompt'])} tokens")
+        
+        generated_text = await self._generate_text(payload, priority)
+        
+        self.budget.observe(adapter, generated_text, count_questions(generated_text))
+        self._cache_generation(fingerprint, generated_text, n)
+        
+        # Parse the generated text into questions
+        return self._parse_questions_from_text(generated_text, n, interview_type)
+        
+    async def _generate_text(self, payload: Dict[str, Any], priority: str) -> str:
+        """
+        Call the AI model once admitted and return the generated text
+        
+        Args:
+            payload: Generation request payload
+            priority: Admission priority class
+            
+        Returns:
+            Generated text
+        """
+        adapter = payload["adapter"]
+        
+        # Make the API call without blocking the event loop, once admitted
+        async with self.admission.slot(priority):
+            with self._measure_upstream(adapter, "single", [payload]):
+                response = await self._post_generate(payload, adapter)
+                
+        # Parse the response
+        ai_response = response.json()
+        generated_text = ai_response.get("text", "")
+        used_adapter = ai_response.get("used_adapter", adapter)
+        ai_output_characters.observe(len(generated_text), adapter=adapter or "base")
+        
+        logger.info(f"AI model response length: {len(generated_text)} characters")
+        logger.info(f"Used adapter: {used_adapter}")
+        return generated_text
+        
+    async def generate_batch(self, specs: List[Dict[str, Any]], priority: str = "batch") -> List[Any]:
+        """
+        Generate questions for many sessions, batching model calls per adapter
+        
+        Specs without a cached generation are grouped by adapter and sent to the
+        model server's /generate_batch endpoint in chunks of batch_size. If the
+        server has no such endpoint the specs are generated concurrently instead.
+        Identical specs share one generation. At most the admission limit of
+        model calls are made at a time, so a large batch waits its turn instead
+        of overflowing the admission queue.
+        
+        Args:
+            specs: Dicts with domain, interview_type, resume_text, jd_text and n
+            priority: Admission priority class (interactive, batch or background)
+            
+        Returns:
+            For each spec, its list of questions or the Exception that failed it
+        """
+        results: List[Any] = [None] * len(specs)
+        payloads: Dict[str, Dict[str, Any]] = {}
+        waiting: Dict[str, List[int]] = {}
+        
+        for i, spec in enumerate(specs):
+            payload = self._build_payload(spec["domain"], spec["interview_type"], spec["resume_text"],
+                                          spec["jd_text"], spec["n"])
+            fingerprint = self._fingerprint(payload)
+            cached_text = self.cache.get(fingerprint) if self.cache else None
+            if cached_text is not None:
+                results[i] = self._parse_questions_from_text(cached_text, spec["n"], spec["interview_type"])
+                continue
+            payloads[fingerprint] = payload
+            waiting.setdefault(fingerprint, []).append(i)
+            
+        groups: Dict[str, List[str]] = {}
+        for fingerprint, payload in payloads.items():
+            groups.setdefault(payload["adapter"], []).append(fingerprint)
+        chunks = [
+            fingerprints[start:start + self.batch_size]
+            for fingerprints in groups.values()
+            for start in range(0, len(fingerprints), self.batch_size)
+        ]
+        logger.info(f"Generating {len(payloads)} of {len(specs)} specs in {len(chunks)} batches across {len(groups)} adapters")
+        
+        calls = asyncio.Semaphore(max(1, int(self.admission.limit)))
+        outcomes = await asyncio.gather(*[
+            self._generate_chunk([payloads[fingerprint] for fingerprint in chunk], priority, calls)
+            for chunk in chunks
+        ])
+        for chunk, texts in zip(chunks, outcomes):
+            for fingerprint, text in zip(chunk, texts):
+                indexes = waiting[fingerprint]
+                if isinstance(text, Exception):
+                    error = self._wrap_error(text)
+                    for i in indexes:
+                        results[i] = error
+                    continue
+                self.budget.observe(payloads[fingerprint]["adapter"], text, count_questions(text))
+                self._cache_generation(fingerprint, text, specs[indexes[0]]["n"])
+                for i in indexes:
+                    results[i] = self._parse_questions_from_text(text, specs[i]["n"], specs[i]["interview_type"])
+        return results
+        
+    async def _generate_chunk(self, payloads: List[Dict[str, Any]], priority: str,
+                              calls: asyncio.Semaphore) -> List[Any]:
+        """
+        Generate text for payloads sharing an adapter, in one batched call if the server supports it
+        
+        Args:
+            payloads: Generation request payloads with the same adapter
+            priority: Admission priority class
+            calls: Bounds the model calls the whole batch makes at once
+            
+        Returns:
+            Generated text or the Exception raised, for each payload
+        """
+        adapter = payloads[0]["adapter"]
+        if len(payloads) > 1 and self.batch_supported is not False:
+            try:
+                async with calls, self.admission.slot(priority):
+                    with self._measure_upstream(adapter, "batch", payloads):
+                        response = await self._post_generate({"requests": payloads}, adapter, "/generate_batch")
+                results = response.json().get("results", [])
+                if len(results) != len(payloads):
+                    raise Exception(f"AI model returned {len(results)} results for {len(payloads)} requests")
+                self.batch_supported = True
+                for result in results:
+                    ai_output_characters.observe(len(result.get("text", "")), adapter=adapter)
+                logger.info(f"Generated {len(payloads)} requests in one batch with adapter: {adapter}")
+                return [result.get("text", "") for result in results]
+            except ModelAPIError as e:
+                if e.status_code not in (404, 405):
+                    return [e] * len(payloads)
+                logger.info("AI model has no /generate_batch endpoint, generating requests individually")
+                self.batch_supported = False
+            except Exception as e:
+                return [e] * len(payloads)
+                
+        async def generate(payload: Dict[str, Any]) -> str:
+            async with calls:
+                return await self._generate_text(payload, priority)
+                
+        return await asyncio.gather(*[generate(payload) for payload in payloads], return_exceptions=True)
+        
+    async def stream_questions(self, domain: str, interview_type: str, resume_text: Optional[str],
+                               jd_text: Optional[str], n: int = 8,
+                               priority: str = "interactive") -> AsyncIterator[QuestionResponse]:
+        """
+        Generate interview questions, yielding each one as soon as the model has finished it
+        
+        The model server's /generate_stream endpoint streams the generated text
+        as plain-text chunks. If the server has no such endpoint the text is
+        generated in one /generate call instead and its questions are yielded
+        once it has arrived.
+        
+        Args:
+            domain: Job domain
+            interview_type: Type of interview
+            resume_text: Resume content
+            jd_text: Job description
+            n: Number of questions to generate
+            priority: Admission priority class (interactive, batch or background)
+            
+        Yields:
+            Generated questions in order, padded with fallbacks up to n
+            
+        Raises:
+            AdmissionRejected: If the call was not admitted or no backend is available
+            Exception: If AI model call fails
+        """
+        question_type = get_question_type(interview_type)
+        parser = StreamingQuestionParser()
+        count = 0
+        
+        try:
+            payload = self._build_payload(domain, interview_type, resume_text, jd_text, n)
+            cache_key = self._fingerprint(payload) if self.cache else None
+            cached_text = self.cache.get(cache_key) if self.cache else None
+            
+            if cached_text is not None:
+                logger.info(f"Using cached generation for adapter: {payload['adapter']}")
+                for question in self._parse_questions_from_text(cached_text, n, interview_type):
+                    yield question
+                return
+                
+            logger.info(f"Streaming from AI model with adapter: {payload['adapter']}")
+            logger.info(f"Prompt length: {len(payload['prompt'])} characters, ~{estimate_tokens(payload['prompt'])} tokens")
+            
+            chunks = []
+            if self.stream_supported is not False:
+                try:
+                    async for question_text, predicted_answer in self._stream_pairs(payload, priority, n, parser, chunks):
+                        yield build_question(count, question_text, predicted_answer, question_type)
+                        count += 1
+                except ModelAPIError as e:
+                    if e.status_code not in (404, 405):
+                        raise
+                    logger.info("AI model has no /generate_stream endpoint, generating questions in one call")
+                    self.stream_supported = False
+                    
+            if self.stream_supported is False and not chunks:
+                async with self.admission.slot(priority):
+                    with self._measure_upstream(payload["adapter"], "single", [payload]):
+                        response = await self._post_generate(payload, payload["adapter"])
+                chunks.append(response.json().get("text", ""))
+                for question_text, predicted_answer in parser.feed(chunks[0]):
+                    if count < n:
+                        yield build_question(count, question_text, predicted_answer, question_type)
+                        count += 1
+                        
+            for question_text, predicted_answer in parser.finish():
+                if count < n:
+                    yield build_question(count, question_text, predicted_answer, question_type)
+                    count += 1
+                    
+            generated_text = "".join(chunks)
+            ai_output_characters.observe(len(generated_text), adapter=payload["adapter"])
+            self.budget.observe(payload["adapter"], generated_text, count)
+            self._cache_generation(cache_key, generated_text, n)
+            
+        except Exception as e:
+            raise self._wrap_error(e)
+            
+        # If we didn't get enough questions, create fallbacks
+        adapter = get_adapter_for_interview_type(interview_type)
+        questions_parsed.inc(count, adapter=adapter)
+        questions_fallback.inc(n - count, adapter=adapter)
+        if count < n:
+            logger.warning(f"Only got {count} streamed questions, expected {n}")
+        for i in range(count, n):
+            yield build_fallback_question(i, question_type)
+            
+    async def _stream_pairs(self, payload: Dict[str, Any], priority: str, n: int,
+                            parser: StreamingQuestionParser, chunks: List[str]) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Stream question and answer pairs from the model as they complete
+        
+        The upstream stream is read by its own task, which holds the admission
+        slot only until the model has finished (or n pairs are complete), so a
+        slow client neither keeps the slot nor inflates the latency fed back to
+        the admission limit. Pairs are handed to the caller through a queue.
+        
+        Args:
+            payload: Generation request payload
+            priority: Admission priority class
+            n: Number of pairs to read at most
+            parser: Parser fed with the streamed text
+            chunks: List the raw text chunks are appended to
+            
+        Yields:
+            Question text and predicted answer of each completed pair
+        """
+        pairs: asyncio.Queue = asyncio.Queue()
+        
+        async def read():
+            found = 0
+            try:
+                async with self.admission.slot(priority):
+                    with self._measure_upstream(payload["adapter"], "stream", [payload]):
+                        async with self._open_stream(payload) as response:
+                            self.stream_supported = True
+                            async for chunk in response.aiter_text():
+                                chunks.append(chunk)
+                                for pair in parser.feed(chunk):
+                                    if found < n:
+                                        pairs.put_nowait(pair)
+                                        found += 1
+                                if found >= n:
+                                    # All n pairs are complete; closing the stream stops the generation
+                                    logger.info(f"Stopping stream early after {n} questions")
+                                    break
+            finally:
+                pairs.put_nowait(None)
+                
+        reader = asyncio.create_task(read())
+        try:
+            while True:
+                pair = await pairs.get()
+                if pair is None:
+                    break
+                yield pair
+            await reader
+        finally:
+            # Stops the reader (freeing its slot) if the caller stopped early
+            reader.cancel()
+            
+    async def complete(self, prompt: str, adapter: Optional[str], max_new_tokens: int = 256,
+                       temperature: float = 0.1, priority: str = "interactive") -> str:
+        """
+        Generate free-form text for a prompt, e.g. to grade an answer
+        
+        Goes through admission and the backend pool like question generation,
+        but the output is returned as is, without parsing or caching.
+        
+        Args:
+            prompt: Prompt text
+            adapter: Adapter to generate with, None for the base model
+            max_new_tokens: Token budget for the output
+            temperature: Sampling temperature
+            priority: Admission priority class (interactive, batch or background)
+            
+        Returns:
+            Generated text
+            
+        Raises:
+            AdmissionRejected: If the call was not admitted or no backend is available
+            Exception: If AI model call fails
+        """
+        payload = {
+            "prompt": prompt,
+            "max_new_tokens": max_new_tokens,
+            "temperature": temperature,
+            "top_p": 0.9,
+            "top_k": 50,
+            "repetition_penalty": 1.1,
+            "return_full_text": False,
+            "adapter": adapter
+        }
+        try:
+            return await self._generate_text(payload, priority)
+        except Exception as e:
+            raise self._wrap_error(e)
             
+    async def _post_generate(self, body: Dict[str, Any], adapter: str, path: str = "/generate") -> httpx.Response:
+        """
+        POST a generation to the pool, failing over to the next backend on errors
+        
+        Connection errors, timeouts and 5xx responses count against the
+        backend's circuit breaker and the request is retried on another backend.
+        
+        Args:
+            body: Request body
+            adapter: Adapter the request needs, for routing
+            path: Model server endpoint
+            
+        Returns:
+            Successful response
+            
+        Raises:
+            ModelAPIError: If the model rejected the request
+            Exception: If every backend failed
+        """
+        tried = set()
+        last_error: Optional[Exception] = None
+        
+        while True:
+            try:
+                backend = self.pool.choose(adapter, tried)
+            except NoBackendAvailable:
+                if last_error is not None:
+                    raise last_error
+                raise
+            tried.add(backend.url)
+            
+            try:
+                with span("upstream", backend=backend.url, path=path):
+                    async with self.pool.lease(backend):
+                        response = await self.client.post(f"{backend.url}{path}", json=body)
+            except httpx.TransportError as e:
+                logger.warning(f"Backend {backend.url} failed: {type(e).__name__}")
+                self.pool.record_failure(backend)
+                last_error = e
+                continue
+                
+            if response.status_code >= 500:
+                logger.error(f"AI model at {backend.url} returned status {response.status_code}: {response.text}")
+                self.pool.record_failure(backend)
+                last_error = ModelAPIError(response.status_code)
+                continue
             if response.status_code != 200:
                 logger.error(f"AI model returned status {response.status_code}: {response.text}")
-                raise Exception(f"AI model API error: {response.status_code}")
+                raise ModelAPIError(response.status_code)
+                
+            self.pool.record_success(backend, adapter)
+            return response
             
-            # Parse the response
-            ai_response = response.json()
-            generated_text = ai_response.get("text", "")
-            used_adapter = ai_response.get("used_adapter", adapter)
+    @asynccontextmanager
+    async def _open_stream(self, payload: Dict[str, Any]) -> AsyncIterator[httpx.Response]:
+        """
+        Open a streaming generation on the pool
+        
+        Fails over like _post_generate until the model starts responding; errors
+        after that are raised to the caller since output was already consumed.
+        
+        Args:
+            payload: Generation request payload
             
-            logger.info(f"AI model response length: {len(generated_text)} characters")
-            logger.info(f"Used adapter: {used_adapter}")
+        Yields:
+            Streaming response with status 200
+        """
+        adapter = payload["adapter"]
+        tried = set()
+        last_error: Optional[Exception] = None
+        
+        while True:
+            try:
+                backend = self.pool.choose(adapter, tried)
+            except NoBackendAvailable:
+                if last_error is not None:
+                    raise last_error
+                raise
+            tried.add(backend.url)
             
-            # Parse the generated text into questions
-            questions = self._parse_questions_from_text(generated_text, n, interview_type)
+            async with self.pool.lease(backend):
+                request = self.client.build_request("POST", f"{backend.url}/generate_stream", json=payload)
+                try:
+                    with span("upstream", backend=backend.url, path="/generate_stream"):
+                        response = await self.client.send(request, stream=True)
+                except httpx.TransportError as e:
+                    logger.warning(f"Backend {backend.url} failed: {type(e).__name__}")
+                    self.pool.record_failure(backend)
+                    last_error = e
+                    continue
+                    
+                try:
+                    if response.status_code != 200:
+                        body = await response.aread()
+                        logger.error(f"AI model at {backend.url} returned status {response.status_code}: {body.decode(errors='replace')}")
+                        if response.status_code < 500:
+                            raise ModelAPIError(response.status_code)
+                        self.pool.record_failure(backend)
+                        last_error = ModelAPIError(response.status_code)
+                        continue
+                        
+                    try:
+                        yield response
+                    except httpx.TransportError:
+                        self.pool.record_failure(backend)
+                        raise
+                    self.pool.record_success(backend, adapter)
+                    return
+                finally:
+                    await response.aclose()
+                    
+    @contextmanager
+    def _measure_upstream(self, adapter: Optional[str], mode: str, payloads: List[Dict[str, Any]]):
+        """
+        Record latency, in-flight count, prompt sizes and failures of a model call
+        
+        Args:
+            adapter: Adapter used for the call, None for the base model
+            mode: "single", "batch" or "stream"
+            payloads: Generation payloads sent in the call
+        """
+        adapter = adapter or "base"
+        for payload in payloads:
+            ai_prompt_characters.observe(len(payload["prompt"]), adapter=adapter)
+            ai_prompt_tokens.observe(estimate_tokens(payload["prompt"]), adapter=adapter)
+        ai_generations_in_flight.inc(adapter=adapter)
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            ai_upstream_errors.inc(adapter=adapter, mode=mode)
+            raise
+        finally:
+            ai_generations_in_flight.dec(adapter=adapter)
+            ai_upstream_duration.observe(time.perf_counter() - start, adapter=adapter, mode=mode)
             
-            logger.info(f"Successfully generated {len(questions)} questions")
-            return questions
+    def _wrap_error(self, e: Exception) -> Exception:
+        """
+        Log a failed model call and turn it into the error reported to API clients
+        
+        Args:
+            e: Exception raised by the call
             
-        except requests.exceptions.Timeout:
+        Returns:
+            AdmissionRejected if the call should be retried later, otherwise an Exception with a user-facing message
+        """
+        if isinstance(e, AdmissionRejected):
+            return e
+        if isinstance(e, NoBackendAvailable):
+            logger.error(str(e))
+            return AdmissionRejected(str(e), self.pool.reset_timeout)
+        if isinstance(e, httpx.TimeoutException):
             logger.error("AI model request timed out")
-            raise Exception("AI model request timed out. Please try again.")
-        except requests.exceptions.ConnectionError:
+            return Exception("AI model request timed out. Please try again.")
+        if isinstance(e, httpx.ConnectError):
             logger.error("Failed to connect to AI model")
-            raise Exception("Failed to connect to AI model. Please check if the service is running.")
-        except Exception as e:
-            logger.error(f"Error calling AI model: {str(e)}")
-            raise Exception(f"AI model error: {str(e)}")
-    
+            return Exception("Failed to connect to AI model. Please check if the service is running.")
+        logger.error(f"Error calling AI model: {str(e)}")
+        return Exception(f"AI model error: {str(e)}")
+        
+    def _cache_generation(self, cache_key: Optional[str], generated_text: str, n: int):
+        """
+        Cache generated text if it contains all requested questions
+        
+        Args:
+            cache_key: Key from the generation payload, None when caching is disabled
+            generated_text: Raw text from AI model
+            n: Number of questions requested
+        """
+        if self.cache is None or cache_key is None:
+            return
+        # Don't cache truncated output that would be padded with placeholder questions
+        if count_questions(generated_text) < n:
+            return
+        self.cache.set(cache_key, generated_text)
+        
     def _parse_questions_from_text(self, text: str, expected_count: int, interview_type: str = "Technical") -> List[QuestionResponse]:
         """
         Parse the AI-generated text into Question objects with predicted answers
@@ -103,56 +748,28 @@ class AIClient:
         Returns:
             List of Question objects with predicted answers
         """
-        import re
-        
-        # Simple regex to find Q1:, Q2:, etc. patterns
-        question_pattern = r'Q(\d+):\s*(.*?)(?=Q\d+:|$)'
-        matches = re.findall(question_pattern, text, re.DOTALL)
-        
-        questions = []
-        question_type_map = {
-            "HR": "hr",
-            "Behavioral": "behavioral", 
-            "Technical": "technical",
-            "Coding": "coding",
-            "All": "mixed"
-        }
-        question_type = question_type_map.get(interview_type, "interview_question")
+        adapter = get_adapter_for_interview_type(interview_type)
+        with question_parse_duration.time(adapter=adapter), span("parse"):
+            questions, parsed = parse_questions(text, expected_count, interview_type)
+        questions_parsed.inc(parsed, adapter=adapter)
+        questions_fallback.inc(expected_count - parsed, adapter=adapter)
         
-        for i, (q_num, content) in enumerate(matches):
-            content = content.strip()
+        # If we didn't get enough questions, they were padded with fallbacks
+        if parsed < expected_count:
+            logger.warning(f"Only got {parsed} questions, expected {expected_count}")
             
-            # Look for corresponding answer (A1:, A2:, etc.)
-            answer_pattern = rf'A{q_num}:\s*(.*?)(?=\n|$)'
-            answer_match = re.search(answer_pattern, content, re.DOTALL)
-            
-            if answer_match:
-                predicted_answer = answer_match.group(1).strip()
-                # Remove answer from question text
-                question_text = re.sub(rf'\n?A{q_num}:.*$', '', content, flags=re.DOTALL).strip()
-            else:
-                question_text = content
-                predicted_answer = None
-            
-            questions.append(QuestionResponse(
-                id=f"q_{i + 1}",
-                question_text=question_text,
-                question_type=question_type,
-                predicted_answer=predicted_answer
-            ))
-        
-        # If we didn't get enough questions, create fallbacks
-        if len(questions) < expected_count:
-            logger.warning(f"Only got {len(questions)} questions, expected {expected_count}")
-            for i in range(len(questions), expected_count):
-                questions.append(QuestionResponse(
-                    id=f"q_{i + 1}",
-                    question_text=f"Please provide a detailed answer to this {i + 1}th interview question.",
-                    question_type=question_type,
-                    predicted_answer="This is a sample question. Please provide a comprehensive answer based on your experience and knowledge."
-                ))
-        
-        return questions[:expected_count]
+        return questions
 
 # Global AI client instance
-ai_client = AIClient()
+ai_client = AIClient(
+    base_url=os.getenv("AI_MODEL_URL", "https://derivable-agitatedly-ollie.ngrok-free.app"),
+    pool=create_backend_pool(),
+    admission=admission_controller,
+    batch_size=int(os.getenv("AI_BATCH_SIZE", "16")),
+    budget=generation_budget,
+    max_connections=int(os.getenv("AI_MAX_CONNECTIONS", "100")),
+    max_keepalive_connections=int(os.getenv("AI_MAX_KEEPALIVE_CONNECTIONS", "20")),
+    connect_timeout=float(os.getenv("AI_CONNECT_TIMEOUT", "10")),
+    read_timeout=float(os.getenv("AI_READ_TIMEOUT", "600")),
+    cache=generation_cache
+)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for parsing model output into questions
+
+Compares the previous per-question regex parser with the single-pass parser in
+question_parser.py over the sample outputs in benchmarks/data/model_outputs.jsonl,
+at their original size and tiled into long outputs.
+
+Usage:
+    python benchmarks/bench_parser.py [--repeat 200]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models import QuestionResponse
+from question_parser import parse_questions, count_questions
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "model_outputs.jsonl")
+
+def legacy_parse(text: str, expected_count: int):
+    """Previous AIClient._parse_questions_from_text, kept here as the baseline"""
+    matches = re.findall(r'Q(\d+):\s*(.*?)(?=Q\d+:|$)', text, re.DOTALL)
+    questions = []
+    for i, (q_num, content) in enumerate(matches):
+        content = content.strip()
+        answer_match = re.search(rf'A{q_num}:\s*(.*?)(?=\n|$)', content, re.DOTALL)
+        if answer_match:
+            predicted_answer = answer_match.group(1).strip()
+            question_text = re.sub(rf'\n?A{q_num}:.*$', '', content, flags=re.DOTALL).strip()
+        else:
+            question_text = content
+            predicted_answer = None
+        questions.append(QuestionResponse(
+            id=f"q_{i + 1}",
+            question_text=question_text,
+            question_type="technical",
+            predicted_answer=predicted_answer
+        ))
+    for i in range(len(questions), expected_count):
+        questions.append(QuestionResponse(
+            id=f"q_{i + 1}",
+            question_text=f"Please provide a detailed answer to this {i + 1}th interview question.",
+            question_type="technical",
+            predicted_answer="This is a sample question. Please provide a comprehensive answer based on your experience and knowledge."
+        ))
+    return questions[:expected_count]
+
+def tile(text: str, copies: int) -> str:
+    """Repeat a Q1..Qk output into a Q1..Q(k*copies) output"""
+    pairs = re.split(r'(?=(?:\*\*)?Q(?:uestion)?\s*\d+)', text)
+    pairs = [p for p in pairs if re.match(r'(?:\*\*)?Q(?:uestion)?\s*\d+', p)]
+    out = []
+    number = 0
+    for _ in range(copies):
+        for pair in pairs:
+            number += 1
+            out.append(re.sub(r'(Q(?:uestion)?\s*|A(?:nswer)?\s*)\d+', rf'\g<1>{number}', pair))
+    return "".join(out)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model output parsing")
+    parser.add_argument("--repeat", type=int, default=200, help="Parses per measurement")
+    args = parser.parse_args()
+    
+    with open(DATA_FILE) as f:
+        samples = [json.loads(line) for line in f if line.strip()]
+        
+    results = []
+    for sample in samples:
+        for copies in (1, 10):
+            text = tile(sample["text"], copies) if copies > 1 else sample["text"]
+            expected = count_questions(text)
+            legacy = timeit.timeit(lambda: legacy_parse(text, expected), number=args.repeat) / args.repeat
+            current = timeit.timeit(lambda: parse_questions(text, expected, sample["interview_type"]), number=args.repeat) / args.repeat
+            _, parsed = parse_questions(text, expected, sample["interview_type"])
+            results.append({
+                "interview_type": sample["interview_type"],
+                "chars": len(text),
+                "legacy_questions": sum(1 for q in legacy_parse(text, expected) if not q.question_text.startswith("Please provide")),
+                "parsed_questions": parsed,
+                "legacy_us": round(legacy * 1e6, 1),
+                "current_us": round(current * 1e6, 1),
+                "speedup": round(legacy / current, 2)
+            })
+            
+    for r in results:
+        print(f"{r['interview_type']:<11} {r['chars']:>7} chars  "
+              f"legacy {r['legacy_us']:>9.1f}us ({r['legacy_questions']:>3} q)  "
+              f"current {r['current_us']:>9.1f}us ({r['parsed_questions']:>3} q)  x{r['speedup']}")
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the in-memory session store
+
+Creates sessions the way the API does (questions parsed from the sample outputs
+in benchmarks/data/model_outputs.jsonl, a resume per candidate reused across
+that candidate's sessions, a job description per role, answers to half the
+questions) and measures the bytes each session takes with tracemalloc, in the
+previous layout (one dict per session holding its own copy of every text) and
+in InMemorySessionStore (slotted records with texts shared through a blob table).
+
+Usage:
+    python benchmarks/bench_session_memory.py [--sizes 10000,100000] [--sessions-per-candidate 5]
+"""
+
+import argparse
+import bisect
+import gc
+import heapq
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from question_parser import parse_questions, count_questions
+from session_store import InMemorySessionStore, INDEXED_FIELDS
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "model_outputs.jsonl")
+DOMAINS = ["Data Scientist", "Software Engineer", "Product Manager", "Data Analyst", "ML Engineer"]
+SKILLS = ["Python", "SQL", "Spark", "AWS", "Docker", "Kubernetes", "PyTorch", "Tableau", "Airflow", "React"]
+
+class LegacyInMemoryStore:
+    """Previous InMemorySessionStore layout: session dicts stored as given, kept here as the baseline"""
+    
+    def __init__(self):
+        self.sessions = {}
+        self.expiry_heap = []
+        self.indexes = {field: {} for field in INDEXED_FIELDS}
+        self.order = []
+        
+    def create_session(self, session):
+        session_id = session["session_id"]
+        self.sessions[session_id] = session
+        heapq.heappush(self.expiry_heap, (time.monotonic(), session_id))
+        for field in INDEXED_FIELDS:
+            self.indexes[field].setdefault(session[field], set()).add(session_id)
+        bisect.insort(self.order, (session["created_at"], session_id))
+
+def fresh(text):
+    """Copy a string, as every request decodes its own copy of the same text"""
+    return None if text is None else (text + " ")[:-1]
+
+def make_resume(rng, candidate):
+    lines = [f"Candidate {candidate}", "Experience"]
+    for year in range(rng.randint(3, 6)):
+        skills = ", ".join(rng.sample(SKILLS, 3))
+        lines.append(f"- {rng.randint(1, 5)} years building data products with {skills}; "
+                     f"led projects improving latency and reliability for team {year}.")
+    lines.append("Education: B.Sc. Computer Science")
+    return "\n".join(lines * 4)
+
+def make_sessions(count, sessions_per_candidate, seed):
+    """Yield session dicts as SessionManager builds them, with answers to half the questions"""
+    rng = random.Random(seed)
+    with open(DATA_FILE) as f:
+        samples = [json.loads(line) for line in f if line.strip()]
+    parsed = []
+    for sample in samples:
+        questions, _ = parse_questions(sample["text"], count_questions(sample["text"]), sample["interview_type"])
+        parsed.append((sample["interview_type"], sample["adapter"], [q.dict() for q in questions]))
+    descriptions = [f"{domain}: " + " ".join(rng.sample(SKILLS, 5)) * 20 for domain in DOMAINS]
+    
+    resume = None
+    for i in range(count):
+        if i % sessions_per_candidate == 0:
+            resume = make_resume(rng, i // sessions_per_candidate)
+        interview_type, adapter, questions = parsed[i % len(parsed)]
+        domain = rng.randrange(len(DOMAINS))
+        session_questions = [{key: fresh(value) for key, value in q.items()} for q in questions]
+        yield {
+            "session_id": f"{i:08d}-0000-0000-0000-000000000000",
+            "domain": fresh(DOMAINS[domain]),
+            "interview_type": fresh(interview_type),
+            "resume_text": fresh(resume),
+            "job_description": fresh(descriptions[domain]),
+            "questions": session_questions,
+            "adapter_used": fresh(adapter),
+            "total_questions": len(session_questions),
+            "questions_answered": len(session_questions) // 2,
+            "answers": [
+                {"question_id": q["id"], "answer_text": f"My answer {i}: " + q["question_text"][:120], "time_spent_seconds": 60}
+                for q in session_questions[::2]
+            ],
+            "total_score": None,
+            "created_at": f"2024-01-01T00:00:{i:08d}",
+            "status": "active",
+            "error": None
+        }
+
+def measure(store_class, count, sessions_per_candidate, seed):
+    """Bytes allocated by a store holding count sessions"""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    store = store_class()
+    for session in make_sessions(count, sessions_per_candidate, seed):
+        store.create_session(session)
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    blobs = store.blobs.stats() if hasattr(store, "blobs") else None
+    del store
+    gc.collect()
+    return used, blobs
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark session store memory")
+    parser.add_argument("--sizes", default="10000,100000", help="Comma-separated session counts")
+    parser.add_argument("--sessions-per-candidate", type=int, default=5, help="Sessions sharing one resume")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    results = []
+    for count in (int(size) for size in args.sizes.split(",")):
+        legacy, _ = measure(LegacyInMemoryStore, count, args.sessions_per_candidate, args.seed)
+        current, blobs = measure(InMemorySessionStore, count, args.sessions_per_candidate, args.seed)
+        results.append({
+            "sessions": count,
+            "legacy_bytes_per_session": round(legacy / count),
+            "current_bytes_per_session": round(current / count),
+            "legacy_total_mb": round(legacy / 2 ** 20, 1),
+            "current_total_mb": round(current / 2 ** 20, 1),
+            "reduction": round(legacy / current, 2),
+            "blobs": blobs
+        })
+        
+    for r in results:
+        print(f"{r['sessions']:>7} sessions  legacy {r['legacy_bytes_per_session']:>7} B/session ({r['legacy_total_mb']:>7.1f} MB)  "
+              f"current {r['current_bytes_per_session']:>7} B/session ({r['current_total_mb']:>7.1f} MB)  x{r['reduction']}")
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Load test for the API at a fixed concurrency
+
+Workers loop over a weighted mix of POST /gen_questions, POST
+/sessions/{id}/answers and GET /sessions for a fixed duration, then report
+p50/p95/p99 latency, throughput and errors per operation plus the RSS of the
+API process. Results are written as JSON; pass a previous result with
+--compare to print the differences.
+
+With --spawn the stub model server (benchmarks/stub_server.py) and the API are
+started on free local ports, so runs are reproducible on one machine.
+
+Usage:
+    python benchmarks/load_test.py --spawn [--concurrency 16] [--duration 30]
+        [--mix gen=1,answers=3,list=1] [--stub-latency 0.2] [--output results.json]
+        [--compare previous.json]
+    python benchmarks/load_test.py --url http://localhost:8000 [--pid <api pid>] ...
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DOMAINS = ["Data Scientist", "Software Engineer", "Product Manager", "DevOps Engineer", "Data Analyst"]
+INTERVIEW_TYPES = ["HR", "Behavioral", "Technical", "Coding", "All"]
+ANSWER_TEXT = (
+    "I would start by clarifying the requirements, then measure where the time goes before "
+    "changing anything, and validate the fix against the original workload."
+)
+
+def parse_mix(spec):
+    """Parse "gen=1,answers=3,list=1" into operation weights"""
+    mix = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        operation, _, weight = item.partition("=")
+        if operation not in ("gen", "answers", "list"):
+            raise ValueError(f"Unknown operation in --mix: {operation}")
+        mix[operation] = float(weight or 1)
+    return mix
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+def read_rss_mb(pid):
+    """Resident set size of a process in MB, from /proc (Linux only)"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+class LoadTest:
+    """
+    Runs workers against the API and collects per-operation latencies
+    """
+    
+    def __init__(self, url, concurrency, duration, mix, n, mode, repeat_ratio, seed):
+        self.url = url.rstrip("/")
+        self.concurrency = concurrency
+        self.duration = duration
+        self.mix = mix
+        self.n = n
+        self.mode = mode
+        self.repeat_ratio = repeat_ratio
+        self.random = random.Random(seed)
+        self.latencies = {operation: [] for operation in mix}
+        self.errors = {operation: {} for operation in mix}
+        # (session_id, question ids) of sessions created during the run
+        self.sessions = []
+        self.generated = 0
+        
+    async def run(self):
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(base_url=self.url, timeout=120, limits=limits) as client:
+            deadline = time.perf_counter() + self.duration
+            await asyncio.gather(*[self.worker(client, deadline) for _ in range(self.concurrency)])
+            
+    async def worker(self, client, deadline):
+        operations = list(self.mix)
+        weights = [self.mix[operation] for operation in operations]
+        while time.perf_counter() < deadline:
+            operation = self.random.choices(operations, weights)[0]
+            if operation == "answers" and not self.sessions:
+                operation = "gen" if "gen" in self.mix else "list"
+            start = time.perf_counter()
+            try:
+                response = await getattr(self, operation)(client)
+                outcome = response.status_code
+            except httpx.HTTPError as e:
+                outcome = type(e).__name__
+            elapsed = time.perf_counter() - start
+            if outcome == 200:
+                self.latencies[operation].append(elapsed)
+            else:
+                self.errors[operation][str(outcome)] = self.errors[operation].get(str(outcome), 0) + 1
+                
+    async def gen(self, client):
+        # Unique domains miss the generation cache; repeated ones measure cache hits
+        if self.generated and self.random.random() < self.repeat_ratio:
+            domain = f"{self.random.choice(DOMAINS)} #{self.random.randrange(self.generated)}"
+        else:
+            domain = f"{self.random.choice(DOMAINS)} #{self.generated}"
+            self.generated += 1
+        response = await client.post("/gen_questions", data={
+            "domain": domain,
+            "interview_type": self.random.choice(INTERVIEW_TYPES),
+            "n": str(self.n),
+            "mode": self.mode
+        })
+        if response.status_code == 200:
+            body = response.json()
+            self.sessions.append((body["session_id"], [q["id"] for q in body["questions"]]))
+        return response
+        
+    async def answers(self, client):
+        session_id, question_ids = self.random.choice(self.sessions)
+        answered = self.random.sample(question_ids, k=max(1, len(question_ids) // 2))
+        return await client.post(f"/sessions/{session_id}/answers", json={"answers": [
+            {"question_id": question_id, "answer_text": ANSWER_TEXT, "time_spent_seconds": self.random.randint(30, 300)}
+            for question_id in answered
+        ]})
+        
+    async def list(self, client):
+        return await client.get("/sessions", params={"limit": 50})
+        
+    def summary(self, elapsed):
+        operations = {}
+        for operation, latencies in self.latencies.items():
+            latencies.sort()
+            errors = sum(self.errors[operation].values())
+            operations[operation] = {
+                "requests": len(latencies) + errors,
+                "errors": self.errors[operation],
+                "throughput_rps": round(len(latencies) / elapsed, 2),
+                "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+                **{
+                    f"p{int(fraction * 100)}_ms": round(percentile(latencies, fraction) * 1000, 2) if latencies else None
+                    for fraction in (0.5, 0.95, 0.99)
+                },
+                "max_ms": round(latencies[-1] * 1000, 2) if latencies else None
+            }
+        completed = sum(len(latencies) for latencies in self.latencies.values())
+        return {"operations": operations, "throughput_rps": round(completed / elapsed, 2)}
+
+async def sample_rss(pid, samples, stop):
+    while not stop.is_set():
+        rss = read_rss_mb(pid)
+        if rss is not None:
+            samples.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=0.5)
+        except asyncio.TimeoutError:
+            pass
+
+def wait_until_up(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+def spawn(args, workdir):
+    """Start the stub model server and the API; returns (api url, api pid, processes)"""
+    stub_port, api_port = free_port(), free_port()
+    stub = subprocess.Popen([
+        sys.executable, os.path.join(ROOT, "benchmarks", "stub_server.py"), "--port", str(stub_port),
+        "--latency", str(args.stub_latency), "--tokens-per-second", str(args.stub_tokens_per_second),
+        "--failure-rate", str(args.stub_failure_rate), "--seed", str(args.seed)
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    env = dict(
+        os.environ,
+        AI_MODEL_URL=f"http://127.0.0.1:{stub_port}",
+        SESSION_DB_PATH=os.path.join(workdir, "sessions.db")
+    )
+    # The API logs every request at INFO; keep it out of the report
+    api_log = open(args.api_log, "w") if args.api_log else subprocess.DEVNULL
+    api = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(api_port), "--log-level", "warning"],
+        cwd=ROOT, env=env, stdout=api_log, stderr=subprocess.STDOUT
+    )
+    try:
+        wait_until_up(f"http://127.0.0.1:{stub_port}")
+        wait_until_up(f"http://127.0.0.1:{api_port}")
+    except Exception:
+        for process in (api, stub):
+            process.terminate()
+        raise
+    return f"http://127.0.0.1:{api_port}", api.pid, [api, stub]
+
+def print_report(result, previous=None):
+    print(f"{'operation':<10} {'requests':>8} {'errors':>6} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for operation, stats in result["operations"].items():
+        print(f"{operation:<10} {stats['requests']:>8} {sum(stats['errors'].values()):>6} {stats['throughput_rps']:>8} "
+              f"{stats['p50_ms'] or '-':>9} {stats['p95_ms'] or '-':>9} {stats['p99_ms'] or '-':>9}")
+    print(f"total throughput: {result['throughput_rps']} req/s")
+    if result["rss_mb"]["peak"] is not None:
+        print(f"API RSS: start {result['rss_mb']['start']:.1f} MB, peak {result['rss_mb']['peak']:.1f} MB, "
+              f"end {result['rss_mb']['end']:.1f} MB")
+    if previous is None:
+        return
+        
+    print("\nchange vs previous run:")
+    for operation, stats in result["operations"].items():
+        before = previous["operations"].get(operation)
+        if not before:
+            continue
+        changes = []
+        for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            if stats[key] and before.get(key):
+                changes.append(f"{key} {(stats[key] / before[key] - 1) * 100:+.1f}%")
+        print(f"{operation:<10} {', '.join(changes)}")
+    if result["rss_mb"]["peak"] and previous.get("rss_mb", {}).get("peak"):
+        print(f"{'rss peak':<10} {(result['rss_mb']['peak'] / previous['rss_mb']['peak'] - 1) * 100:+.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API")
+    parser.add_argument("--url", default="http://localhost:8000", help="API to test (ignored with --spawn)")
+    parser.add_argument("--spawn", action="store_true", help="Start the stub model server and the API locally")
+    parser.add_argument("--pid", type=int, help="PID of the API process, for RSS (set automatically with --spawn)")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent workers")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+    parser.add_argument("--mix", default="gen=1,answers=3,list=1", help="Operation weights")
+    parser.add_argument("--n", type=int, default=8, help="Questions per generation")
+    parser.add_argument("--mode", default="model", help="Question source for /gen_questions (auto, bank, model)")
+    parser.add_argument("--repeat-ratio", type=float, default=0.0, help="Share of generations repeating an earlier prompt")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--stub-latency", type=float, default=0.2, help="Stub seconds before the first token")
+    parser.add_argument("--stub-tokens-per-second", type=float, default=400, help="Stub decode rate")
+    parser.add_argument("--stub-failure-rate", type=float, default=0.0, help="Share of stub calls failing with 503")
+    parser.add_argument("--api-log", help="File for the spawned API's log output (discarded by default)")
+    parser.add_argument("--output", default="load_test_results.json", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Previous results JSON to compare against")
+    args = parser.parse_args()
+    
+    processes = []
+    started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+    with tempfile.TemporaryDirectory() as workdir:
+        url, pid = args.url, args.pid
+        if args.spawn:
+            url, pid, processes = spawn(args, workdir)
+        try:
+            test = LoadTest(url, args.concurrency, args.duration, parse_mix(args.mix), args.n, args.mode,
+                            args.repeat_ratio, args.seed)
+                            
+            async def measure():
+                samples = []
+                stop = asyncio.Event()
+                sampler = asyncio.create_task(sample_rss(pid, samples, stop)) if pid else None
+                start = time.perf_counter()
+                await test.run()
+                elapsed = time.perf_counter() - start
+                stop.set()
+                if sampler:
+                    await sampler
+                return elapsed, samples
+                
+            elapsed, rss = asyncio.run(measure())
+        finally:
+            for process in processes:
+                process.terminate()
+                process.wait()
+                
+    result = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare", "api_log")},
+        "started_at": started_at,
+        "host": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "elapsed_s": round(elapsed, 2),
+        **test.summary(elapsed),
+        "rss_mb": {
+            "start": rss[0] if rss else None,
+            "peak": max(rss) if rss else None,
+            "end": rss[-1] if rss else None
+        }
+    }
+    with open(args.output, "w") as f:
+        json.dump(result, f, indent=2)
+        
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    print_report(result, previous)
+    print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the model server, for load tests and benchmarks
+
+Serves /generate, /generate_stream, /generate_batch and /health like the real
+server, replaying the captured Q/A text in benchmarks/data/model_outputs.jsonl
+(renumbered and repeated up to the number of questions the prompt asks for).
+Each generation takes a fixed latency plus its tokens at a fixed token rate,
+is cut off at max_new_tokens, and fails with a 503 at a configurable rate.
+
+Usage:
+    python benchmarks/stub_server.py [--port 9000] [--latency 0.2] [--tokens-per-second 400]
+                                     [--failure-rate 0] [--seed 0]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_builder import estimate_tokens
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "model_outputs.jsonl")
+PAIR_PATTERN = re.compile(r"(?=(?:\*\*)?Q(?:uestion)?\s*\d+)")
+NUMBER_PATTERN = re.compile(r"(Q(?:uestion)?\s*|A(?:nswer)?\s*)\d+")
+REQUESTED_PATTERN = re.compile(r"Generate (\d+)")
+
+# Overridden from the command line; read by every request
+config = {
+    "latency": float(os.getenv("STUB_LATENCY", "0.2")),
+    "tokens_per_second": float(os.getenv("STUB_TOKENS_PER_SECOND", "400")),
+    "failure_rate": float(os.getenv("STUB_FAILURE_RATE", "0")),
+    "chunk_tokens": 8
+}
+rng = random.Random(int(os.getenv("STUB_SEED", "0")))
+
+def load_pairs():
+    """
+    Load the captured outputs as Q/A pairs per adapter
+    """
+    pairs = {}
+    with open(DATA_FILE) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            sample = json.loads(line)
+            found = [pair for pair in PAIR_PATTERN.split(sample["text"]) if PAIR_PATTERN.match(pair)]
+            pairs.setdefault(sample["adapter"], []).extend(found)
+    return pairs
+
+PAIRS = load_pairs()
+ALL_PAIRS = [pair for adapter_pairs in PAIRS.values() for pair in adapter_pairs]
+
+def build_output(payload):
+    """
+    Replay captured pairs for a generation payload, cut off at max_new_tokens
+    """
+    requested = REQUESTED_PATTERN.search(payload.get("prompt", ""))
+    n = int(requested.group(1)) if requested else 8
+    pairs = PAIRS.get(payload.get("adapter")) or ALL_PAIRS
+    
+    out = []
+    for number in range(1, n + 1):
+        pair = pairs[(number - 1) % len(pairs)]
+        out.append(NUMBER_PATTERN.sub(rf"\g<1>{number}", pair).strip())
+    text = "\n\n".join(out)
+    
+    # Approximate the token cut-off by characters, at the estimate's ratio for this text
+    max_tokens = payload.get("max_new_tokens", 2048)
+    tokens = estimate_tokens(text)
+    if tokens > max_tokens:
+        text = text[:int(len(text) * max_tokens / tokens)]
+        tokens = max_tokens
+    return text, tokens
+
+def maybe_fail():
+    if rng.random() < config["failure_rate"]:
+        raise HTTPException(status_code=503, detail="Injected failure")
+
+app = FastAPI(title="Stub model server")
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "adapters": sorted(PAIRS)}
+
+@app.post("/generate")
+async def generate(request: Request):
+    payload = await request.json()
+    maybe_fail()
+    text, tokens = build_output(payload)
+    await asyncio.sleep(config["latency"] + tokens / config["tokens_per_second"])
+    return {"text": text, "used_adapter": payload.get("adapter")}
+
+@app.post("/generate_batch")
+async def generate_batch(request: Request):
+    body = await request.json()
+    maybe_fail()
+    outputs = [build_output(payload) for payload in body["requests"]]
+    # Batched sequences decode together, so the longest one sets the time
+    await asyncio.sleep(config["latency"] + max(tokens for _, tokens in outputs) / config["tokens_per_second"])
+    return {"results": [{"text": text} for text, _ in outputs]}
+
+@app.post("/generate_stream")
+async def generate_stream(request: Request):
+    payload = await request.json()
+    maybe_fail()
+    text, tokens = build_output(payload)
+    chunk_chars = max(1, int(len(text) / max(tokens, 1) * config["chunk_tokens"]))
+    chunk_delay = config["chunk_tokens"] / config["tokens_per_second"]
+    
+    async def chunks():
+        await asyncio.sleep(config["latency"])
+        for start in range(0, len(text), chunk_chars):
+            await asyncio.sleep(chunk_delay)
+            yield text[start:start + chunk_chars]
+            
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+def main():
+    import uvicorn
+    
+    parser = argparse.ArgumentParser(description="Stub model server for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=config["latency"], help="Seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=config["tokens_per_second"], help="Decode rate per generation")
+    parser.add_argument("--failure-rate", type=float, default=config["failure_rate"], help="Share of calls answered with 503")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for injected failures")
+    args = parser.parse_args()
+    
+    config.update(latency=args.latency, tokens_per_second=args.tokens_per_second, failure_rate=args.failure_rate)
+    rng.seed(args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
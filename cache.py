@@ -0,0 +1,236 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class TextCache:
+    """
+    Content-addressed text cache with an in-memory LRU tier and an optional SQLite tier
+    
+    A disk hit only reads from SQLite: its access time is kept in memory and
+    written together with others on the next set() (before eviction needs it)
+    or once access_batch of them have piled up, so hits don't commit.
+    """
+    
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600,
+                 db_path: Optional[str] = None, max_disk_entries: int = 10000,
+                 max_bytes: Optional[int] = None, access_batch: int = 256):
+        # In-memory LRU: key -> (expires_at, value)
+        self.entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.max_entries = max_entries
+        # Optional bound on the total length of cached values in memory
+        self.max_bytes = max_bytes
+        self.memory_bytes = 0
+        self.ttl_seconds = ttl_seconds
+        self.max_disk_entries = max_disk_entries
+        self.lock = threading.Lock()
+        
+        # Hit/miss counters
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        
+        self.db: Optional[sqlite3.Connection] = None
+        self.disk_entries = 0
+        # Access times of disk hits not yet written: key -> last_access
+        self.pending_access: Dict[str, float] = {}
+        self.access_batch = access_batch
+        if db_path:
+            self._open_db(db_path)
+            
+    def _open_db(self, db_path: str):
+        """
+        Open the SQLite tier, creating its table if needed
+        
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS text_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS idx_text_cache_last_access ON text_cache (last_access)")
+        self.db.execute("DELETE FROM text_cache WHERE expires_at <= ?", (time.time(),))
+        self.db.commit()
+        self.disk_entries = self.db.execute("SELECT COUNT(*) FROM text_cache").fetchone()[0]
+        logger.info(f"Opened cache database {db_path} with {self.disk_entries} entries")
+        
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        """
+        Build a cache key from a JSON-serializable payload
+        
+        Args:
+            payload: Request payload (e.g. prompt plus sampling parameters)
+            
+        Returns:
+            SHA-256 hex digest of the canonical JSON encoding
+        """
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+        
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached value
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached text or None on a miss
+        """
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self.entries.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                self._forget(key)
+                
+            if self.db is not None:
+                row = self.db.execute(
+                    "SELECT value, expires_at FROM text_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and row[1] > now:
+                    self.pending_access[key] = now
+                    if len(self.pending_access) >= self.access_batch:
+                        self._flush_access()
+                        self.db.commit()
+                    self._remember(key, row[1], row[0])
+                    self.disk_hits += 1
+                    return row[0]
+                    
+            self.misses += 1
+            return None
+            
+    def set(self, key: str, value: str):
+        """
+        Store a value in every cache tier
+        
+        Args:
+            key: Cache key
+            value: Text to cache
+        """
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self.lock:
+            self._remember(key, expires_at, value)
+            
+            if self.db is not None:
+                existed = self.db.execute("SELECT 1 FROM text_cache WHERE key = ?", (key,)).fetchone()
+                self.db.execute(
+                    "INSERT OR REPLACE INTO text_cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, value, expires_at, now)
+                )
+                if not existed:
+                    self.disk_entries += 1
+                self.pending_access.pop(key, None)
+                self._flush_access()
+                self._evict_disk(now)
+                self.db.commit()
+                
+    def _remember(self, key: str, expires_at: float, value: str):
+        """
+        Insert into the in-memory tier, evicting least recently used entries
+        """
+        if key in self.entries:
+            self._forget(key)
+        self.entries[key] = (expires_at, value)
+        self.memory_bytes += len(value)
+        while len(self.entries) > self.max_entries or (
+                self.max_bytes is not None and self.memory_bytes > self.max_bytes and len(self.entries) > 1):
+            self._forget(next(iter(self.entries)))
+            
+    def _forget(self, key: str):
+        """
+        Remove an entry from the in-memory tier
+        """
+        _, value = self.entries.pop(key)
+        self.memory_bytes -= len(value)
+        
+    def _flush_access(self):
+        """
+        Write the access times of recent disk hits in one batch (committed by the caller)
+        """
+        if not self.pending_access:
+            return
+        self.db.executemany(
+            "UPDATE text_cache SET last_access = ? WHERE key = ?",
+            [(last_access, key) for key, last_access in self.pending_access.items()]
+        )
+        self.pending_access.clear()
+        
+    def flush(self):
+        """
+        Write pending access times to the SQLite tier
+        """
+        with self.lock:
+            if self.db is not None and self.pending_access:
+                self._flush_access()
+                self.db.commit()
+                
+    def _evict_disk(self, now: float):
+        """
+        Drop expired entries and trim the SQLite tier to max_disk_entries
+        """
+        if self.disk_entries <= self.max_disk_entries:
+            return
+            
+        self.db.execute("DELETE FROM text_cache WHERE expires_at <= ?", (now,))
+        overflow = self.db.execute("SELECT COUNT(*) FROM text_cache").fetchone()[0] - self.max_disk_entries
+        if overflow > 0:
+            self.db.execute(
+                "DELETE FROM text_cache WHERE key IN "
+                "(SELECT key FROM text_cache ORDER BY last_access LIMIT ?)",
+                (overflow,)
+            )
+        self.disk_entries = self.db.execute("SELECT COUNT(*) FROM text_cache").fetchone()[0]
+        
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+        
+        Returns:
+            Entry counts, hits, misses and hit rate
+        """
+        with self.lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_entries": len(self.entries),
+                "memory_bytes": self.memory_bytes,
+                "disk_entries": self.disk_entries if self.db is not None else None,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0
+            }
+
+# Global cache for generated model output
+generation_cache = TextCache(
+    max_entries=int(os.getenv("GENERATION_CACHE_SIZE", "512")),
+    ttl_seconds=float(os.getenv("GENERATION_CACHE_TTL", "3600")),
+    db_path=os.getenv("GENERATION_CACHE_DB"),
+    max_disk_entries=int(os.getenv("GENERATION_CACHE_DISK_SIZE", "10000"))
+)
+
+# Global cache for text extracted from resume PDFs, keyed by file content hash
+resume_cache = TextCache(
+    max_entries=int(os.getenv("RESUME_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("RESUME_CACHE_TTL", "604800")),
+    db_path=os.getenv("RESUME_CACHE_DB"),
+    max_bytes=int(os.getenv("RESUME_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+)
@@ -0,0 +1,102 @@
+import logging
+import math
+import os
+import threading
+from typing import Dict, Any
+
+from prompt_builder import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Starting estimate of generated tokens per Q/A pair, before an adapter has history
+DEFAULT_TOKENS_PER_QUESTION = {
+    "HR": 70,
+    "Behavioral": 90,
+    "Technical": 110,
+    "Coding": 150,
+    "All": 110
+}
+
+class GenerationBudget:
+    """
+    Sizes max_new_tokens from the number of questions requested
+    
+    The tokens one Q/A pair takes are learned per adapter as an exponentially
+    weighted moving average of completed generations, starting from a
+    per-interview-type default. A request for n questions gets n times that,
+    plus headroom so a slightly longer answer doesn't truncate the last pair
+    into a placeholder.
+    """
+    
+    def __init__(self, headroom: float = 1.3, overhead: int = 32, min_tokens: int = 128,
+                 max_tokens: int = 4096, alpha: float = 0.2, min_samples: int = 3):
+        self.headroom = headroom
+        self.overhead = overhead
+        self.min_tokens = min_tokens
+        self.max_tokens = max_tokens
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self.tokens_per_question: Dict[str, float] = {}
+        self.samples: Dict[str, int] = {}
+        self.lock = threading.Lock()
+        
+    def plan(self, adapter: str, interview_type: str, n: int) -> int:
+        """
+        Choose max_new_tokens for a generation
+        
+        Args:
+            adapter: Adapter generating the questions
+            interview_type: Type of interview
+            n: Number of questions requested
+            
+        Returns:
+            Token budget for the generation
+        """
+        with self.lock:
+            learned = self.tokens_per_question.get(adapter)
+            samples = self.samples.get(adapter, 0)
+        per_question = DEFAULT_TOKENS_PER_QUESTION.get(interview_type, 110)
+        if learned is not None and samples >= self.min_samples:
+            per_question = learned
+        tokens = math.ceil(n * per_question * self.headroom) + self.overhead
+        return max(self.min_tokens, min(self.max_tokens, tokens))
+        
+    def observe(self, adapter: str, generated_text: str, questions: int):
+        """
+        Learn from a finished generation
+        
+        Args:
+            adapter: Adapter that generated the text
+            generated_text: Raw text from AI model
+            questions: Number of Q/A pairs parsed from it
+        """
+        if questions <= 0:
+            return
+        per_question = estimate_tokens(generated_text) / questions
+        with self.lock:
+            previous = self.tokens_per_question.get(adapter)
+            if previous is None:
+                self.tokens_per_question[adapter] = per_question
+            else:
+                self.tokens_per_question[adapter] = previous + self.alpha * (per_question - previous)
+            self.samples[adapter] = self.samples.get(adapter, 0) + 1
+            
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the learned tokens per question of each adapter
+        
+        Returns:
+            Per-adapter averages and sample counts
+        """
+        with self.lock:
+            return {
+                adapter: {"tokens_per_question": round(average, 1), "samples": self.samples[adapter]}
+                for adapter, average in self.tokens_per_question.items()
+            }
+
+# Global generation budget instance
+generation_budget = GenerationBudget(
+    headroom=float(os.getenv("AI_TOKEN_HEADROOM", "1.3")),
+    min_tokens=int(os.getenv("AI_MIN_NEW_TOKENS", "128")),
+    max_tokens=int(os.getenv("AI_MAX_NEW_TOKENS", "4096"))
+)
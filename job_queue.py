@@ -0,0 +1,240 @@
+import asyncio
+import ipaddress
+import logging
+import os
+import socket
+from typing import Dict, List, Optional, Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from admission import AdmissionRejected
+from ai_client import ai_client
+from question_bank import question_bank
+from session_manager import session_manager
+
+logger = logging.getLogger(__name__)
+
+class JobQueueFull(Exception):
+    """Raised when too many generation jobs are waiting"""
+
+class GenerationJob:
+    """
+    Question generation for a session created with status "pending"
+    """
+    
+    def __init__(self, session_id: str, domain: str, interview_type: str, resume_text: Optional[str],
+                 jd_text: Optional[str], n: int, callback_url: Optional[str] = None):
+        self.session_id = session_id
+        self.domain = domain
+        self.interview_type = interview_type
+        self.resume_text = resume_text
+        self.jd_text = jd_text
+        self.n = n
+        self.callback_url = callback_url
+
+class JobQueue:
+    """
+    Runs question generation jobs on background workers
+    
+    Jobs run at background priority, so interactive requests are admitted to
+    the model first. When a job finishes its session becomes "active" (or
+    "failed" with an error) and the job's callback URL, if any, is notified.
+    """
+    
+    def __init__(self, workers: int = 4, max_pending: int = 100, max_attempts: int = 3,
+                 callback_timeout: float = 10, callback_attempts: int = 3,
+                 callback_hosts: Optional[List[str]] = None):
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.callback_timeout = callback_timeout
+        self.callback_attempts = callback_attempts
+        # Hosts callbacks may go to regardless of address; any public host when empty
+        self.callback_hosts = {host.lower() for host in callback_hosts or []}
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._tasks: List[asyncio.Task] = []
+        # Jobs taken by a worker whose outcome isn't recorded yet, by session ID
+        self._in_flight: Dict[str, GenerationJob] = {}
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        
+    def submit(self, job: GenerationJob):
+        """
+        Queue a generation job
+        
+        Args:
+            job: Job to run
+            
+        Raises:
+            JobQueueFull: If max_pending jobs are already waiting
+        """
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise JobQueueFull("Too many generation jobs are queued. Please try again later.")
+        logger.info(f"Queued generation job for session {job.session_id} ({self.queue.qsize()} waiting)")
+        
+    async def check_callback_url(self, url: str):
+        """
+        Check that a callback URL may be called from this server
+        
+        Allowlisted hosts are always accepted. Otherwise the host is resolved
+        and every address must be public: loopback, private, link-local
+        (including cloud metadata), multicast and reserved addresses are
+        refused, so a callback can't reach internal services.
+        
+        Args:
+            url: Callback URL
+            
+        Raises:
+            ValueError: If the URL is not http(s) or its host is not allowed
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError("callback_url must be an http or https URL")
+        host = parts.hostname.lower()
+        if host in self.callback_hosts:
+            return
+        try:
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except (socket.gaierror, ValueError):
+            raise ValueError(f"callback_url host {host} could not be resolved")
+        for info in infos:
+            address = ipaddress.ip_address(info[4][0].split("%")[0])
+            if not address.is_global:
+                raise ValueError(f"callback_url host {host} resolves to a non-public address")
+                
+    def start(self):
+        """
+        Start the worker tasks
+        """
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        
+    async def stop(self):
+        """
+        Stop the workers and fail jobs that never ran or were cut short
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        
+        for job in list(self._in_flight.values()):
+            await session_manager.set_status(job.session_id, "failed", "Server shut down while questions were being generated")
+        self._in_flight.clear()
+        
+        while not self.queue.empty():
+            job = self.queue.get_nowait()
+            await session_manager.set_status(job.session_id, "failed", "Server shut down before questions were generated")
+            
+    async def _work(self):
+        while True:
+            job = await self.queue.get()
+            self.running += 1
+            self._in_flight[job.session_id] = job
+            try:
+                await self._run(job)
+            except Exception as e:
+                self._in_flight.pop(job.session_id, None)
+                logger.error(f"Generation job for session {job.session_id} crashed: {str(e)}")
+            finally:
+                self.running -= 1
+                self.queue.task_done()
+                
+    async def _run(self, job: GenerationJob):
+        """
+        Generate a job's questions and record the outcome on its session
+        """
+        questions = []
+        error = None
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                questions = await ai_client.generate_questions(
+                    domain=job.domain,
+                    interview_type=job.interview_type,
+                    resume_text=job.resume_text,
+                    jd_text=job.jd_text,
+                    n=job.n,
+                    priority="background"
+                )
+                error = None
+                break
+            except AdmissionRejected as e:
+                # The model is busy; wait as advised instead of failing the job
+                error = str(e)
+                if attempt < self.max_attempts:
+                    logger.info(f"Generation job for session {job.session_id} not admitted, retrying in {e.retry_after:.0f}s")
+                    await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                error = str(e)
+                break
+                
+        if error is None and await session_manager.add_questions(job.session_id, questions):
+            await session_manager.set_status(job.session_id, "active")
+            self.completed += 1
+            question_bank.learn(job.domain, job.interview_type, questions, job.resume_text, job.jd_text)
+            logger.info(f"Generated {len(questions)} questions for session {job.session_id}")
+        else:
+            error = error or "Session no longer exists"
+            await session_manager.set_status(job.session_id, "failed", f"Failed to generate questions: {error}")
+            self.failed += 1
+            logger.error(f"Generation job for session {job.session_id} failed: {error}")
+        self._in_flight.pop(job.session_id, None)
+        
+        if job.callback_url:
+            await self._notify(job, questions if error is None else [], error)
+            
+    async def _notify(self, job: GenerationJob, questions: List[Any], error: Optional[str]):
+        """
+        POST the job's outcome to its callback URL, retrying with backoff
+        """
+        # Checked again before sending, as the host may resolve differently by now
+        try:
+            await self.check_callback_url(job.callback_url)
+        except ValueError as e:
+            logger.error(f"Not calling back session {job.session_id}: {str(e)}")
+            return
+        payload = {
+            "session_id": job.session_id,
+            "status": "active" if error is None else "failed",
+            "error": error,
+            "total_questions": len(questions),
+            "questions": [q.dict() for q in questions]
+        }
+        async with httpx.AsyncClient(timeout=self.callback_timeout) as client:
+            for attempt in range(self.callback_attempts):
+                try:
+                    response = await client.post(job.callback_url, json=payload)
+                    if response.status_code < 500:
+                        logger.info(f"Notified {job.callback_url} for session {job.session_id} ({response.status_code})")
+                        return
+                    logger.warning(f"Callback {job.callback_url} returned status {response.status_code}")
+                except httpx.HTTPError as e:
+                    logger.warning(f"Callback {job.callback_url} failed: {type(e).__name__}")
+                await asyncio.sleep(2 ** attempt)
+        logger.error(f"Giving up on callback {job.callback_url} for session {job.session_id}")
+        
+    def stats(self) -> Dict[str, int]:
+        """
+        Get queue depth and job counters
+        
+        Returns:
+            Job statistics
+        """
+        return {
+            "queued": self.queue.qsize(),
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed
+        }
+
+# Global job queue instance
+job_queue = JobQueue(
+    workers=int(os.getenv("JOB_WORKERS", "4")),
+    max_pending=int(os.getenv("JOB_QUEUE_SIZE", "100")),
+    callback_hosts=[host.strip() for host in os.getenv("JOB_CALLBACK_HOSTS", "").split(",") if host.strip()]
+)
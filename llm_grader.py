@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from typing import Dict, List, Any, Optional, Tuple
+
+from ai_client import AIClient, ai_client
+from scoring import AnswerScorer, answer_scorer
+from tracing import span
+from metrics import answers_graded
+
+logger = logging.getLogger(__name__)
+
+GRADING_PROMPT = """You are an expert interviewer grading a candidate's answer.
+
+Question: {question}
+
+Reference answer: {reference}
+
+Candidate answer: {answer}
+
+Grade the candidate answer against the reference answer from 0 to 10.
+Reply in exactly this format:
+Score: <0-10>
+Feedback: <one or two sentences on what was good and what was missing>"""
+
+SCORE_PATTERN = re.compile(r"score\s*[:=]?\s*(\d+(?:\.\d+)?)\s*(?:/\s*10)?", re.IGNORECASE)
+FEEDBACK_PATTERN = re.compile(r"feedback\s*[:=]\s*(.+)", re.IGNORECASE | re.DOTALL)
+
+def parse_grade(text: str) -> Optional[Tuple[float, str]]:
+    """
+    Parse a score and feedback out of a grading reply
+    
+    Args:
+        text: Raw text from AI model
+        
+    Returns:
+        Score (0-10) and feedback, or None if the reply has no usable score
+    """
+    match = SCORE_PATTERN.search(text)
+    if not match:
+        return None
+    score = float(match.group(1))
+    if score > 10:
+        return None
+    feedback = FEEDBACK_PATTERN.search(text[match.end():]) or FEEDBACK_PATTERN.search(text)
+    return round(score, 1), " ".join(feedback.group(1).split()) if feedback else ""
+
+class LLMGrader:
+    """
+    Grades every answer of a session with the model at once
+    
+    Each answered question becomes its own model call; up to concurrency of
+    them run together, so a session takes about as long as its slowest answer
+    rather than the sum of all of them. Each call has its own deadline and the
+    whole session another: answers the model doesn't grade in time, or whose
+    reply can't be parsed, keep the local score from the answer scorer, so the
+    evaluation is always complete and is marked partial instead of failing.
+    
+    Grading uses the base model unless a grading adapter is configured: the
+    interview type adapters are tuned to write question sets, not to follow
+    the grading prompt's reply format.
+    """
+    
+    def __init__(self, client: Optional[AIClient] = None, scorer: Optional[AnswerScorer] = None,
+                 concurrency: int = 8, question_timeout: float = 60.0, session_timeout: float = 90.0,
+                 max_new_tokens: int = 160, adapter: Optional[str] = None):
+        self.client = client or ai_client
+        self.scorer = scorer or answer_scorer
+        # Model calls in flight per session; the admission controller bounds them across sessions
+        self.concurrency = concurrency
+        self.question_timeout = question_timeout
+        self.session_timeout = session_timeout
+        self.max_new_tokens = max_new_tokens
+        # Adapter trained for grading; the base model when None
+        self.adapter = adapter
+        
+    async def grade_session(self, session: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Grade a session's answers with the model, falling back to local scores
+        
+        Args:
+            session: Session data with questions and answers
+            
+        Returns:
+            Evaluation with session_id, total_score, overall_feedback, partial and
+            per-question scores (score, feedback and whether the model or the local scorer graded it)
+        """
+        answers = {str(a.get("question_id")): a.get("answer_text") or "" for a in session["answers"]}
+        answered = [q for q in session["questions"] if answers.get(q["id"])]
+        
+        # Local scores first: they are what an answer keeps if the model misses its deadline
+        local = self.scorer.score_sessions([session])[0]
+        local_scores = {score["question_id"]: score["score"] for score in local["scores"]}
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def grade(question: Dict[str, Any]) -> Optional[Tuple[float, str]]:
+            async with semaphore:
+                prompt = GRADING_PROMPT.format(
+                    question=question["question_text"],
+                    reference=question.get("predicted_answer") or "Not available",
+                    answer=answers[question["id"]]
+                )
+                text = await asyncio.wait_for(
+                    self.client.complete(prompt, self.adapter, self.max_new_tokens),
+                    self.question_timeout
+                )
+                return parse_grade(text)
+                
+        start = time.perf_counter()
+        grades: Dict[str, Tuple[float, str]] = {}
+        with span("grade", questions=len(answered)):
+            tasks = {asyncio.create_task(grade(question)): question["id"] for question in answered}
+            if tasks:
+                done, pending = await asyncio.wait(tasks, timeout=self.session_timeout)
+                for task in pending:
+                    task.cancel()
+                # Let the cancelled calls unwind (and release their admission slots)
+                await asyncio.gather(*pending, return_exceptions=True)
+                for task in done:
+                    if task.cancelled():
+                        continue
+                    error = task.exception()
+                    if error is not None:
+                        logger.warning(f"Grading {tasks[task]} failed: {type(error).__name__}: {error}")
+                    elif task.result() is not None:
+                        grades[tasks[task]] = task.result()
+                        
+        scores = []
+        for question in session["questions"]:
+            question_id = question["id"]
+            if question_id in grades:
+                score, feedback = grades[question_id]
+                scores.append({"question_id": question_id, "score": score, "feedback": feedback, "graded_by": "model"})
+            elif question_id in answers and answers[question_id]:
+                scores.append({"question_id": question_id, "score": local_scores.get(question_id), "feedback": None, "graded_by": "local"})
+            else:
+                scores.append({"question_id": question_id, "score": None, "feedback": None, "graded_by": None})
+        answers_graded.inc(len(grades), source="model")
+        answers_graded.inc(len(answered) - len(grades), source="local")
+        
+        all_scores = [score["score"] or 0.0 for score in scores]
+        total_score = round(sum(all_scores) / len(all_scores), 1) if all_scores else 0.0
+        logger.info(f"Graded {len(grades)} of {len(answered)} answers of session {session['session_id']} "
+                    f"with the model in {time.perf_counter() - start:.2f}s")
+                    
+        return {
+            "session_id": session["session_id"],
+            "total_score": total_score,
+            "overall_feedback": self._feedback(local["overall_feedback"], scores, len(answered)),
+            "method": "llm",
+            "partial": len(grades) < len(answered),
+            "scores": scores
+        }
+        
+    @staticmethod
+    def _feedback(local_feedback: str, scores: List[Dict[str, Any]], answered: int) -> str:
+        """
+        Merge the model's per-answer feedback into the session feedback
+        """
+        graded = [score for score in scores if score["graded_by"] == "model"]
+        if not answered:
+            return local_feedback
+        if not graded:
+            return f"{local_feedback} The model could not grade any answers; scores are local."
+        feedback = [f"Answered {answered} of {len(scores)} questions."]
+        if len(graded) < answered:
+            feedback.append(f"The model graded {len(graded)} of {answered} answers; the rest were scored locally.")
+        for score in graded:
+            if score["feedback"]:
+                feedback.append(f"{score['question_id']} ({score['score']}/10): {score['feedback']}")
+        return " ".join(feedback)
+
+# Global LLM grader instance
+llm_grader = LLMGrader(
+    concurrency=int(os.getenv("GRADING_CONCURRENCY", "8")),
+    question_timeout=float(os.getenv("GRADING_QUESTION_TIMEOUT", "60")),
+    session_timeout=float(os.getenv("GRADING_SESSION_TIMEOUT", "90")),
+    max_new_tokens=int(os.getenv("GRADING_MAX_NEW_TOKENS", "160")),
+    adapter=os.getenv("GRADING_ADAPTER") or None
+)
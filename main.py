@@ -1,17 +1,29 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
 import logging
-from typing import Optional
+import time
+from typing import Optional, AsyncIterator, List
 import json
 
 from models import (
     GenerateQuestionsRequest, GenerateQuestionsResponse, 
-    SubmitAnswersRequest, SubmitAnswersResponse, SessionInfo, ErrorResponse
+    SubmitAnswersRequest, SubmitAnswersResponse, SessionInfo, ErrorResponse,
+    AnswerSubmission, AnswerSubmissionResponse,
+    GenerationJobResponse, QuestionResponse, BatchGenerateRequest, BatchGenerateResponse, BatchItemError,
+    EvaluationResponse, BatchEvaluateRequest, BatchEvaluateResponse
 )
-from utils import parse_pdf_to_text, get_adapter_for_interview_type
+from utils import get_adapter_for_interview_type
+from resume_parser import resume_parser, ResumeParserBusy
 from session_manager import session_manager
 from ai_client import ai_client
+from admission import AdmissionRejected, retry_after_header
+from job_queue import job_queue, GenerationJob, JobQueueFull
+from question_bank import question_bank, DIFFICULTIES
+from llm_grader import llm_grader
+from metrics import registry, http_requests, http_request_duration, http_requests_in_flight
+from tracing import tracer, span
+from cache import generation_cache, resume_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,17 +44,198 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """
+    Count requests and time them per endpoint (until the response starts, for streams)
+    """
+    start = time.perf_counter()
+    status = 500
+    http_requests_in_flight.inc()
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        http_requests_in_flight.dec()
+        # Label by route template so session IDs don't create new series
+        route = request.scope.get("route")
+        endpoint = route.path if route is not None else "unmatched"
+        http_requests.inc(method=request.method, endpoint=endpoint, status=status)
+        http_request_duration.observe(time.perf_counter() - start, method=request.method, endpoint=endpoint)
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """
+    Trace each request and report its per-stage timings in a Server-Timing header
+    """
+    with tracer.trace(f"{request.method} {request.url.path}") as trace:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        if route is not None:
+            trace.root.name = f"{request.method} {route.path}"
+            trace.root.attributes["http.status_code"] = response.status_code
+    # Streamed responses only include the stages finished before the stream started
+    response.headers["Server-Timing"] = trace.server_timing()
+    response.headers["X-Trace-Id"] = trace.trace_id
+    return response
+
+def _cache_metrics(field: str):
+    return lambda: {
+        ("generation",): generation_cache.stats()[field],
+        ("resume",): resume_cache.stats()[field]
+    }
+
+registry.callback("cache_memory_hits_total", "Cache hits served from memory", "counter", ("cache",), _cache_metrics("memory_hits"))
+registry.callback("cache_disk_hits_total", "Cache hits served from SQLite", "counter", ("cache",), _cache_metrics("disk_hits"))
+registry.callback("cache_misses_total", "Cache misses", "counter", ("cache",), _cache_metrics("misses"))
+registry.callback("cache_memory_entries", "Entries in the in-memory cache tier", "gauge", ("cache",), _cache_metrics("memory_entries"))
+registry.callback("ai_coalesced_requests_total", "Generations that joined an identical in-flight call", "counter", (),
+                  lambda: {(): ai_client.single_flight.coalesced})
+registry.callback("ai_admission_limit", "Adaptive limit on concurrent model calls", "gauge", (),
+                  lambda: {(): ai_client.admission.stats()["limit"]})
+registry.callback("ai_admission_queued", "Model calls waiting for admission", "gauge", (),
+                  lambda: {(): ai_client.admission.stats()["queued"]})
+registry.callback("ai_admission_rejected_total", "Model calls rejected by admission control", "counter", ("reason",),
+                  lambda: {("queue_full",): ai_client.admission.rejected, ("queue_timeout",): ai_client.admission.timed_out})
+registry.callback("ai_backend_outstanding", "Outstanding requests per model backend", "gauge", ("backend",),
+                  lambda: {(b.url,): b.outstanding for b in ai_client.pool.backends})
+registry.callback("ai_backend_up", "Whether a model backend is healthy with a closed circuit", "gauge", ("backend",),
+                  lambda: {(b.url,): int(b.healthy and b.state == "closed") for b in ai_client.pool.backends})
+registry.callback("ai_tokens_per_question", "Learned generated tokens per question, used to size max_new_tokens", "gauge",
+                  ("adapter",), lambda: {(adapter,): stats["tokens_per_question"] for adapter, stats in ai_client.budget.stats().items()})
+registry.callback("generation_jobs_queued", "Background generation jobs waiting for a worker", "gauge", (),
+                  lambda: {(): job_queue.stats()["queued"]})
+registry.callback("question_bank_questions", "Banked questions available for instant retrieval", "gauge", (),
+                  lambda: {(): question_bank.stats()["total"]})
+registry.callback("question_bank_served_total", "Question sets served from the question bank", "counter", (),
+                  lambda: {(): question_bank.served})
+registry.callback("resume_parser_pending", "PDF resumes queued or being parsed", "gauge", (),
+                  lambda: {(): resume_parser.pending})
+
+@app.on_event("startup")
+async def startup():
+    # Evict expired sessions in the background instead of on every request
+    session_manager.start_sweeper()
+    # Workers for background generation jobs
+    job_queue.start()
+    tracer.start()
+    # Probe model backends so unhealthy ones are skipped by routing (only if AI_BACKEND_PROBE_INTERVAL is set)
+    ai_client.pool.start_probing(ai_client.client)
+
+@app.on_event("shutdown")
+async def shutdown():
+    await job_queue.stop()
+    await tracer.stop()
+    await session_manager.stop_sweeper()
+    resume_parser.shutdown()
+    # Keep the LRU order of the SQLite cache tiers
+    generation_cache.flush()
+    resume_cache.flush()
+    # Stop backend probes and release pooled connections to the AI model
+    await ai_client.aclose()
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "service": "ai-mock-interviewer-api"}
 
+async def read_resume(resume_file: Optional[UploadFile]) -> Optional[str]:
+    """
+    Extract text from an uploaded resume
+    
+    Args:
+        resume_file: Uploaded resume file (PDF or TXT)
+        
+    Returns:
+        Resume text, or None if no file was uploaded
+    """
+    if not resume_file:
+        return None
+        
+    with span("resume", content_type=resume_file.content_type):
+        return await _read_resume_file(resume_file)
+
+async def _read_resume_file(resume_file: UploadFile) -> str:
+    """
+    Extract text from an uploaded PDF or TXT resume
+    """
+    if resume_file.content_type == "application/pdf":
+        content = await resume_file.read()
+        try:
+            return await resume_parser.parse_pdf(content)
+        except ResumeParserBusy as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    elif resume_file.content_type == "text/plain":
+        content = await resume_file.read()
+        return content.decode('utf-8')
+    else:
+        raise HTTPException(status_code=400, detail="Resume file must be PDF or TXT")
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """
+    Get hit/miss counters for the generation and resume caches and coalesced requests
+    
+    Returns:
+        Cache statistics
+    """
+    return {
+        "generation": generation_cache.stats(),
+        "resume": resume_cache.stats(),
+        "coalesced_requests": ai_client.single_flight.coalesced
+    }
+
+@app.get("/backends")
+async def backend_status():
+    """
+    Get the health, circuit state and load of each AI model backend, the admission limit
+    and the tokens each adapter spends per question
+    
+    Returns:
+        Backend routing, admission and token budget state
+    """
+    return {
+        "backends": ai_client.pool.stats(),
+        "admission": ai_client.admission.stats(),
+        "token_budget": ai_client.budget.stats()
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Get request, model, parsing, PDF and cache metrics in the Prometheus text format
+    
+    Returns:
+        Metrics text
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """
+    Get the spans of a recent request, by the ID from its X-Trace-Id header
+    
+    Args:
+        trace_id: Trace identifier
+        
+    Returns:
+        Trace with per-stage spans
+    """
+    trace = tracer.get(trace_id)
+    if not trace:
+        raise HTTPException(status_code=404, detail="Trace not found")
+        
+    return trace.to_dict()
+
 @app.post("/gen_questions", response_model=GenerateQuestionsResponse)
 async def generate_questions(
     domain: str = Form(...),
     interview_type: str = Form(...),
     resume_file: Optional[UploadFile] = File(None),
     jd_text: Optional[str] = Form(None),
-    n: int = Form(8)
+    n: int = Form(8),
+    mode: str = Form("model"),
+    difficulty: Optional[str] = Form(None)
 ):
     """
     Generate interview questions based on user input
@@ -53,39 +246,55 @@ async def generate_questions(
         resume_file: Uploaded resume file (PDF or TXT)
         jd_text: Job description text
         n: Number of questions to generate (1-20)
-    
+        mode: "model" (the default) always generates, "auto" serves non-personalized
+            requests from the question bank when it has enough questions, "bank" only uses
+            the bank (picking the banked questions closest to the job description and
+            resume, if given)
+        difficulty: Only draw banked questions of this difficulty (basic, intermediate, advanced)
+        
     Returns:
         Generated questions with session information
     """
+    if mode not in ("auto", "bank", "model"):
+        raise HTTPException(status_code=400, detail="mode must be one of: auto, bank, model")
+    if difficulty is not None and difficulty not in DIFFICULTIES:
+        raise HTTPException(status_code=400, detail=f"difficulty must be one of: {', '.join(DIFFICULTIES)}")
+        
     try:
         logger.info(f"Generating questions for {domain} {interview_type} interview")
         
         # Parse resume if provided
-        resume_text = None
-        if resume_file:
-            if resume_file.content_type == "application/pdf":
-                content = await resume_file.read()
-                resume_text = parse_pdf_to_text(content)
-            elif resume_file.content_type == "text/plain":
-                content = await resume_file.read()
-                resume_text = content.decode('utf-8')
-            else:
-                raise HTTPException(status_code=400, detail="Resume file must be PDF or TXT")
+        resume_text = await read_resume(resume_file)
         
         # Get the adapter for the interview type
         adapter = get_adapter_for_interview_type(interview_type)
         
-        # Generate questions using AI
-        questions = ai_client.generate_questions(
-            domain=domain,
-            interview_type=interview_type,
-            resume_text=resume_text,
-            jd_text=jd_text,
-            n=n
-        )
+        # Banked questions aren't personalized, so only serve them without a resume or job description
+        questions = None
+        if mode == "bank" or (mode == "auto" and not resume_text and not jd_text):
+            with span("bank"):
+                if resume_text or jd_text:
+                    query_text = "\n".join(text for text in (jd_text, resume_text) if text)
+                    questions = question_bank.similar(domain, interview_type, query_text, n, difficulty)
+                else:
+                    questions = question_bank.sample(domain, interview_type, n, difficulty)
+            if questions is None and mode == "bank":
+                raise HTTPException(status_code=404, detail=f"Not enough banked questions for {domain} {interview_type}")
+        source = "bank" if questions is not None else "model"
         
+        if questions is None:
+            # Generate questions using AI
+            questions = await ai_client.generate_questions(
+                domain=domain,
+                interview_type=interview_type,
+                resume_text=resume_text,
+                jd_text=jd_text,
+                n=n
+            )
+            question_bank.learn(domain, interview_type, questions, resume_text, jd_text)
+            
         # Create session
-        session_id = session_manager.create_session(
+        session_id = await session_manager.create_session(
             domain=domain,
             interview_type=interview_type,
             questions=questions,
@@ -94,19 +303,286 @@ async def generate_questions(
             job_description=jd_text
         )
         
-        logger.info(f"Successfully generated {len(questions)} questions for session {session_id}")
+        logger.info(f"Successfully generated {len(questions)} questions for session {session_id} from the {source}")
         
         return GenerateQuestionsResponse(
             session_id=session_id,
             questions=questions,
             adapter_used=adapter,
-            total_questions=len(questions)
+            total_questions=len(questions),
+            source=source
         )
         
+    except HTTPException:
+        raise
+    except AdmissionRejected as e:
+        logger.warning(f"Rejected question generation: {str(e)}")
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=retry_after_header(e))
     except Exception as e:
         logger.error(f"Error generating questions: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate questions: {str(e)}")
 
+@app.post("/gen_questions/stream")
+async def generate_questions_stream(
+    domain: str = Form(...),
+    interview_type: str = Form(...),
+    resume_file: Optional[UploadFile] = File(None),
+    jd_text: Optional[str] = Form(None),
+    n: int = Form(8)
+):
+    """
+    Generate interview questions, streaming each one as NDJSON as soon as it is complete
+    
+    The stream starts with a "session" event, then one "question" event per
+    question and ends with a "done" event (or an "error" event if generation fails).
+    
+    Args:
+        domain: Job domain (e.g., "Data Scientist", "Software Engineer")
+        interview_type: Type of interview (HR, Behavioral, Technical, Coding, All)
+        resume_file: Uploaded resume file (PDF or TXT)
+        jd_text: Job description text
+        n: Number of questions to generate (1-20)
+        
+    Returns:
+        Streaming NDJSON response
+    """
+    try:
+        logger.info(f"Streaming questions for {domain} {interview_type} interview")
+        
+        # Fail fast while the model is overloaded instead of opening a stream
+        ai_client.admission.check()
+        
+        resume_text = await read_resume(resume_file)
+        adapter = get_adapter_for_interview_type(interview_type)
+        
+        # Create the session up front so clients get its ID immediately
+        session_id = await session_manager.create_session(
+            domain=domain,
+            interview_type=interview_type,
+            questions=[],
+            adapter_used=adapter,
+            resume_text=resume_text,
+            job_description=jd_text
+        )
+        
+    except HTTPException:
+        raise
+    except AdmissionRejected as e:
+        logger.warning(f"Rejected question stream: {str(e)}")
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=retry_after_header(e))
+    except Exception as e:
+        logger.error(f"Error starting question stream: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to generate questions: {str(e)}")
+        
+    async def events() -> AsyncIterator[str]:
+        yield json.dumps({"type": "session", "session_id": session_id, "adapter_used": adapter}) + "\n"
+        
+        total = 0
+        streamed = []
+        # Stays set if the client disconnects mid-stream
+        error = "Client disconnected before all questions were generated"
+        try:
+            async for question in ai_client.stream_questions(
+                domain=domain,
+                interview_type=interview_type,
+                resume_text=resume_text,
+                jd_text=jd_text,
+                n=n
+            ):
+                await session_manager.add_questions(session_id, [question])
+                total += 1
+                streamed.append(question)
+                yield json.dumps({"type": "question", "question": question.dict()}) + "\n"
+            error = None
+        except Exception as e:
+            logger.error(f"Error streaming questions for session {session_id}: {str(e)}")
+            error = f"Failed to generate questions: {str(e)}"
+        finally:
+            # Don't leave a session with only some of its questions looking active
+            if error is not None:
+                await session_manager.set_status(session_id, "failed", error)
+                
+        if error is not None:
+            yield json.dumps({"type": "error", "detail": error}) + "\n"
+            return
+            
+        question_bank.learn(domain, interview_type, streamed, resume_text, jd_text)
+        logger.info(f"Successfully streamed {total} questions for session {session_id}")
+        yield json.dumps({"type": "done", "session_id": session_id, "total_questions": total}) + "\n"
+        
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.post("/gen_questions/batch", response_model=BatchGenerateResponse)
+async def generate_questions_batch(request: BatchGenerateRequest):
+    """
+    Generate interview questions for many sessions at once, e.g. a whole cohort
+    
+    Requests are grouped by adapter and sent to the model in batches; the
+    sessions of all successful requests are created in one transaction.
+    
+    Args:
+        request: Domain, interview type, resume text, job description and n per session
+        
+    Returns:
+        A session per request (None where it failed) and the errors of failed requests
+    """
+    try:
+        ai_client.admission.check("batch")
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers=retry_after_header(e))
+        
+    logger.info(f"Generating questions for a batch of {len(request.requests)} sessions")
+    specs = [
+        {
+            "domain": item.domain,
+            "interview_type": item.interview_type.value,
+            "resume_text": item.resume_text,
+            "jd_text": item.jd_text,
+            "n": item.n
+        }
+        for item in request.requests
+    ]
+    results = await ai_client.generate_batch(specs, priority="batch")
+    
+    succeeded = []
+    errors = []
+    for i, (spec, result) in enumerate(zip(specs, results)):
+        if isinstance(result, Exception):
+            errors.append(BatchItemError(index=i, error=f"Failed to generate questions: {str(result)}"))
+            continue
+        question_bank.learn(spec["domain"], spec["interview_type"], result, spec["resume_text"], spec["jd_text"])
+        succeeded.append((i, {
+            "domain": spec["domain"],
+            "interview_type": spec["interview_type"],
+            "questions": result,
+            "adapter_used": get_adapter_for_interview_type(spec["interview_type"]),
+            "resume_text": spec["resume_text"],
+            "job_description": spec["jd_text"]
+        }))
+        
+    try:
+        session_ids = await session_manager.create_sessions([session for _, session in succeeded])
+    except Exception as e:
+        logger.error(f"Error creating batch sessions: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to create sessions: {str(e)}")
+        
+    sessions: List[Optional[GenerateQuestionsResponse]] = [None] * len(specs)
+    for (i, session), session_id in zip(succeeded, session_ids):
+        sessions[i] = GenerateQuestionsResponse(
+            session_id=session_id,
+            questions=session["questions"],
+            adapter_used=session["adapter_used"],
+            total_questions=len(session["questions"])
+        )
+        
+    logger.info(f"Created {len(session_ids)} sessions, {len(errors)} failed")
+    return BatchGenerateResponse(sessions=sessions, errors=errors)
+
+@app.post("/gen_questions/jobs", response_model=GenerationJobResponse, status_code=202)
+async def submit_generation_job(
+    domain: str = Form(...),
+    interview_type: str = Form(...),
+    resume_file: Optional[UploadFile] = File(None),
+    jd_text: Optional[str] = Form(None),
+    n: int = Form(8),
+    callback_url: Optional[str] = Form(None)
+):
+    """
+    Start generating interview questions in the background
+    
+    Returns immediately with a session whose status is "pending". Poll
+    GET /sessions/{session_id} until it is "active" (or "failed") and fetch the
+    questions from GET /sessions/{session_id}/questions, or pass callback_url
+    to receive them in a POST once they are ready.
+    
+    Args:
+        domain: Job domain (e.g., "Data Scientist", "Software Engineer")
+        interview_type: Type of interview (HR, Behavioral, Technical, Coding, All)
+        resume_file: Uploaded resume file (PDF or TXT)
+        jd_text: Job description text
+        n: Number of questions to generate (1-20)
+        callback_url: Optional public http(s) URL notified when generation finishes
+        
+    Returns:
+        Pending session information
+    """
+    if callback_url:
+        try:
+            await job_queue.check_callback_url(callback_url)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+            
+    try:
+        logger.info(f"Queueing question generation for {domain} {interview_type} interview")
+        
+        resume_text = await read_resume(resume_file)
+        adapter = get_adapter_for_interview_type(interview_type)
+        
+        session_id = await session_manager.create_session(
+            domain=domain,
+            interview_type=interview_type,
+            questions=[],
+            adapter_used=adapter,
+            resume_text=resume_text,
+            job_description=jd_text,
+            status="pending"
+        )
+        
+        try:
+            job_queue.submit(GenerationJob(session_id, domain, interview_type, resume_text, jd_text, n, callback_url))
+        except JobQueueFull as e:
+            await session_manager.set_status(session_id, "failed", str(e))
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "30"})
+            
+        return GenerationJobResponse(session_id=session_id, status="pending", adapter_used=adapter)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error queueing question generation: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to generate questions: {str(e)}")
+
+@app.get("/jobs/stats")
+async def job_stats():
+    """
+    Get the depth of the background generation queue and job counters
+    
+    Returns:
+        Job statistics
+    """
+    return job_queue.stats()
+
+@app.get("/question_bank/stats")
+async def question_bank_stats():
+    """
+    Get the number of banked questions per domain, interview type and difficulty
+    
+    Returns:
+        Question bank statistics
+    """
+    return question_bank.stats()
+
+@app.get("/question_bank/search")
+async def search_question_bank(
+    q: str = Query(..., min_length=1, description="Text to match, e.g. a job description"),
+    domain: Optional[str] = Query(None),
+    interview_type: Optional[str] = Query(None),
+    k: int = Query(10, ge=1, le=100)
+):
+    """
+    Find the banked questions most similar to a text
+    
+    Args:
+        q: Text to match questions to
+        domain: Only search this domain
+        interview_type: Only search this interview type
+        k: Maximum number of questions
+        
+    Returns:
+        Banked questions with their similarity score, most similar first
+    """
+    return {"questions": question_bank.search(q, domain, interview_type, k)}
+
 @app.get("/sessions/{session_id}", response_model=SessionInfo)
 async def get_session(session_id: str):
     """
@@ -118,12 +594,35 @@ async def get_session(session_id: str):
     Returns:
         Session information
     """
-    session_info = session_manager.get_session_info(session_id)
+    session_info = await session_manager.get_session_info(session_id)
     if not session_info:
         raise HTTPException(status_code=404, detail="Session not found")
-    
+        
     return session_info
 
+@app.get("/sessions/{session_id}/questions", response_model=GenerateQuestionsResponse)
+async def get_session_questions(session_id: str):
+    """
+    Get the questions of a session, e.g. once a background generation job is done
+    
+    Args:
+        session_id: Session identifier
+        
+    Returns:
+        Session questions (empty while the session is pending)
+    """
+    session = await session_manager.get_session(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+        
+    questions = [QuestionResponse(**q) for q in session["questions"]]
+    return GenerateQuestionsResponse(
+        session_id=session_id,
+        questions=questions,
+        adapter_used=session["adapter_used"],
+        total_questions=len(questions)
+    )
+
 @app.post("/sessions/{session_id}/answers", response_model=SubmitAnswersResponse)
 async def submit_answers(session_id: str, request: SubmitAnswersRequest):
     """
@@ -138,16 +637,16 @@ async def submit_answers(session_id: str, request: SubmitAnswersRequest):
     """
     try:
         # Check if session exists
-        session = session_manager.get_session(session_id)
+        session = await session_manager.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
-        
+            
         # Update session with answers
-        success = session_manager.update_session_answers(session_id, request.answers)
+        success = await session_manager.update_session_answers(session_id, request.answers)
         
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update session")
-        
+            
         logger.info(f"Received {len(request.answers)} answers for session {session_id}")
         
         return SubmitAnswersResponse(
@@ -162,16 +661,134 @@ async def submit_answers(session_id: str, request: SubmitAnswersRequest):
         logger.error(f"Error submitting answers: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to submit answers: {str(e)}")
 
+@app.put("/sessions/{session_id}/answers/{question_id}", response_model=AnswerSubmissionResponse)
+async def submit_answer(session_id: str, question_id: str, request: AnswerSubmission):
+    """
+    Submit or replace the answer to one question, e.g. for autosave
+    
+    Args:
+        session_id: Session identifier
+        question_id: Question being answered
+        request: Answer data
+        
+    Returns:
+        Whether the answer is new or replaced an earlier one
+    """
+    created = await session_manager.upsert_answer(session_id, question_id, request.answer_text, request.time_spent_seconds)
+    if created is None:
+        raise HTTPException(status_code=404, detail="Session or question not found")
+        
+    return AnswerSubmissionResponse(session_id=session_id, question_id=question_id, created=created)
+
+@app.post("/sessions/{session_id}/evaluate", response_model=EvaluationResponse)
+async def evaluate_session(session_id: str, method: str = "local"):
+    """
+    Score a session's answers against the predicted answers
+    
+    Args:
+        session_id: Session identifier
+        method: "local" to score without calling the model, "llm" to have the model
+            grade every answer concurrently (answers it misses the deadline for keep their local score)
+            
+    Returns:
+        Session evaluation with per-question scores (0-10)
+    """
+    if method not in ("local", "llm"):
+        raise HTTPException(status_code=400, detail="method must be local or llm")
+        
+    if method == "llm":
+        session = await session_manager.get_session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        evaluation = await llm_grader.grade_session(session)
+        await session_manager.save_evaluations([evaluation])
+        return EvaluationResponse(**evaluation)
+        
+    evaluations, not_found = await session_manager.evaluate_sessions([session_id])
+    if not_found:
+        raise HTTPException(status_code=404, detail="Session not found")
+        
+    return EvaluationResponse(**evaluations[0])
+
+@app.get("/sessions/{session_id}/evaluation", response_model=EvaluationResponse)
+async def get_session_evaluation(session_id: str):
+    """
+    Get the stored evaluation of a session
+    
+    Args:
+        session_id: Session identifier
+        
+    Returns:
+        Session evaluation with per-question scores
+    """
+    evaluation = await session_manager.get_evaluation(session_id)
+    if not evaluation:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+        
+    return EvaluationResponse(**evaluation)
+
+@app.post("/evaluations/batch", response_model=BatchEvaluateResponse)
+async def evaluate_sessions(request: BatchEvaluateRequest):
+    """
+    Score the answers of many sessions in one batch
+    
+    Args:
+        request: Sessions to evaluate
+        
+    Returns:
+        Evaluations of the sessions found and the IDs of those not found
+    """
+    evaluations, not_found = await session_manager.evaluate_sessions(request.session_ids)
+    
+    return BatchEvaluateResponse(
+        evaluations=[EvaluationResponse(**evaluation) for evaluation in evaluations],
+        not_found=not_found
+    )
+
 @app.get("/sessions")
-async def list_sessions():
+async def list_sessions(
+    status: Optional[str] = None,
+    interview_type: Optional[str] = None,
+    domain: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    count_only: bool = False
+):
     """
-    List all active sessions
+    List sessions, oldest first, one page at a time
     
+    Args:
+        status: Only sessions with this status (active, completed)
+        interview_type: Only sessions of this interview type
+        domain: Only sessions for this domain
+        created_after: Only sessions created at or after this ISO timestamp
+        created_before: Only sessions created before this ISO timestamp
+        cursor: next_cursor from the previous page
+        limit: Maximum number of sessions per page (1-500)
+        count_only: Only return the number of matching sessions
+        
     Returns:
-        List of active sessions
+        Page of sessions with the total match count and the next page cursor
     """
-    sessions = session_manager.get_all_sessions()
-    return {"sessions": sessions, "total": len(sessions)}
+    filters = {
+        "status": status,
+        "interview_type": interview_type,
+        "domain": domain,
+        "created_after": created_after,
+        "created_before": created_before
+    }
+    
+    try:
+        total = await session_manager.count_sessions(filters)
+        if count_only:
+            return {"total": total}
+        sessions, next_cursor = await session_manager.list_sessions_page(filters, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+        
+    return {"sessions": sessions, "total": total, "next_cursor": next_cursor}
 
 @app.delete("/sessions/{session_id}")
 async def end_session(session_id: str):
@@ -184,10 +801,10 @@ async def end_session(session_id: str):
     Returns:
         Confirmation of session end
     """
-    success = session_manager.end_session(session_id)
+    success = await session_manager.end_session(session_id)
     if not success:
         raise HTTPException(status_code=404, detail="Session not found")
-    
+        
     return {"message": "Session ended successfully"}
 
 # This is important for Vercel
@@ -0,0 +1,249 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Any, Tuple, Callable, Iterator
+
+# Default latency buckets in seconds, up to the 10 minute model read timeout
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+LabelValues = Tuple[str, ...]
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+class Metric:
+    """
+    Base class for a metric family with a fixed set of label names
+    """
+    
+    kind = "untyped"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+        
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Return (name suffix, formatted labels, value) for each sample"""
+        raise NotImplementedError
+        
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+class Counter(Metric):
+    """
+    Monotonically increasing count
+    """
+    
+    kind = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[LabelValues, float] = {}
+        
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
+            
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            return [("", _format_labels(self.labelnames, key), value) for key, value in sorted(self.values.items())]
+
+class Gauge(Counter):
+    """
+    Value that can go up and down
+    """
+    
+    kind = "gauge"
+    
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = value
+            
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+        
+    @contextmanager
+    def track(self, **labels) -> Iterator[None]:
+        """
+        Count the enclosed block as in progress
+        """
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+class Histogram(Metric):
+    """
+    Distribution of observed values in cumulative buckets
+    """
+    
+    kind = "histogram"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: (count per bucket plus +Inf, sum)
+        self.values: Dict[LabelValues, Tuple[List[int], float]] = {}
+        
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self.values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self.values[key] = (counts, total + value)
+            
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """
+        Observe how long the enclosed block takes
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+            
+    def samples(self) -> List[Tuple[str, str, float]]:
+        samples = []
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self.values.items())
+        for key, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                samples.append(("_bucket", _format_labels(self.labelnames, key, le), cumulative))
+            samples.append(("_sum", _format_labels(self.labelnames, key), total))
+            samples.append(("_count", _format_labels(self.labelnames, key), cumulative))
+        return samples
+
+class CallbackMetric(Metric):
+    """
+    Metric whose values are read from a function at scrape time
+    """
+    
+    def __init__(self, name: str, documentation: str, kind: str, labelnames: Tuple[str, ...],
+                 read: Callable[[], Dict[LabelValues, float]]):
+        super().__init__(name, documentation, labelnames)
+        self.kind = kind
+        self.read = read
+        
+    def samples(self) -> List[Tuple[str, str, float]]:
+        return [("", _format_labels(self.labelnames, key), value) for key, value in sorted(self.read().items())]
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together in the Prometheus text format
+    """
+    
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+        
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+        
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+        
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+        
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+        
+    def callback(self, name: str, documentation: str, kind: str, labelnames: Tuple[str, ...],
+                 read: Callable[[], Dict[LabelValues, float]]) -> CallbackMetric:
+        """
+        Register a metric read from existing counters (e.g. cache stats) at scrape time
+        
+        Args:
+            name: Metric name
+            documentation: Help text
+            kind: "counter" or "gauge"
+            labelnames: Label names
+            read: Function returning {label values: value}
+            
+        Returns:
+            The registered metric
+        """
+        return self._register(CallbackMetric(name, documentation, kind, labelnames, read))
+        
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+        
+        Returns:
+            Metrics text
+        """
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
+
+# Global metrics registry and the metrics recorded across the app
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by endpoint and status", ("method", "endpoint", "status"))
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by endpoint", ("method", "endpoint"))
+http_requests_in_flight = registry.gauge(
+    "http_requests_in_flight", "HTTP requests being handled")
+
+ai_upstream_duration = registry.histogram(
+    "ai_upstream_duration_seconds", "Time spent waiting on the model server per call", ("adapter", "mode"))
+ai_generations_in_flight = registry.gauge(
+    "ai_generations_in_flight", "Model calls in progress", ("adapter",))
+ai_upstream_errors = registry.counter(
+    "ai_upstream_errors_total", "Failed model calls", ("adapter", "mode"))
+ai_prompt_characters = registry.histogram(
+    "ai_prompt_characters", "Prompt length sent to the model", ("adapter",),
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000))
+ai_prompt_tokens = registry.histogram(
+    "ai_prompt_tokens", "Estimated prompt tokens sent to the model", ("adapter",),
+    buckets=(64, 128, 256, 384, 512, 768, 1024, 2048, 4096))
+ai_output_characters = registry.histogram(
+    "ai_output_characters", "Generated text length returned by the model", ("adapter",),
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000))
+
+question_parse_duration = registry.histogram(
+    "question_parse_duration_seconds", "Time spent parsing model output into questions", ("adapter",),
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1))
+questions_parsed = registry.counter(
+    "questions_parsed_total", "Questions parsed from model output", ("adapter",))
+questions_fallback = registry.counter(
+    "questions_fallback_total", "Placeholder questions added because the model returned too few", ("adapter",))
+
+answers_graded = registry.counter(
+    "answers_graded_total", "Answers graded in LLM evaluations, by the model or locally when it missed the deadline", ("source",))
+
+pdf_parse_duration = registry.histogram(
+    "pdf_parse_duration_seconds", "Time spent extracting text from PDF resumes")
@@ -69,10 +69,38 @@ class GenerateQuestionsResponse(BaseModel):
     questions: List[QuestionResponse]
     adapter_used: str
     total_questions: int
+    source: str = "model"  # "model" or "bank"
+
+class BatchGenerateRequest(BaseModel):
+    requests: List[GenerateQuestionsRequest] = Field(..., min_length=1, max_length=200, description="Sessions to generate")
+
+class BatchItemError(BaseModel):
+    index: int
+    error: str
+
+class BatchGenerateResponse(BaseModel):
+    sessions: List[Optional[GenerateQuestionsResponse]] = Field(..., description="One entry per request, None where generation failed")
+    errors: List[BatchItemError]
+
+class GenerationJobResponse(BaseModel):
+    """Response for a question generation job running in the background"""
+    session_id: str
+    status: str
+    adapter_used: str
 
 class SubmitAnswersRequest(BaseModel):
     answers: List[Dict[str, Any]] = Field(..., description="List of answers with question_id, answer_text, and optional time_spent_seconds")
 
+class AnswerSubmission(BaseModel):
+    """Answer to a single question, saved with PUT /sessions/{session_id}/answers/{question_id}"""
+    answer_text: str = Field(..., description="User's answer text")
+    time_spent_seconds: Optional[int] = Field(None, ge=0, description="Time taken to answer")
+
+class AnswerSubmissionResponse(BaseModel):
+    session_id: str
+    question_id: str
+    created: bool  # False if an earlier answer to the question was replaced
+
 class SubmitAnswersResponse(BaseModel):
     success: bool
     message: str
@@ -87,6 +115,7 @@ class SessionInfo(BaseModel):
     questions_answered: int
     created_at: str
     status: str
+    error: Optional[str] = None
     total_score: Optional[float] = None
 
 class EvaluationRequest(BaseModel):
@@ -94,6 +123,13 @@ class EvaluationRequest(BaseModel):
     total_score: Decimal = Field(..., ge=0, le=10, description="Overall session score (0-10)")
     overall_feedback: Optional[str] = Field(None, description="General feedback for the session")
 
+class AnswerScore(BaseModel):
+    """Score of one answer against the predicted answer"""
+    question_id: str
+    score: Optional[float] = None  # None if the question was not answered
+    feedback: Optional[str] = None  # Model feedback, LLM evaluations only
+    graded_by: Optional[str] = None  # "model" or "local", LLM evaluations only
+
 class EvaluationResponse(BaseModel):
     """Evaluation response model"""
     id: str
@@ -101,6 +137,16 @@ class EvaluationResponse(BaseModel):
     total_score: float
     overall_feedback: Optional[str]
     created_at: str
+    scores: List[AnswerScore] = []
+    method: Optional[str] = None  # "local" or "llm" when just evaluated
+    partial: bool = False  # True if some answers were scored locally because the model missed its deadline
+
+class BatchEvaluateRequest(BaseModel):
+    session_ids: List[str] = Field(..., min_length=1, max_length=5000, description="Sessions to evaluate")
+
+class BatchEvaluateResponse(BaseModel):
+    evaluations: List[EvaluationResponse]
+    not_found: List[str]
 
 class ErrorResponse(BaseModel):
     error: str
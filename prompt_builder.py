@@ -0,0 +1,206 @@
+import logging
+import math
+import os
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Skills and technologies looked for in resumes and job descriptions
+SKILL_TERMS = [
+    "python", "java", "javascript", "typescript", "c++", "c#", "golang", "rust", "scala", "kotlin",
+    "swift", "ruby", "php", "matlab", "sql", "nosql", "postgresql", "mysql", "mongodb", "redis",
+    "cassandra", "elasticsearch", "kafka", "spark", "hadoop", "airflow", "dbt", "snowflake", "bigquery",
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "jenkins", "ci/cd", "git", "linux",
+    "react", "angular", "vue", "node.js", "django", "flask", "fastapi", "spring", "graphql", "rest api", "restful",
+    "microservices", "system design", "distributed systems", "data structures", "algorithms",
+    "machine learning", "deep learning", "nlp", "computer vision", "llm", "pytorch", "tensorflow",
+    "scikit-learn", "pandas", "numpy", "statistics", "a/b testing", "data analysis", "data modeling",
+    "etl", "tableau", "power bi", "agile", "scrum", "product management", "stakeholder management",
+    "leadership", "mentoring", "communication", "project management", "security", "testing", "devops",
+    "mlops", "html", "css", "ios", "android"
+]
+
+SKILL_PATTERN = re.compile(
+    r"(?<![\w+#/.])(" + "|".join(re.escape(term) for term in sorted(SKILL_TERMS, key=len, reverse=True)) + r")(?![\w+#])",
+    re.IGNORECASE
+)
+# Other technology-looking words: acronyms and CamelCase names like GCP or PyTorch
+TECH_PATTERN = re.compile(r"\b[A-Z][a-z0-9]+[A-Z][A-Za-z0-9]*\b|\b[A-Z]{2,5}\b")
+YEARS_PATTERN = re.compile(r"(\d{1,2})\+?\s*(?:years?|yrs?)", re.IGNORECASE)
+SENIORITY_PATTERN = re.compile(
+    r"\b(principal|staff|lead|senior|mid-level|junior|entry-level|intern|manager|director|head)\b", re.IGNORECASE
+)
+# Contact details and links, which are never worth prompt tokens
+NOISE_PATTERN = re.compile(r"\S+@\S+|https?://\S+|www\.\S+|\+?\d[\d\s().-]{7,}\d")
+# Section headers and filler that TECH_PATTERN would otherwise pick up
+IGNORED_TERMS = frozenset({
+    "summary", "experience", "education", "skills", "projects", "contact", "objective", "profile", "work",
+    "certifications", "awards", "references", "gpa", "cv", "resume", "usa", "uk", "inc", "llc", "ltd",
+    "jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "sept", "oct", "nov", "dec", "ai", "it"
+})
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of model tokens in a text without loading a tokenizer
+    
+    Counts punctuation as one token and words as one token per four
+    characters, which tracks BPE tokenizers closely for English prompts.
+    
+    Args:
+        text: Text to measure
+        
+    Returns:
+        Estimated token count
+    """
+    return sum(math.ceil(len(piece) / 4) for piece in TOKEN_PATTERN.findall(text))
+
+def extract_keywords(text: str, limit: int = 20) -> Dict[str, Any]:
+    """
+    Extract skills, years of experience and seniority from a resume or job description
+    
+    Args:
+        text: Resume or job description text
+        limit: Maximum number of skills returned
+        
+    Returns:
+        Dictionary with "skills" (most mentioned first), "years" and "seniority"
+    """
+    text = NOISE_PATTERN.sub(" ", text)
+    counts: Counter = Counter()
+    # Known skills count double so they outrank incidental acronyms
+    for match in SKILL_PATTERN.finditer(text):
+        counts[match.group(1).lower()] += 2
+    for line in text.splitlines():
+        # All-caps lines are headers or the candidate's name, not technologies
+        if not any(char.islower() for char in line):
+            continue
+        for match in TECH_PATTERN.finditer(line):
+            term = match.group(0)
+            if term.lower() not in IGNORED_TERMS and not SKILL_PATTERN.fullmatch(term):
+                counts[term] += 1
+            
+    years = [int(match.group(1)) for match in YEARS_PATTERN.finditer(text)]
+    seniority = SENIORITY_PATTERN.search(text)
+    return {
+        "skills": [term for term, _ in counts.most_common(limit)],
+        "years": max(years) if years else None,
+        "seniority": seniority.group(1).lower() if seniority else None
+    }
+
+class PromptBuilder:
+    """
+    Builds generation prompts that fit a token budget per adapter
+    
+    Instead of pasting the start of the resume and job description (mostly
+    names, contact details and headers), the prompt lists the skills and
+    experience extracted from them, adding as many as fit in the budget left
+    after the fixed instructions. Skills the job asks for that the candidate
+    also has go first.
+    """
+    
+    def __init__(self, default_budget: int = 400, budgets: Optional[Dict[str, int]] = None):
+        self.default_budget = default_budget
+        self.budgets = budgets or {}
+        
+    @classmethod
+    def from_spec(cls, default_budget: int, spec: str) -> "PromptBuilder":
+        """
+        Create a builder from per-adapter budgets like "finetuned_Hr=250,finetuned_Dsa=500"
+        
+        Args:
+            default_budget: Budget of adapters not listed in spec
+            spec: Comma-separated adapter=tokens pairs
+            
+        Returns:
+            Prompt builder
+        """
+        budgets = {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            adapter, _, tokens = item.partition("=")
+            budgets[adapter.strip()] = int(tokens)
+        return cls(default_budget, budgets)
+        
+    def budget_for(self, adapter: str) -> int:
+        return self.budgets.get(adapter, self.default_budget)
+        
+    def build(self, domain: str, resume_text: Optional[str], jd_text: Optional[str],
+              interview_type: str, n: int, adapter: str) -> Tuple[str, int]:
+        """
+        Build a prompt within the adapter's token budget
+        
+        Args:
+            domain: Job domain
+            resume_text: Resume content
+            jd_text: Job description
+            interview_type: Type of interview
+            n: Number of questions
+            adapter: Adapter the prompt is sent to
+            
+        Returns:
+            The prompt and its estimated token count
+        """
+        head = [
+            f"You are a senior {domain} interviewer. Generate {n} {interview_type.lower()} questions: "
+            "practical, role-specific, mixing basic, intermediate and advanced difficulty."
+        ]
+        tail = [
+            "",
+            "Format every pair exactly like this, with a line break between pairs:",
+            "Q1: How would you optimize a slow database query?",
+            "A1: Key points: find bottlenecks, add indexes, optimize joins, cache. Approach: read the execution plan, index, rewrite if needed.",
+            "",
+            f"Generate {n} questions for {domain}:"
+        ]
+        budget = self.budget_for(adapter)
+        used = estimate_tokens("\n".join(head + tail))
+        
+        resume = extract_keywords(resume_text) if resume_text else None
+        role = extract_keywords(jd_text) if jd_text else None
+        context = []
+        if role:
+            # Skills the candidate shares with the role are the most useful to ask about
+            resume_skills = set(resume["skills"]) if resume else set()
+            skills = sorted(role["skills"], key=lambda skill: skill not in resume_skills)
+            line = self._fit("ROLE skills: ", skills, ". Focus on these.", budget - used)
+            if line:
+                context.append(line)
+                used += estimate_tokens(line)
+        if resume:
+            experience = ", ".join(
+                part for part in (
+                    f"{resume['years']} years" if resume["years"] else None,
+                    resume["seniority"]
+                ) if part
+            )
+            prefix = f"CANDIDATE ({experience}) skills: " if experience else "CANDIDATE skills: "
+            line = self._fit(prefix, resume["skills"], ". Match difficulty to their experience.", budget - used)
+            if line:
+                context.append(line)
+                used += estimate_tokens(line)
+                
+        prompt = "\n".join(head + context + tail)
+        return prompt, estimate_tokens(prompt)
+        
+    def _fit(self, prefix: str, terms: List[str], suffix: str, budget: int) -> Optional[str]:
+        """
+        Join as many terms as fit in budget tokens between prefix and suffix
+        """
+        cost = estimate_tokens(prefix + suffix) + 1
+        kept = []
+        for term in terms:
+            term_cost = estimate_tokens(term) + 1
+            if cost + term_cost > budget:
+                break
+            kept.append(term)
+            cost += term_cost
+        return prefix + ", ".join(kept) + suffix if kept else None
+
+# Global prompt builder instance
+prompt_builder = PromptBuilder.from_spec(
+    int(os.getenv("PROMPT_TOKEN_BUDGET", "400")),
+    os.getenv("PROMPT_TOKEN_BUDGETS", "")
+)
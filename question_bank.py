@@ -0,0 +1,362 @@
+import json
+import logging
+import os
+import random
+import re
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+from models import QuestionResponse
+from question_parser import get_question_type, is_fallback_question
+from question_index import QuestionIndex, embed
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTIES = ("basic", "intermediate", "advanced")
+
+# Wording that usually marks how deep a question goes
+ADVANCED_PATTERN = re.compile(
+    r"\b(design|architect|scale|scalab|optimi[sz]e|trade-?offs?|distributed|production|"
+    r"bottleneck|concurren|migrat|lead|mentor|conflict|strategy)\w*",
+    re.IGNORECASE
+)
+BASIC_PATTERN = re.compile(
+    r"^\s*(what is|what are|define|list|name|what does|tell me about yourself)\b",
+    re.IGNORECASE
+)
+
+def estimate_difficulty(question_text: str) -> str:
+    """
+    Estimate the difficulty of a question from its wording
+    
+    Args:
+        question_text: The interview question
+        
+    Returns:
+        "basic", "intermediate" or "advanced"
+    """
+    if ADVANCED_PATTERN.search(question_text):
+        return "advanced"
+    if BASIC_PATTERN.search(question_text):
+        return "basic"
+    return "intermediate"
+
+def normalize_domain(domain: str) -> str:
+    """
+    Normalize a domain so "Data Scientist" and " data  scientist" share a bank
+    """
+    return " ".join(domain.split()).casefold()
+
+def _normalize_text(text: str) -> str:
+    return " ".join(re.sub(r"[^\w\s]", " ", text).split()).casefold()
+
+class QuestionBank:
+    """
+    Questions from past generations, indexed by domain, interview type and difficulty
+    
+    The bank is warmed from generations made without a resume or job
+    description (those are not personalized, so they can be reused for anyone)
+    and from offline batch runs stored as JSONL. Requests for a banked
+    domain/type pair can then be served in milliseconds instead of waiting on
+    the model. Questions are also embedded into a vector index, so reworded
+    repeats are not banked twice and a job description can be matched to the
+    banked questions closest to it.
+    """
+    
+    def __init__(self, path: Optional[str] = None, max_per_key: int = 500, seed: Optional[int] = None,
+                 dedupe_threshold: float = 0.9):
+        self.path = path
+        self.max_per_key = max_per_key
+        self.dedupe_threshold = dedupe_threshold
+        self.vectors = QuestionIndex()
+        self.near_duplicates = 0
+        # (domain, interview_type) -> difficulty -> entries
+        self.index: Dict[Tuple[str, str], Dict[str, List[Dict[str, Any]]]] = {}
+        # (domain, interview_type) -> normalized question texts, to skip repeats
+        self.seen: Dict[Tuple[str, str], set] = {}
+        self.random = random.Random(seed)
+        self.served = 0
+        if path and os.path.exists(path):
+            self.load(path)
+            
+    def load(self, path: str) -> int:
+        """
+        Load banked questions from a JSONL file
+        
+        Each line holds domain, interview_type, question_text and optionally
+        predicted_answer and difficulty.
+        
+        Args:
+            path: JSONL file
+            
+        Returns:
+            Number of questions added
+        """
+        added = 0
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if self._insert(entry["domain"], entry["interview_type"], entry["question_text"],
+                                entry.get("predicted_answer"), entry.get("difficulty")):
+                    added += 1
+        logger.info(f"Loaded {added} banked questions from {path}")
+        return added
+        
+    def _insert(self, domain: str, interview_type: str, question_text: str,
+                predicted_answer: Optional[str], difficulty: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Add one question unless it is already banked or its pair is full
+        
+        Returns:
+            The new entry, or None if it was skipped
+        """
+        key = (normalize_domain(domain), interview_type)
+        seen = self.seen.setdefault(key, set())
+        text_key = _normalize_text(question_text)
+        if not text_key or text_key in seen or len(seen) >= self.max_per_key:
+            return None
+            
+        # Skip rewordings of a question already banked for the pair
+        vector = embed([question_text], self.vectors.dim)
+        if self.vectors.search(vector[0], k=1, min_score=self.dedupe_threshold,
+                               accept=lambda banked: banked["key"] == key):
+            self.near_duplicates += 1
+            return None
+        seen.add(text_key)
+        
+        if difficulty not in DIFFICULTIES:
+            difficulty = estimate_difficulty(question_text)
+        entry = {
+            "domain": domain,
+            "interview_type": interview_type,
+            "question_text": question_text,
+            "predicted_answer": predicted_answer,
+            "difficulty": difficulty
+        }
+        self.index.setdefault(key, {}).setdefault(difficulty, []).append(entry)
+        self.vectors.add(vector, [{"key": key, "entry": entry}])
+        return entry
+        
+    def add(self, domain: str, interview_type: str, questions: Iterable[QuestionResponse]) -> int:
+        """
+        Bank generated questions, skipping placeholders and repeats
+        
+        Args:
+            domain: Job domain
+            interview_type: Type of interview
+            questions: Generated questions
+            
+        Returns:
+            Number of questions added
+        """
+        new_entries = []
+        for question in questions:
+            if is_fallback_question(question):
+                continue
+            entry = self._insert(domain, interview_type, question.question_text, question.predicted_answer)
+            if entry:
+                new_entries.append(entry)
+                
+        if new_entries and self.path:
+            with open(self.path, "a") as f:
+                for entry in new_entries:
+                    f.write(json.dumps(entry) + "\n")
+        if new_entries:
+            logger.info(f"Banked {len(new_entries)} questions for {domain} {interview_type}")
+        return len(new_entries)
+        
+    def learn(self, domain: str, interview_type: str, questions: Iterable[QuestionResponse],
+              resume_text: Optional[str], jd_text: Optional[str]) -> int:
+        """
+        Bank a generation if it wasn't personalized with a resume or job description
+        
+        Args:
+            domain: Job domain
+            interview_type: Type of interview
+            questions: Generated questions
+            resume_text: Resume the questions were generated for
+            jd_text: Job description the questions were generated for
+            
+        Returns:
+            Number of questions added
+        """
+        if resume_text or jd_text:
+            return 0
+        return self.add(domain, interview_type, questions)
+        
+    def count(self, domain: str, interview_type: str, difficulty: Optional[str] = None) -> int:
+        """
+        Count banked questions for a domain/type pair
+        
+        Args:
+            domain: Job domain
+            interview_type: Type of interview
+            difficulty: Only count this difficulty
+            
+        Returns:
+            Number of banked questions
+        """
+        buckets = self.index.get((normalize_domain(domain), interview_type), {})
+        if difficulty:
+            return len(buckets.get(difficulty, []))
+        return sum(len(entries) for entries in buckets.values())
+        
+    def sample(self, domain: str, interview_type: str, n: int,
+               difficulty: Optional[str] = None) -> Optional[List[QuestionResponse]]:
+        """
+        Draw n banked questions, mixing difficulties unless one is requested
+        
+        Args:
+            domain: Job domain
+            interview_type: Type of interview
+            n: Number of questions
+            difficulty: Only draw questions of this difficulty
+            
+        Returns:
+            Questions, or None if the bank doesn't have n of them
+        """
+        buckets = self.index.get((normalize_domain(domain), interview_type), {})
+        if difficulty:
+            pools = [list(buckets.get(difficulty, []))]
+        else:
+            pools = [list(buckets.get(level, [])) for level in DIFFICULTIES]
+        if sum(len(pool) for pool in pools) < n:
+            return None
+            
+        for pool in pools:
+            self.random.shuffle(pool)
+        # Take from each difficulty in turn, like the mix the prompt asks the model for
+        picked = []
+        while len(picked) < n:
+            for pool in pools:
+                if pool and len(picked) < n:
+                    picked.append(pool.pop())
+                    
+        self.served += 1
+        return self._to_questions(picked, interview_type)
+        
+    def similar(self, domain: str, interview_type: str, query_text: str, n: int,
+                difficulty: Optional[str] = None) -> Optional[List[QuestionResponse]]:
+        """
+        Draw the n banked questions most similar to a text, e.g. a job description
+        
+        Args:
+            domain: Job domain
+            interview_type: Type of interview
+            query_text: Text to match questions to
+            n: Number of questions
+            difficulty: Only draw questions of this difficulty
+            
+        Returns:
+            Questions, or None if the bank doesn't have n of them
+        """
+        key = (normalize_domain(domain), interview_type)
+        matches = self.vectors.search(
+            embed([query_text], self.vectors.dim)[0], k=n,
+            accept=lambda banked: banked["key"] == key and difficulty in (None, banked["entry"]["difficulty"])
+        )
+        if len(matches) < n:
+            return None
+            
+        self.served += 1
+        return self._to_questions([banked["entry"] for _, banked in matches], interview_type)
+        
+    def search(self, query_text: str, domain: Optional[str] = None, interview_type: Optional[str] = None,
+               k: int = 10) -> List[Dict[str, Any]]:
+        """
+        Find banked questions similar to a text
+        
+        Args:
+            query_text: Text to match questions to
+            domain: Only search this domain
+            interview_type: Only search this interview type
+            k: Maximum number of matches
+            
+        Returns:
+            Banked entries with their similarity score, most similar first
+        """
+        domain_key = normalize_domain(domain) if domain else None
+        
+        def accept(banked: Dict[str, Any]) -> bool:
+            banked_domain, banked_type = banked["key"]
+            return domain_key in (None, banked_domain) and interview_type in (None, banked_type)
+            
+        matches = self.vectors.search(embed([query_text], self.vectors.dim)[0], k=k, accept=accept)
+        return [dict(banked["entry"], score=round(score, 4)) for score, banked in matches]
+        
+    def _to_questions(self, entries: List[Dict[str, Any]], interview_type: str) -> List[QuestionResponse]:
+        question_type = get_question_type(interview_type)
+        return [
+            QuestionResponse(
+                id=f"q_{i + 1}",
+                question_text=entry["question_text"],
+                question_type=question_type,
+                predicted_answer=entry["predicted_answer"]
+            )
+            for i, entry in enumerate(entries)
+        ]
+        
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the number of banked questions per domain/type pair
+        
+        Returns:
+            Bank statistics
+        """
+        return {
+            "pairs": {
+                f"{domain}|{interview_type}": {level: len(entries) for level, entries in buckets.items()}
+                for (domain, interview_type), buckets in self.index.items()
+            },
+            "total": sum(len(seen) for seen in self.seen.values()),
+            "served": self.served,
+            "near_duplicates_skipped": self.near_duplicates,
+            "index": self.vectors.stats()
+        }
+
+# Global question bank instance
+question_bank = QuestionBank(
+    path=os.getenv("QUESTION_BANK_PATH") or None,
+    max_per_key=int(os.getenv("QUESTION_BANK_MAX_PER_PAIR", "500")),
+    dedupe_threshold=float(os.getenv("QUESTION_BANK_DEDUPE_THRESHOLD", "0.9"))
+)
+
+if __name__ == "__main__":
+    # Offline warm-up: generate non-personalized questions for common pairs into QUESTION_BANK_PATH
+    import argparse
+    import asyncio
+    
+    from ai_client import ai_client
+    
+    parser = argparse.ArgumentParser(description="Warm the question bank with batch generations")
+    parser.add_argument("--domain", action="append", required=True, help="Domain to generate for (repeatable)")
+    parser.add_argument("--type", action="append", dest="types", help="Interview type (default: all five)")
+    parser.add_argument("--n", type=int, default=20, help="Questions per generation")
+    parser.add_argument("--rounds", type=int, default=1, help="Generations per domain/type pair")
+    args = parser.parse_args()
+    
+    if not question_bank.path:
+        parser.error("Set QUESTION_BANK_PATH to the JSONL file to write")
+        
+    async def warm():
+        types = args.types or ["HR", "Behavioral", "Technical", "Coding", "All"]
+        specs = [
+            {"domain": domain, "interview_type": interview_type, "resume_text": None, "jd_text": None, "n": args.n}
+            for domain in args.domain
+            for interview_type in types
+        ]
+        for round_number in range(args.rounds):
+            results = await ai_client.generate_batch(specs, priority="background")
+            for spec, result in zip(specs, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Round {round_number + 1}: {spec['domain']} {spec['interview_type']} failed: {result}")
+                else:
+                    question_bank.add(spec["domain"], spec["interview_type"], result)
+            # Identical specs would hit the generation cache on the next round
+            ai_client.cache = None
+        await ai_client.aclose()
+        print(json.dumps(question_bank.stats(), indent=2))
+        
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(warm())
@@ -0,0 +1,178 @@
+import logging
+import re
+import zlib
+from typing import Dict, List, Optional, Any, Callable, Iterable, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[+#][a-z0-9+#]*)?")
+
+# Words that say nothing about what a question asks
+STOPWORDS = frozenset("""
+a an and are as at be been being but by can could describe did do does doing explain for from had has have
+how i if in into is it its me of on or our please should so tell that the their them then there these this
+those to was we were what when where which while who why will with would you your yourself
+""".split())
+
+def _singular(word: str) -> str:
+    return word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase content words of a text, singularized, without stopwords
+    """
+    return [_singular(word) for word in TOKEN_PATTERN.findall(text.lower()) if word not in STOPWORDS]
+
+def _features(text: str) -> List[str]:
+    """
+    Hashed features of a text: words, 5-letter word prefixes (a cheap stemmer) and word pairs
+    """
+    words = tokenize(text)
+    features = list(words)
+    features.extend("p:" + word[:5] for word in words if len(word) > 5)
+    features.extend(f"b:{first} {second}" for first, second in zip(words, words[1:]))
+    return features
+
+def embed(texts: Iterable[str], dim: int = 512) -> np.ndarray:
+    """
+    Embed texts as L2-normalized signed feature-hashing vectors
+    
+    The hashing is stable across processes and restarts, so stored vectors
+    stay comparable with new ones without shipping a model.
+    
+    Args:
+        texts: Texts to embed
+        dim: Vector dimensions
+        
+    Returns:
+        float32 array of shape (len(texts), dim)
+    """
+    texts = list(texts)
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        hashes = np.array([zlib.crc32(feature.encode()) for feature in _features(text)], dtype=np.uint32)
+        if not len(hashes):
+            continue
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(vectors[row], hashes % dim, signs)
+    # Dampen repeated features, then normalize so dot products are cosine similarities
+    vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+class QuestionIndex:
+    """
+    In-process vector index over question texts
+    
+    Vectors are stored as float16 (half the memory of float32, plenty for
+    cosine similarity of hashed features) in one growing array. Lookups score
+    the candidates found by random-hyperplane LSH tables. Below
+    exact_threshold rows every row is scored instead, which is faster than
+    hashing at that size anyway, and so are ranking lookups (no min_score)
+    whose LSH candidates give fewer than k matches.
+    """
+    
+    def __init__(self, dim: int = 512, n_tables: int = 8, n_bits: int = 8,
+                 exact_threshold: int = 2048, seed: int = 0):
+        self.dim = dim
+        self.exact_threshold = exact_threshold
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((n_tables, dim, n_bits)).astype(np.float32)
+        self.bit_weights = 1 << np.arange(n_bits)
+        # LSH bucket code -> rows, one dict per table
+        self.tables: List[Dict[int, List[int]]] = [{} for _ in range(n_tables)]
+        self.vectors = np.zeros((64, dim), dtype=np.float16)
+        self.payloads: List[Any] = []
+        
+    def __len__(self) -> int:
+        return len(self.payloads)
+        
+    def _codes(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Bucket codes of vectors in every table, shape (len(vectors), n_tables)
+        """
+        bits = np.einsum("nd,tdb->ntb", vectors, self.planes) > 0
+        return bits.astype(np.int64) @ self.bit_weights
+        
+    def add(self, vectors: np.ndarray, payloads: List[Any]) -> List[int]:
+        """
+        Add embedded vectors with the payloads returned when they match
+        
+        Args:
+            vectors: Vectors from embed()
+            payloads: One payload per vector
+            
+        Returns:
+            Row of each added vector
+        """
+        start = len(self.payloads)
+        end = start + len(payloads)
+        if end > len(self.vectors):
+            grown = np.zeros((max(end, 2 * len(self.vectors)), self.dim), dtype=np.float16)
+            grown[:start] = self.vectors[:start]
+            self.vectors = grown
+        self.vectors[start:end] = vectors
+        self.payloads.extend(payloads)
+        
+        for offset, codes in enumerate(self._codes(vectors)):
+            for table, code in zip(self.tables, codes):
+                table.setdefault(int(code), []).append(start + offset)
+        return list(range(start, end))
+        
+    def _candidates(self, vector: np.ndarray) -> np.ndarray:
+        rows = set()
+        for table, code in zip(self.tables, self._codes(vector[None, :])[0]):
+            rows.update(table.get(int(code), ()))
+        return np.fromiter(rows, dtype=np.int64, count=len(rows))
+        
+    def search(self, vector: np.ndarray, k: int = 10, min_score: float = -1.0,
+               accept: Optional[Callable[[Any], bool]] = None) -> List[Tuple[float, Any]]:
+        """
+        Find the stored vectors most similar to a query vector
+        
+        Args:
+            vector: Query vector from embed()
+            k: Maximum number of matches
+            min_score: Lowest cosine similarity returned
+            accept: Only return payloads this returns True for
+            
+        Returns:
+            (similarity, payload) pairs, most similar first
+        """
+        if not self.payloads:
+            return []
+        query = vector.astype(np.float16)
+        if len(self.payloads) > self.exact_threshold:
+            matches = self._rank(self._candidates(vector), query, k, min_score, accept)
+            if len(matches) == k or min_score > -1.0:
+                return matches
+        return self._rank(np.arange(len(self.payloads)), query, k, min_score, accept)
+        
+    def _rank(self, rows: np.ndarray, query: np.ndarray, k: int, min_score: float,
+              accept: Optional[Callable[[Any], bool]]) -> List[Tuple[float, Any]]:
+        scores = self.vectors[rows] @ query
+        matches = []
+        for position in np.argsort(-scores.astype(np.float32)):
+            score = float(scores[position])
+            if score < min_score or len(matches) >= k:
+                break
+            payload = self.payloads[rows[position]]
+            if accept is None or accept(payload):
+                matches.append((score, payload))
+        return matches
+        
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the number of vectors and the memory they take
+        
+        Returns:
+            Index statistics
+        """
+        return {
+            "vectors": len(self.payloads),
+            "dimensions": self.dim,
+            "vector_bytes": len(self.payloads) * self.dim * self.vectors.itemsize,
+            "lsh_tables": len(self.tables)
+        }
@@ -0,0 +1,257 @@
+import re
+from typing import List, Optional, Iterator, Tuple, Pattern
+from models import QuestionResponse
+
+QUESTION_TYPE_MAP = {
+    "HR": "hr",
+    "Behavioral": "behavioral",
+    "Technical": "technical",
+    "Coding": "coding",
+    "All": "mixed"
+}
+
+# Question and answer markers with their common variants: 'Q1:', 'Question 1:',
+# 'Q1)', '**Q1:**', '**Q1**:', '__A2__'. Each pattern starts with a literal so the
+# regex engine can skip quickly to candidates; the opening '**'/'__' and the word
+# boundary before a marker are checked in marker_spans().
+QUESTION_MARKER = re.compile(r'Q(?:uestion)?[ \t]*\d+[ \t]*(?:(?:\*\*|__)[ \t]*[:.)]?|[:)])(?:\*\*|__)?')
+ANSWER_MARKER = re.compile(r'A(?:nswer)?[ \t]*\d+[ \t]*(?:(?:\*\*|__)[ \t]*[:.)]?|[:)])(?:\*\*|__)?')
+
+# Longest partial marker that can straddle two streamed chunks
+MAX_MARKER_LENGTH = 24
+
+# Characters left over around question/answer text by markdown-style markers
+STRIP_CHARS = " \t\r\n*_:"
+
+# Predicted answer of placeholder questions padding short model output
+FALLBACK_ANSWER = "This is a sample question. Please provide a comprehensive answer based on your experience and knowledge."
+
+def get_question_type(interview_type: str) -> str:
+    """
+    Get the question category stored for an interview type
+    
+    Args:
+        interview_type: The type of interview (HR, Behavioral, etc.)
+        
+    Returns:
+        Question type label
+    """
+    return QUESTION_TYPE_MAP.get(interview_type, "interview_question")
+
+def _marker_start(text: str, start: int) -> int:
+    """
+    Get where a marker really starts, including an opening '**' or '__'
+    
+    Returns:
+        Start position, or -1 if the match is part of a word (e.g. 'FAQ1:')
+    """
+    if start == 0:
+        return 0
+    previous = text[start - 1]
+    if previous == "*" or previous == "_":
+        if text[start - 2:start] not in ("**", "__"):
+            return -1
+        start -= 2
+        if start and (text[start - 1].isalnum() or text[start - 1] == "_"):
+            return -1
+    elif previous.isalnum():
+        return -1
+    return start
+
+def marker_spans(pattern: Pattern, text: str, pos: int = 0) -> List[Tuple[int, int]]:
+    """
+    Find all markers of one kind
+    
+    Args:
+        pattern: QUESTION_MARKER or ANSWER_MARKER
+        text: Text to search
+        pos: Position to start searching from
+        
+    Returns:
+        (start, end) of each marker, in order
+    """
+    spans = []
+    for match in pattern.finditer(text, pos):
+        start = _marker_start(text, match.start())
+        if start >= 0:
+            spans.append((start, match.end()))
+    return spans
+
+def iter_question_pairs(text: str) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Split model output into (question, answer) pairs in a single pass over its markers
+    
+    The first answer marker after a question marker starts its answer, which
+    runs until the next question marker. Answer numbers are not required to
+    match their question, and questions without an answer get None.
+    
+    Args:
+        text: Raw text from AI model
+        
+    Yields:
+        (question text, predicted answer or None) for each non-empty question
+    """
+    questions = marker_spans(QUESTION_MARKER, text)
+    answers = marker_spans(ANSWER_MARKER, text)
+    a = 0
+    
+    for i, (_, question_start) in enumerate(questions):
+        end = questions[i + 1][0] if i + 1 < len(questions) else len(text)
+        
+        # Skip answer markers belonging to earlier questions
+        while a < len(answers) and answers[a][0] < question_start:
+            a += 1
+            
+        if a < len(answers) and answers[a][0] < end:
+            question_text = text[question_start:answers[a][0]].strip(STRIP_CHARS)
+            predicted_answer = text[answers[a][1]:end].strip(STRIP_CHARS) or None
+        else:
+            question_text = text[question_start:end].strip(STRIP_CHARS)
+            predicted_answer = None
+            
+        if question_text:
+            yield question_text, predicted_answer
+
+def count_questions(text: str) -> int:
+    """
+    Count the questions that can be parsed from model output
+    
+    Args:
+        text: Raw text from AI model
+        
+    Returns:
+        Number of non-empty questions
+    """
+    return sum(1 for _ in iter_question_pairs(text))
+
+def build_question(index: int, question_text: str, predicted_answer: Optional[str],
+                   question_type: str) -> QuestionResponse:
+    """
+    Build the API question for a parsed pair
+    
+    Args:
+        index: Zero-based position of the question
+        question_text: Parsed question
+        predicted_answer: Parsed answer, if any
+        question_type: Question category
+        
+    Returns:
+        Question response
+    """
+    return QuestionResponse(
+        id=f"q_{index + 1}",
+        question_text=question_text,
+        question_type=question_type,
+        predicted_answer=predicted_answer
+    )
+
+def build_fallback_question(index: int, question_type: str) -> QuestionResponse:
+    """
+    Build a placeholder question used when the model returned too few questions
+    
+    Args:
+        index: Zero-based position of the question
+        question_type: Question category
+        
+    Returns:
+        Placeholder question
+    """
+    return QuestionResponse(
+        id=f"q_{index + 1}",
+        question_text=f"Please provide a detailed answer to this {index + 1}th interview question.",
+        question_type=question_type,
+        predicted_answer=FALLBACK_ANSWER
+    )
+
+def is_fallback_question(question: QuestionResponse) -> bool:
+    """
+    Check whether a question is a placeholder rather than model output
+    
+    Args:
+        question: Question to check
+        
+    Returns:
+        True for placeholders built by build_fallback_question
+    """
+    return question.predicted_answer == FALLBACK_ANSWER
+
+def parse_questions(text: str, expected_count: int, interview_type: str = "Technical") -> Tuple[List[QuestionResponse], int]:
+    """
+    Parse model output into exactly expected_count questions
+    
+    Args:
+        text: Raw text from AI model
+        expected_count: Expected number of questions
+        interview_type: The type of interview to determine question type
+        
+    Returns:
+        Questions padded with placeholders up to expected_count, and how many were parsed
+    """
+    question_type = get_question_type(interview_type)
+    questions = []
+    for question_text, predicted_answer in iter_question_pairs(text):
+        if len(questions) == expected_count:
+            break
+        questions.append(build_question(len(questions), question_text, predicted_answer, question_type))
+        
+    parsed = len(questions)
+    for i in range(parsed, expected_count):
+        questions.append(build_fallback_question(i, question_type))
+    return questions, parsed
+
+class StreamingQuestionParser:
+    """
+    Incremental parser that turns streamed model output into complete Q/A pairs
+    
+    A pair is complete once the marker of the following question has arrived;
+    the last pair is completed by finish(). Only the unfinished block is kept
+    and only newly received text is scanned for markers.
+    """
+    
+    def __init__(self):
+        self.buffer = ""
+        # Start of the current question's marker in the buffer, if one was seen
+        self.block_start: Optional[int] = None
+        # Position from which to look for the next question marker
+        self.scan_from = 0
+        
+    def feed(self, chunk: str) -> List[Tuple[str, Optional[str]]]:
+        """
+        Add a chunk of model output
+        
+        Args:
+            chunk: Newly generated text
+            
+        Returns:
+            (question, answer) pairs completed by this chunk
+        """
+        self.buffer += chunk
+        blocks = []
+        
+        for start, _ in marker_spans(QUESTION_MARKER, self.buffer, self.scan_from):
+            if self.block_start is not None:
+                blocks.append(self.buffer[self.block_start:start])
+            self.block_start = start
+            
+        # Drop completed blocks and rescan only the tail that may hold a partial marker
+        if self.block_start is not None:
+            self.buffer = self.buffer[self.block_start:]
+            self.block_start = 0
+            self.scan_from = max(1, len(self.buffer) - MAX_MARKER_LENGTH)
+        else:
+            self.scan_from = max(0, len(self.buffer) - MAX_MARKER_LENGTH)
+            
+        return [pair for block in blocks for pair in iter_question_pairs(block)]
+        
+    def finish(self) -> List[Tuple[str, Optional[str]]]:
+        """
+        Flush the last pair once the stream has ended
+        
+        Returns:
+            Remaining (question, answer) pair, if any
+        """
+        remaining = self.buffer if self.block_start is not None else ""
+        self.buffer = ""
+        self.block_start = None
+        self.scan_from = 0
+        return list(iter_question_pairs(remaining))
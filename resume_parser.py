@@ -0,0 +1,179 @@
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Set
+
+from cache import TextCache, resume_cache
+from utils import PDFTimeout, extract_pdf_text
+from metrics import pdf_parse_duration
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+class ResumeParserBusy(Exception):
+    """Raised when the resume parsing queue is full"""
+
+class ResumeParser:
+    """
+    Extracts resume text from PDFs on a bounded process pool
+    
+    PyPDF2 is CPU-bound, so extraction runs outside the event loop in worker
+    processes, one PDF per task: PyPDF2 has to parse the whole document to
+    reach any page, so splitting a PDF's pages across workers would parse it
+    once per worker. Parallelism is across uploads instead.
+    
+    Workers enforce the per-file time limit themselves. If one still overruns
+    it by the grace period, new PDFs go to a fresh pool and the old one is
+    drained: its processes are killed once only overrunning tasks are left,
+    so other uploads it was parsing still finish.
+    """
+    
+    def __init__(self, max_workers: int = 2, max_queue: int = 16, timeout_seconds: float = 30,
+                 max_pages: int = 50, grace_seconds: float = 5, cache: Optional[TextCache] = None):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self.max_pages = max_pages
+        self.grace_seconds = grace_seconds
+        # PDFs queued or being parsed, counted until their worker task really ends
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Tasks not yet finished on each pool, current or retired
+        self._outstanding: Dict[ProcessPoolExecutor, int] = {}
+        # Retired pools and their tasks that overran the time limit
+        self._retired: Dict[ProcessPoolExecutor, Set[asyncio.Future]] = {}
+        # Extracted text keyed by SHA-256 of the PDF bytes, so repeat uploads skip parsing
+        self.cache = cache
+        
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """
+        Worker process pool, started on first use
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+        
+    def shutdown(self):
+        """
+        Stop the worker processes
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        for executor in list(self._retired):
+            self._kill(executor)
+            
+    def _kill(self, executor: ProcessPoolExecutor):
+        """
+        Terminate a retired pool's worker processes
+        """
+        del self._retired[executor]
+        # ProcessPoolExecutor can't cancel running tasks, so terminate its processes
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+            
+    def _retire(self, executor: ProcessPoolExecutor, future: asyncio.Future):
+        """
+        Stop sending PDFs to a pool with a task stuck past its time limit
+        """
+        if self._executor is executor:
+            logger.warning("Replacing resume parser workers after a PDF overran its time limit")
+            self._executor = None
+        self._retired.setdefault(executor, set()).add(future)
+        self._reap(executor)
+        
+    def _reap(self, executor: ProcessPoolExecutor):
+        """
+        Kill a retired pool once only its overrunning tasks are left
+        """
+        stuck = self._retired.get(executor)
+        if stuck is not None and self._outstanding.get(executor, 0) <= len(stuck):
+            self._kill(executor)
+            
+    def _release(self, executor: ProcessPoolExecutor, future: asyncio.Future):
+        """
+        Free a queue slot once a worker task has finished
+        """
+        self.pending -= 1
+        self._outstanding[executor] -= 1
+        if not self._outstanding[executor]:
+            del self._outstanding[executor]
+        if executor in self._retired:
+            self._retired[executor].discard(future)
+            self._reap(executor)
+        # Mark the result retrieved when nobody awaits it anymore (after a timeout)
+        if not future.cancelled():
+            future.exception()
+            
+    async def parse_pdf(self, pdf_content: bytes) -> str:
+        """
+        Parse PDF content to text without blocking the event loop
+        
+        Args:
+            pdf_content: PDF file content as bytes
+            
+        Returns:
+            Extracted text from PDF
+            
+        Raises:
+            ResumeParserBusy: If too many PDFs are already queued
+            Exception: If PDF parsing fails or times out
+        """
+        content_hash = hashlib.sha256(pdf_content).hexdigest()
+        if self.cache is not None:
+            cached_text = self.cache.get(content_hash)
+            if cached_text is not None:
+                logger.info(f"Using cached text for resume {content_hash[:12]}")
+                return cached_text
+                
+        if self.pending >= self.max_queue:
+            logger.warning(f"Resume parser queue full ({self.pending} pending)")
+            raise ResumeParserBusy("Resume parser is busy. Please try again.")
+            
+        self.pending += 1
+        loop = asyncio.get_running_loop()
+        executor = self.executor
+        self._outstanding[executor] = self._outstanding.get(executor, 0) + 1
+        future = loop.run_in_executor(executor, extract_pdf_text, pdf_content, self.max_pages, self.timeout_seconds)
+        # The slot is freed when the worker task ends, not when this request stops waiting
+        future.add_done_callback(functools.partial(self._release, executor))
+        try:
+            with pdf_parse_duration.time(), span("pdf", bytes=len(pdf_content)):
+                page_count, pages = await asyncio.wait_for(
+                    asyncio.shield(future), timeout=self.timeout_seconds + self.grace_seconds
+                )
+        except (PDFTimeout, asyncio.TimeoutError) as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self._retire(executor, future)
+            logger.error(f"PDF parsing timed out after {self.timeout_seconds} seconds")
+            raise Exception("PDF parsing failed: timed out")
+        except Exception as e:
+            logger.error(f"Failed to parse PDF: {str(e)}")
+            raise Exception(f"PDF parsing failed: {str(e)}")
+            
+        if page_count > self.max_pages:
+            logger.warning(f"PDF has {page_count} pages, only parsed the first {self.max_pages}")
+        text = "\n".join(pages).strip()
+        if not text:
+            logger.error("Failed to parse PDF: no text extracted")
+            raise Exception("PDF parsing failed: No text could be extracted from the PDF")
+            
+        logger.info(f"Successfully extracted {len(text)} characters from {len(pages)} PDF pages")
+        if self.cache is not None:
+            self.cache.set(content_hash, text)
+        return text
+
+# Global resume parser instance
+resume_parser = ResumeParser(
+    max_workers=int(os.getenv("RESUME_PARSER_WORKERS", "2")),
+    max_queue=int(os.getenv("RESUME_PARSER_QUEUE", "16")),
+    timeout_seconds=float(os.getenv("RESUME_PARSER_TIMEOUT", "30")),
+    max_pages=int(os.getenv("RESUME_PARSER_MAX_PAGES", "50")),
+    cache=resume_cache
+)
@@ -12,18 +12,29 @@ CREATE TABLE sessions (
     resume_text TEXT, -- parsed resume content
     job_description TEXT, -- job description text
     total_score DECIMAL(3,1) NULL, -- overall session score (0-10)
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    adapter_used VARCHAR(50), -- AI adapter that generated the questions
+    status VARCHAR(20) NOT NULL DEFAULT 'active', -- pending, active, failed, completed
+    error TEXT, -- why background question generation failed
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    INDEX idx_sessions_created_at (created_at, id),
+    INDEX idx_sessions_status (status, created_at, id),
+    INDEX idx_sessions_interview_type (interview_type, created_at, id),
+    INDEX idx_sessions_domain (domain, created_at, id)
 );
 
 -- Questions table - stores generated questions with predicted answers
+-- Question IDs (q_1, q_2, ...) are only unique within a session
 CREATE TABLE questions (
-    id VARCHAR(36) PRIMARY KEY DEFAULT (UUID()),
+    id VARCHAR(36) NOT NULL,
     session_id VARCHAR(36) NOT NULL,
+    position INT NOT NULL, -- order of the question in the session
     question_text TEXT NOT NULL,
     predicted_answer TEXT, -- ideal/expected answer
     question_type VARCHAR(50), -- category of question (sql, dsa, behavioural, technical, hr)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
+    PRIMARY KEY (session_id, id),
     FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE
 );
 
@@ -31,12 +42,12 @@ CREATE TABLE questions (
 CREATE TABLE user_answers (
     id VARCHAR(36) PRIMARY KEY DEFAULT (UUID()),
     session_id VARCHAR(36) NOT NULL,
-    question_id VARCHAR(36) NOT NULL,
+    question_id VARCHAR(36) NOT NULL, -- questions.id within the same session
     answer_text TEXT NOT NULL,
     time_spent_seconds INT NULL, -- time taken to answer (if tracked)
+    score DECIMAL(3,1) NULL, -- score against the predicted answer (0-10)
     
     FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE,
-    FOREIGN KEY (question_id) REFERENCES questions(id) ON DELETE CASCADE,
     UNIQUE KEY unique_session_question_answer (session_id, question_id)
 );
 
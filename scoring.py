@@ -0,0 +1,175 @@
+import logging
+import os
+from typing import Dict, List, Any, Tuple
+
+import numpy as np
+
+from question_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Labels from the predicted answer format ("Key points: ... Approach: ...")
+REFERENCE_LABELS = frozenset({"key", "point", "approach"})
+
+def _terms(text: str) -> List[str]:
+    return [term for term in tokenize(text) if term not in REFERENCE_LABELS]
+
+class AnswerScorer:
+    """
+    Scores answers against predicted answers locally, without calling the model
+    
+    Each answer gets 0-10 from the TF-IDF cosine similarity between it and the
+    predicted answer and from how much of the predicted answer's vocabulary it
+    covers (weighted by IDF, so key terms count more than common words). All
+    pairs in a call are scored together: term weights, norms and overlaps are
+    computed with NumPy over flat (pair, term) arrays, so a whole cohort takes
+    about as long as tokenizing its text.
+    """
+    
+    def __init__(self, similarity_weight: float = 0.5, full_marks: float = 0.45, min_answer_words: int = 8):
+        self.similarity_weight = similarity_weight
+        # Blended similarity that earns a 10; answers rarely reuse most of the reference wording
+        self.full_marks = full_marks
+        self.min_answer_words = min_answer_words
+        
+    def score_pairs(self, pairs: List[Tuple[str, str]]) -> np.ndarray:
+        """
+        Score answers against their reference answers
+        
+        Args:
+            pairs: (reference answer, user answer) pairs
+            
+        Returns:
+            Score per pair, 0-10 rounded to one decimal
+        """
+        if not pairs:
+            return np.zeros(0)
+        vocabulary: Dict[str, int] = {}
+        reference_docs = [[vocabulary.setdefault(t, len(vocabulary)) for t in _terms(ref)] for ref, _ in pairs]
+        answer_docs = [[vocabulary.setdefault(t, len(vocabulary)) for t in _terms(ans)] for _, ans in pairs]
+        n_pairs, n_terms = len(pairs), max(len(vocabulary), 1)
+        
+        reference_keys, reference_counts = self._term_counts(reference_docs, n_terms)
+        answer_keys, answer_counts = self._term_counts(answer_docs, n_terms)
+        
+        # Document frequency over every reference and answer in the call
+        df = np.bincount(reference_keys % n_terms, minlength=n_terms) + np.bincount(answer_keys % n_terms, minlength=n_terms)
+        idf = np.log((1 + 2 * n_pairs) / (1 + df)) + 1
+        
+        reference_idf = idf[reference_keys % n_terms]
+        answer_idf = idf[answer_keys % n_terms]
+        reference_weights = (1 + np.log(reference_counts)) * reference_idf
+        answer_weights = (1 + np.log(answer_counts)) * answer_idf
+        reference_pairs = reference_keys // n_terms
+        answer_pairs = answer_keys // n_terms
+        
+        # Terms a pair's answer shares with its reference
+        _, in_reference, in_answer = np.intersect1d(reference_keys, answer_keys, assume_unique=True, return_indices=True)
+        shared_pairs = reference_pairs[in_reference]
+        
+        dot = np.bincount(shared_pairs, reference_weights[in_reference] * answer_weights[in_answer], minlength=n_pairs)
+        norms = (np.sqrt(np.bincount(reference_pairs, reference_weights ** 2, minlength=n_pairs))
+                 * np.sqrt(np.bincount(answer_pairs, answer_weights ** 2, minlength=n_pairs)))
+        similarity = np.divide(dot, norms, out=np.zeros(n_pairs), where=norms > 0)
+        
+        covered = np.bincount(shared_pairs, reference_idf[in_reference], minlength=n_pairs)
+        total = np.bincount(reference_pairs, reference_idf, minlength=n_pairs)
+        coverage = np.divide(covered, total, out=np.zeros(n_pairs), where=total > 0)
+        
+        # Very short answers can't earn full marks however well they match
+        answer_lengths = np.array([len(doc) for doc in answer_docs])
+        reference_lengths = np.array([len(doc) for doc in reference_docs])
+        expected = np.maximum(1, np.minimum(self.min_answer_words, reference_lengths))
+        length_factor = np.minimum(1.0, answer_lengths / expected)
+        
+        blended = self.similarity_weight * similarity + (1 - self.similarity_weight) * coverage
+        scores = 10 * np.clip(blended / self.full_marks, 0, 1) * length_factor
+        return np.round(scores, 1)
+        
+    @staticmethod
+    def _term_counts(docs: List[List[int]], n_terms: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Flatten documents into unique pair * n_terms + term keys with their counts
+        """
+        lengths = [len(doc) for doc in docs]
+        terms = np.fromiter((term for doc in docs for term in doc), dtype=np.int64, count=sum(lengths))
+        pair_ids = np.repeat(np.arange(len(docs), dtype=np.int64), lengths)
+        return np.unique(pair_ids * n_terms + terms, return_counts=True)
+        
+    def score_sessions(self, sessions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Score every answered question of several sessions in one pass
+        
+        Questions without a predicted answer are scored against the question
+        itself; unanswered questions score 0 and count towards the average.
+        
+        Args:
+            sessions: Session data with questions and answers
+            
+        Returns:
+            Per session: session_id, total_score, overall_feedback and per-question scores
+        """
+        pairs = []
+        owners = []
+        for s, session in enumerate(sessions):
+            answers = {str(a.get("question_id")): a.get("answer_text") or "" for a in session["answers"]}
+            for question in session["questions"]:
+                answer = answers.get(question["id"])
+                if answer:
+                    pairs.append((question.get("predicted_answer") or question["question_text"], answer))
+                    owners.append((s, question["id"]))
+        scores = self.score_pairs(pairs)
+        
+        by_session: List[Dict[str, float]] = [{} for _ in sessions]
+        for (s, question_id), score in zip(owners, scores):
+            by_session[s][question_id] = float(score)
+            
+        evaluations = []
+        for session, question_scores in zip(sessions, by_session):
+            question_ids = [question["id"] for question in session["questions"]]
+            all_scores = [question_scores.get(question_id, 0.0) for question_id in question_ids]
+            total_score = round(sum(all_scores) / len(all_scores), 1) if all_scores else 0.0
+            evaluations.append({
+                "session_id": session["session_id"],
+                "total_score": total_score,
+                "overall_feedback": self._feedback(session, question_scores),
+                "method": "local",
+                "scores": [
+                    {"question_id": question_id, "score": question_scores.get(question_id)}
+                    for question_id in question_ids
+                ]
+            })
+        logger.info(f"Scored {len(pairs)} answers across {len(sessions)} sessions")
+        return evaluations
+        
+    def _feedback(self, session: Dict[str, Any], question_scores: Dict[str, float]) -> str:
+        """
+        Summarize a session's scores and the key points missing from its weakest answer
+        """
+        total = len(session["questions"])
+        if not question_scores:
+            return f"No answers submitted for {total} questions."
+        feedback = [f"Answered {len(question_scores)} of {total} questions."]
+        
+        weakest_id = min(question_scores, key=question_scores.get)
+        strongest_id = max(question_scores, key=question_scores.get)
+        if weakest_id != strongest_id:
+            feedback.append(f"Strongest answer: {strongest_id} ({question_scores[strongest_id]}/10); "
+                            f"weakest: {weakest_id} ({question_scores[weakest_id]}/10).")
+                            
+        weakest = next(q for q in session["questions"] if q["id"] == weakest_id)
+        answer = next(str(a.get("answer_text") or "") for a in session["answers"] if str(a.get("question_id")) == weakest_id)
+        answered_terms = set(_terms(answer))
+        missing = []
+        for term in _terms(weakest.get("predicted_answer") or ""):
+            if term not in answered_terms and term not in missing and len(term) > 3:
+                missing.append(term)
+        if missing:
+            feedback.append(f"For {weakest_id}, cover key points such as: {', '.join(missing[:5])}.")
+        return " ".join(feedback)
+
+# Global answer scorer instance
+answer_scorer = AnswerScorer(
+    similarity_weight=float(os.getenv("SCORING_SIMILARITY_WEIGHT", "0.5")),
+    full_marks=float(os.getenv("SCORING_FULL_MARKS", "0.45"))
+)
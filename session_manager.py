@@ -1,25 +1,53 @@
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
+import asyncio
+import base64
+import json
 import logging
+import uuid
 from datetime import datetime, timedelta
 from models import SessionInfo, QuestionResponse, Session, Question, UserAnswer
 from utils import generate_session_id, get_current_timestamp
+from session_store import SessionStore, create_session_store
+from scoring import answer_scorer
+from tracing import span
 
 logger = logging.getLogger(__name__)
 
 class SessionManager:
     """
-    In-memory session management for interview sessions
+    Session management for interview sessions on top of a pluggable SessionStore
+    
+    Calls to a blocking store (SQLite) run in worker threads so they never
+    stall the event loop; the in-memory store is used directly on the loop,
+    which keeps its indexes free of cross-thread access.
     """
     
-    def __init__(self):
-        # In-memory storage for sessions
-        self.sessions: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, store: Optional[SessionStore] = None):
+        # Storage backend for sessions (in-memory unless configured otherwise)
+        self.store = store if store is not None else create_session_store()
         # Session timeout (24 hours)
         self.session_timeout = timedelta(hours=24)
+        # Background task evicting expired sessions
+        self._sweeper: Optional[asyncio.Task] = None
+        
+    async def _run(self, method: Callable[..., Any], *args) -> Any:
+        """
+        Call a store method, in a worker thread if the store blocks
         
-    def create_session(self, domain: str, interview_type: str, questions: List[QuestionResponse], 
+        Args:
+            method: Bound store method
+            *args: Arguments of the call
+            
+        Returns:
+            The method's result
+        """
+        if self.store.blocking:
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+        
+    async def create_session(self, domain: str, interview_type: str, questions: List[QuestionResponse], 
                       adapter_used: str, resume_text: Optional[str] = None, 
-                      job_description: Optional[str] = None) -> str:
+                      job_description: Optional[str] = None, status: str = "active") -> str:
         """
         Create a new interview session
         
@@ -28,6 +56,7 @@ class SessionManager:
             interview_type: Type of interview
             questions: Generated questions
             adapter_used: AI adapter that was used
+            status: Initial status, "pending" while questions are generated in the background
             
         Returns:
             Session ID
@@ -47,15 +76,55 @@ class SessionManager:
             "answers": [],
             "total_score": None,
             "created_at": get_current_timestamp(),
-            "status": "active"
+            "status": status,
+            "error": None
         }
         
-        self.sessions[session_id] = session_data
+        with span("session"):
+            await self._run(self.store.create_session, session_data)
         logger.info(f"Created new session {session_id} for {domain} {interview_type} interview")
         
         return session_id
-    
-    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        
+    async def create_sessions(self, specs: List[Dict[str, Any]]) -> List[str]:
+        """
+        Create many interview sessions in one store transaction
+        
+        Args:
+            specs: Dicts with domain, interview_type, questions, adapter_used and
+                optional resume_text and job_description
+                
+        Returns:
+            Session IDs, in the order of specs
+        """
+        created_at = get_current_timestamp()
+        sessions = [
+            {
+                "session_id": generate_session_id(),
+                "domain": spec["domain"],
+                "interview_type": spec["interview_type"],
+                "resume_text": spec.get("resume_text"),
+                "job_description": spec.get("job_description"),
+                "questions": [q.dict() for q in spec["questions"]],
+                "adapter_used": spec["adapter_used"],
+                "total_questions": len(spec["questions"]),
+                "questions_answered": 0,
+                "answers": [],
+                "total_score": None,
+                "created_at": created_at,
+                "status": "active",
+                "error": None
+            }
+            for spec in specs
+        ]
+        
+        with span("session", count=len(sessions)):
+            await self._run(self.store.create_many, sessions)
+        logger.info(f"Created {len(sessions)} sessions in one batch")
+        
+        return [session["session_id"] for session in sessions]
+        
+    async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """
         Get session data by ID
         
@@ -65,21 +134,36 @@ class SessionManager:
         Returns:
             Session data or None if not found
         """
-        if session_id not in self.sessions:
+        session = await self._run(self.store.get_session, session_id)
+        if session is None:
             return None
             
-        session = self.sessions[session_id]
-        
         # Check if session has expired
         created_at = datetime.fromisoformat(session["created_at"])
         if datetime.now() - created_at > self.session_timeout:
             logger.info(f"Session {session_id} has expired, removing")
-            del self.sessions[session_id]
+            await self._run(self.store.delete_session, session_id)
             return None
             
         return session
-    
-    def update_session_answers(self, session_id: str, answers: List[Dict[str, Any]]) -> bool:
+        
+    async def add_questions(self, session_id: str, questions: List[QuestionResponse]) -> bool:
+        """
+        Append questions to an existing session (used while streaming generation)
+        
+        Args:
+            session_id: Session identifier
+            questions: Newly generated questions
+            
+        Returns:
+            True if successful, False if session not found
+        """
+        if not await self._run(self.store.add_questions, session_id, [q.dict() for q in questions]):
+            logger.warning(f"Attempted to add questions to non-existent session {session_id}")
+            return False
+        return True
+        
+    async def update_session_answers(self, session_id: str, answers: List[Dict[str, Any]]) -> bool:
         """
         Update session with user answers
         
@@ -90,18 +174,40 @@ class SessionManager:
         Returns:
             True if successful, False if session not found
         """
-        if session_id not in self.sessions:
+        if not await self._run(self.store.update_answers, session_id, answers):
             logger.warning(f"Attempted to update non-existent session {session_id}")
             return False
             
-        session = self.sessions[session_id]
-        session["answers"] = answers
-        session["questions_answered"] = len(answers)
-        
         logger.info(f"Updated session {session_id} with {len(answers)} answers")
         return True
-    
-    def get_session_info(self, session_id: str) -> Optional[SessionInfo]:
+        
+    async def upsert_answer(self, session_id: str, question_id: str, answer_text: str,
+                      time_spent_seconds: Optional[int] = None) -> Optional[bool]:
+        """
+        Save the answer to one question, replacing an earlier answer to it
+        
+        Only this answer is written, so clients can autosave each answer
+        without resending the others.
+        
+        Args:
+            session_id: Session identifier
+            question_id: Question being answered
+            answer_text: User's answer text
+            time_spent_seconds: Time taken to answer
+            
+        Returns:
+            True if the answer is new, False if it replaced one, None if the session or question was not found
+        """
+        created = await self._run(self.store.upsert_answer, session_id, {
+            "question_id": question_id,
+            "answer_text": answer_text,
+            "time_spent_seconds": time_spent_seconds
+        })
+        if created is None:
+            logger.warning(f"Attempted to answer question {question_id} of missing session or question in {session_id}")
+        return created
+        
+    async def get_session_info(self, session_id: str) -> Optional[SessionInfo]:
         """
         Get session information as SessionInfo model
         
@@ -111,10 +217,22 @@ class SessionManager:
         Returns:
             SessionInfo object or None if not found
         """
-        session = self.get_session(session_id)
+        session = await self.get_session(session_id)
         if not session:
             return None
             
+        return self._to_session_info(session)
+        
+    def _to_session_info(self, session: Dict[str, Any]) -> SessionInfo:
+        """
+        Build a SessionInfo from session data
+        
+        Args:
+            session: Session data
+            
+        Returns:
+            SessionInfo object
+        """
         return SessionInfo(
             session_id=session["session_id"],
             domain=session["domain"],
@@ -123,10 +241,102 @@ class SessionManager:
             questions_answered=session["questions_answered"],
             created_at=session["created_at"],
             status=session["status"],
-            total_score=float(session["total_score"]) if session["total_score"] else None
+            error=session.get("error"),
+            total_score=float(session["total_score"]) if session["total_score"] is not None else None
         )
-    
-    def end_session(self, session_id: str) -> bool:
+        
+    async def evaluate_sessions(self, session_ids: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """
+        Score the answers of sessions against their predicted answers and store the evaluations
+        
+        All sessions are scored in one batch by the local answer scorer, so this
+        never calls the model; evaluating a session again replaces its evaluation.
+        Sessions are loaded and evaluations saved on the event loop, like every
+        other store access; only the CPU-bound scoring runs in a worker thread.
+        
+        Args:
+            session_ids: Session identifiers
+            
+        Returns:
+            Evaluations (with per-question scores) and the IDs of sessions not found
+        """
+        sessions = []
+        not_found = []
+        for session_id in dict.fromkeys(session_ids):
+            session = await self.get_session(session_id)
+            if session is None:
+                not_found.append(session_id)
+            else:
+                sessions.append(session)
+        if not sessions:
+            return [], not_found
+            
+        with span("score", sessions=len(sessions)):
+            evaluations = await asyncio.to_thread(answer_scorer.score_sessions, sessions)
+        await self.save_evaluations(evaluations)
+        
+        logger.info(f"Evaluated {len(evaluations)} sessions")
+        return evaluations, not_found
+        
+    async def save_evaluations(self, evaluations: List[Dict[str, Any]]):
+        """
+        Store evaluations, setting their ID and creation time
+        
+        Args:
+            evaluations: Evaluations with session_id, total_score, overall_feedback and per-question scores
+        """
+        created_at = get_current_timestamp()
+        for evaluation in evaluations:
+            evaluation["id"] = str(uuid.uuid4())
+            evaluation["created_at"] = created_at
+        await self._run(self.store.save_evaluations, evaluations)
+        
+    async def get_evaluation(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the stored evaluation of a session with its per-question scores
+        
+        Args:
+            session_id: Session identifier
+            
+        Returns:
+            Evaluation data or None if the session is missing or not evaluated
+        """
+        session = await self.get_session(session_id)
+        if session is None:
+            return None
+        evaluation = await self._run(self.store.get_evaluation, session_id)
+        if evaluation is None:
+            return None
+            
+        scores = {str(a.get("question_id")): a.get("score") for a in session["answers"]}
+        return {
+            **evaluation,
+            "total_score": float(evaluation["total_score"]),
+            "scores": [
+                {"question_id": q["id"], "score": float(scores[q["id"]]) if scores.get(q["id"]) is not None else None}
+                for q in session["questions"]
+            ]
+        }
+        
+    async def set_status(self, session_id: str, status: str, error: Optional[str] = None) -> bool:
+        """
+        Change the status of a session
+        
+        Args:
+            session_id: Session identifier
+            status: New status (pending, active, failed, completed)
+            error: Why generation failed, for failed sessions
+            
+        Returns:
+            True if successful, False if session not found
+        """
+        if not await self._run(self.store.update_status, session_id, status, error):
+            return False
+            
+        logger.info(f"Session {session_id} is now {status}")
+        return True
+        
+    async def end_session(self, session_id: str) -> bool:
         """
         End a session (mark as completed)
         
@@ -136,38 +346,165 @@ class SessionManager:
         Returns:
             True if successful, False if session not found
         """
-        if session_id not in self.sessions:
+        if not await self._run(self.store.update_status, session_id, "completed"):
             return False
             
-        self.sessions[session_id]["status"] = "completed"
         logger.info(f"Ended session {session_id}")
         return True
-    
-    def cleanup_expired_sessions(self):
+        
+    async def cleanup_expired_sessions(self):
         """
-        Remove expired sessions from memory
+        Remove expired sessions from the store
         """
-        current_time = datetime.now()
-        expired_sessions = []
-        
-        for session_id, session in self.sessions.items():
-            created_at = datetime.fromisoformat(session["created_at"])
-            if current_time - created_at > self.session_timeout:
-                expired_sessions.append(session_id)
+        expired_sessions = await self._run(self.store.delete_expired, self.session_timeout.total_seconds())
         
         for session_id in expired_sessions:
-            del self.sessions[session_id]
             logger.info(f"Cleaned up expired session {session_id}")
-    
-    def get_all_sessions(self) -> List[SessionInfo]:
+            
+    def start_sweeper(self, interval_seconds: float = 60):
+        """
+        Start a background task that evicts expired sessions periodically
+        
+        Args:
+            interval_seconds: Time between sweeps
+        """
+        if self._sweeper is not None and not self._sweeper.done():
+            return
+        self._sweeper = asyncio.create_task(self._sweep(interval_seconds))
+        
+    async def stop_sweeper(self):
+        """
+        Stop the background eviction task
+        """
+        if self._sweeper is None:
+            return
+        self._sweeper.cancel()
+        try:
+            await self._sweeper
+        except asyncio.CancelledError:
+            pass
+        self._sweeper = None
+        
+    async def _sweep(self, interval_seconds: float):
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.cleanup_expired_sessions()
+            except Exception as e:
+                logger.error(f"Error cleaning up expired sessions: {str(e)}")
+                
+    async def list_sessions_page(self, filters: Dict[str, Optional[str]], cursor: Optional[str] = None,
+                           limit: int = 50) -> Tuple[List[SessionInfo], Optional[str]]:
+        """
+        Get one page of sessions matching filters, oldest first
+        
+        Args:
+            filters: status, interview_type, domain, created_after, created_before (None means any)
+            cursor: Cursor returned with the previous page
+            limit: Maximum number of sessions on the page
+            
+        Returns:
+            SessionInfo objects and the cursor of the next page (None on the last page)
+            
+        Raises:
+            ValueError: If the cursor or a date filter is malformed
+        """
+        after = decode_cursor(cursor) if cursor else None
+        # Expired sessions are evicted by the background sweeper, not on every page
+        filters = normalize_time_filters(filters)
+        
+        # Fetch one extra row to know whether another page follows
+        sessions = await self._run(self.store.query_sessions, filters, after, limit + 1)
+        next_cursor = None
+        if len(sessions) > limit:
+            sessions = sessions[:limit]
+            next_cursor = encode_cursor(sessions[-1]["created_at"], sessions[-1]["session_id"])
+            
+        return [self._to_session_info(session) for session in sessions], next_cursor
+        
+    async def count_sessions(self, filters: Dict[str, Optional[str]]) -> int:
+        """
+        Count sessions matching filters
+        
+        Args:
+            filters: Same filters as list_sessions_page
+            
+        Returns:
+            Number of matching sessions
+            
+        Raises:
+            ValueError: If a date filter is malformed
+        """
+        return await self._run(self.store.count_sessions, normalize_time_filters(filters))
+        
+    async def get_all_sessions(self) -> List[SessionInfo]:
         """
         Get information about all active sessions
         
         Returns:
             List of SessionInfo objects
         """
-        self.cleanup_expired_sessions()
-        return [self.get_session_info(session_id) for session_id in self.sessions.keys()]
+        return [self._to_session_info(session) for session in await self._run(self.store.list_sessions)]
+
+def encode_cursor(created_at: str, session_id: str) -> str:
+    """
+    Encode the position after a session as an opaque pagination cursor
+    
+    Args:
+        created_at: Creation timestamp of the last session on the page
+        session_id: ID of the last session on the page
+        
+    Returns:
+        URL-safe cursor string
+    """
+    raw = json.dumps([created_at, session_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Decode a pagination cursor
+    
+    Args:
+        cursor: Cursor returned by a previous page
+        
+    Returns:
+        (created_at, session_id) of the last session on that page
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(created_at), str(session_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def normalize_time_filters(filters: Dict[str, Optional[str]]) -> Dict[str, Optional[str]]:
+    """
+    Parse the created_after/created_before filters into timestamps comparable with created_at
+    
+    Args:
+        filters: Session filters with ISO date or datetime bounds
+        
+    Returns:
+        Filters with the bounds in the local-time ISO format sessions are stored with
+        
+    Raises:
+        ValueError: If a bound is not an ISO date or datetime
+    """
+    normalized = dict(filters)
+    for name in ("created_after", "created_before"):
+        value = filters.get(name)
+        if value is None:
+            continue
+        try:
+            bound = datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"Invalid {name}: expected an ISO date or datetime")
+        if bound.tzinfo is not None:
+            bound = bound.astimezone().replace(tzinfo=None)
+        normalized[name] = bound.isoformat()
+    return normalized
 
 # Global session manager instance
 session_manager = SessionManager()
@@ -0,0 +1,236 @@
+import sys
+from typing import Dict, List, Any, Optional
+
+class BlobTable:
+    """
+    Content-addressed, reference-counted store for large texts shared between sessions
+    
+    Equal texts (the same resume, job description or banked question used by
+    many sessions) are kept once: intern() returns the copy already stored for
+    that content and counts a reference, release() drops one, and the text is
+    freed with its last reference.
+    """
+    
+    def __init__(self):
+        # text -> [stored copy, reference count]; keyed by content, so equal texts share an entry
+        self.blobs: Dict[str, List[Any]] = {}
+        
+    def intern(self, text: Optional[str]) -> Optional[str]:
+        """
+        Get the shared copy of a text and add a reference to it
+        
+        Args:
+            text: Text to store, or None
+            
+        Returns:
+            The stored text equal to it (None for None)
+        """
+        if text is None:
+            return None
+        entry = self.blobs.get(text)
+        if entry is None:
+            self.blobs[text] = entry = [text, 0]
+        entry[1] += 1
+        return entry[0]
+        
+    def release(self, text: Optional[str]):
+        """
+        Drop a reference to a text, freeing it with its last reference
+        
+        Args:
+            text: Text returned by intern(), or None
+        """
+        if text is None:
+            return
+        entry = self.blobs.get(text)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del self.blobs[text]
+            
+    def stats(self) -> Dict[str, int]:
+        """
+        Get the number and total size of stored texts and the references to them
+        
+        Returns:
+            Blob count, characters stored and references held
+        """
+        return {
+            "blobs": len(self.blobs),
+            "characters": sum(len(text) for text in self.blobs),
+            "references": sum(entry[1] for entry in self.blobs.values())
+        }
+
+class QuestionRecord:
+    """
+    Stored question of a session; texts are shared through the blob table
+    """
+    
+    __slots__ = ("id", "question_text", "question_type", "predicted_answer")
+    
+    def __init__(self, id: str, question_text: str, question_type: Optional[str], predicted_answer: Optional[str]):
+        self.id = id
+        self.question_text = question_text
+        self.question_type = question_type
+        self.predicted_answer = predicted_answer
+        
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "question_text": self.question_text,
+            "question_type": self.question_type,
+            "predicted_answer": self.predicted_answer
+        }
+
+class AnswerRecord:
+    """
+    Stored answer to one question of a session
+    """
+    
+    __slots__ = ("question_id", "answer_text", "time_spent_seconds", "score")
+    
+    def __init__(self, question_id: str, answer_text: str, time_spent_seconds: Optional[int] = None,
+                 score: Optional[float] = None):
+        self.question_id = question_id
+        self.answer_text = answer_text
+        self.time_spent_seconds = time_spent_seconds
+        self.score = score
+        
+    @classmethod
+    def from_dict(cls, answer: Dict[str, Any]) -> "AnswerRecord":
+        return cls(str(answer.get("question_id", "")), answer.get("answer_text", ""), answer.get("time_spent_seconds"))
+        
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "question_id": self.question_id,
+            "answer_text": self.answer_text,
+            "time_spent_seconds": self.time_spent_seconds,
+            "score": self.score
+        }
+
+class SessionRecord:
+    """
+    Compact in-memory session
+    
+    Holds the same data as the session dicts SessionManager exchanges with
+    the store, as slots instead of a per-session dict. Resume, job description
+    and question texts are references into the store's blob table, and short
+    repeated values (domain, interview type, adapter, status, question IDs)
+    are interned, so sessions of the same candidate or role share them.
+    """
+    
+    __slots__ = ("session_id", "domain", "interview_type", "resume_text", "job_description", "questions",
+                 "adapter_used", "answers", "total_score", "created_at", "status", "error", "evaluation")
+                 
+    def __init__(self, session_id: str, domain: str, interview_type: str, resume_text: Optional[str],
+                 job_description: Optional[str], questions: List[QuestionRecord], adapter_used: str,
+                 answers: List[AnswerRecord], total_score: Optional[float], created_at: str, status: str,
+                 error: Optional[str] = None):
+        self.session_id = session_id
+        self.domain = sys.intern(domain)
+        self.interview_type = sys.intern(interview_type)
+        self.resume_text = resume_text
+        self.job_description = job_description
+        self.questions = questions
+        self.adapter_used = sys.intern(adapter_used)
+        self.answers = answers
+        self.total_score = total_score
+        self.created_at = created_at
+        self.status = sys.intern(status)
+        self.error = error
+        # Latest evaluation (evaluations table columns), None until evaluated
+        self.evaluation: Optional[Dict[str, Any]] = None
+        
+    @classmethod
+    def from_dict(cls, session: Dict[str, Any], blobs: BlobTable) -> "SessionRecord":
+        """
+        Build a record from session data, interning its texts in the blob table
+        
+        Args:
+            session: Session data as built by SessionManager
+            blobs: Blob table shared by the store's sessions
+            
+        Returns:
+            Session record
+        """
+        return cls(
+            session_id=session["session_id"],
+            domain=session["domain"],
+            interview_type=session["interview_type"],
+            resume_text=blobs.intern(session.get("resume_text")),
+            job_description=blobs.intern(session.get("job_description")),
+            questions=[make_question(q, blobs) for q in session["questions"]],
+            adapter_used=session["adapter_used"],
+            answers=[AnswerRecord.from_dict(a) for a in session["answers"]],
+            total_score=session["total_score"],
+            created_at=session["created_at"],
+            status=session["status"],
+            error=session.get("error")
+        )
+        
+    def release(self, blobs: BlobTable):
+        """
+        Drop this session's references to shared texts
+        
+        Args:
+            blobs: Blob table the texts were interned in
+        """
+        blobs.release(self.resume_text)
+        blobs.release(self.job_description)
+        for question in self.questions:
+            blobs.release(question.question_text)
+            blobs.release(question.predicted_answer)
+            
+    def summary(self) -> Dict[str, Any]:
+        """
+        Session data without questions, answers, resume and job description
+        
+        Returns:
+            Session summary dict
+        """
+        return {
+            "session_id": self.session_id,
+            "domain": self.domain,
+            "interview_type": self.interview_type,
+            "adapter_used": self.adapter_used,
+            "total_questions": len(self.questions),
+            "questions_answered": len(self.answers),
+            "total_score": self.total_score,
+            "created_at": self.created_at,
+            "status": self.status,
+            "error": self.error
+        }
+        
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Full session data in the form SessionManager uses
+        
+        Returns:
+            Session dict with questions and answers; changing it doesn't change the record
+        """
+        session = self.summary()
+        session["resume_text"] = self.resume_text
+        session["job_description"] = self.job_description
+        session["questions"] = [question.to_dict() for question in self.questions]
+        session["answers"] = [answer.to_dict() for answer in self.answers]
+        return session
+
+def make_question(question: Dict[str, Any], blobs: BlobTable) -> QuestionRecord:
+    """
+    Build a question record, interning its texts in the blob table
+    
+    Args:
+        question: Question data (QuestionResponse.dict())
+        blobs: Blob table shared by the store's sessions
+        
+    Returns:
+        Question record
+    """
+    question_type = question.get("question_type")
+    return QuestionRecord(
+        id=sys.intern(question["id"]),
+        question_text=blobs.intern(question["question_text"]),
+        question_type=sys.intern(question_type) if question_type else question_type,
+        predicted_answer=blobs.intern(question.get("predicted_answer"))
+    )
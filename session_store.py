@@ -0,0 +1,678 @@
+import bisect
+import heapq
+import itertools
+import logging
+import os
+import queue
+import sqlite3
+import sys
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Iterator, Tuple
+
+from session_records import BlobTable, SessionRecord, AnswerRecord, make_question
+
+logger = logging.getLogger(__name__)
+
+# Session fields with secondary indexes for filtering
+INDEXED_FIELDS = ("status", "interview_type", "domain")
+# Columns of the evaluations table
+EVALUATION_FIELDS = ("id", "session_id", "total_score", "overall_feedback", "created_at")
+
+class SessionStore(ABC):
+    """
+    Storage backend interface for interview sessions
+    
+    Sessions are exchanged as plain dicts with the keys used by SessionManager
+    (session_id, domain, interview_type, questions, answers, status, ...).
+    """
+    
+    # Whether calls block on I/O, so SessionManager runs them in worker threads
+    blocking = False
+    
+    @abstractmethod
+    def create_session(self, session: Dict[str, Any]):
+        """Store a new session together with its questions"""
+        
+    @abstractmethod
+    def create_many(self, sessions: List[Dict[str, Any]]):
+        """Store several new sessions at once, all or none"""
+        
+    @abstractmethod
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Load a session with its questions and answers, or None if not found"""
+        
+    @abstractmethod
+    def add_questions(self, session_id: str, questions: List[Dict[str, Any]]) -> bool:
+        """Append questions to a session, False if not found"""
+        
+    @abstractmethod
+    def update_answers(self, session_id: str, answers: List[Dict[str, Any]]) -> bool:
+        """Replace the answers of a session, False if not found"""
+        
+    @abstractmethod
+    def upsert_answer(self, session_id: str, answer: Dict[str, Any]) -> Optional[bool]:
+        """
+        Add or replace the answer to one question, keyed by (session_id, question_id)
+        
+        Returns True if the answer is new, False if it replaced an earlier one,
+        and None if the session or the question doesn't exist.
+        """
+        
+    @abstractmethod
+    def update_status(self, session_id: str, status: str, error: Optional[str] = None) -> bool:
+        """Change the status of a session and its error message, False if not found"""
+        
+    @abstractmethod
+    def save_evaluations(self, evaluations: List[Dict[str, Any]]):
+        """
+        Store session evaluations, replacing earlier ones, with their total and per-answer scores
+        
+        Each evaluation has id, session_id, total_score, overall_feedback,
+        created_at and scores ({question_id, score} per question). Evaluations
+        of sessions that no longer exist are skipped.
+        """
+        
+    @abstractmethod
+    def get_evaluation(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Load the evaluation of a session (without per-answer scores), or None if not evaluated"""
+        
+    @abstractmethod
+    def delete_session(self, session_id: str) -> bool:
+        """Delete a session, False if not found"""
+        
+    @abstractmethod
+    def delete_expired(self, max_age_seconds: float) -> List[str]:
+        """Delete sessions older than max_age_seconds and return their IDs"""
+        
+    @abstractmethod
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        """List session summaries (without questions and answers)"""
+        
+    @abstractmethod
+    def query_sessions(self, filters: Dict[str, Optional[str]], after: Optional[Tuple[str, str]],
+                       limit: int) -> List[Dict[str, Any]]:
+        """
+        List session summaries matching filters, ordered by (created_at, session_id)
+        
+        Filters are status, interview_type, domain (equality) and created_after,
+        created_before (ISO timestamps, inclusive and exclusive); None means any.
+        after is the (created_at, session_id) key of the last session of the
+        previous page.
+        """
+        
+    @abstractmethod
+    def count_sessions(self, filters: Dict[str, Optional[str]]) -> int:
+        """Count sessions matching the same filters as query_sessions"""
+
+class InMemorySessionStore(SessionStore):
+    """
+    Session storage in a process-local dict
+    
+    Sessions are kept as slotted SessionRecords rather than dicts, with resume,
+    job description and question texts stored once in a shared blob table, and
+    are converted to session dicts when read.
+    Sessions are also pushed onto a heap ordered by monotonic creation time,
+    so expiring them only touches the sessions that are actually expired.
+    Secondary indexes on status, interview_type and domain and the list of all
+    sessions all hold (created_at, session_id) keys in sorted order, so a
+    filtered page bisects straight to its cursor in the smallest matching list.
+    """
+    
+    def __init__(self):
+        self.sessions: Dict[str, SessionRecord] = {}
+        # Texts shared between sessions, e.g. the resume of a candidate with several sessions
+        self.blobs = BlobTable()
+        # Expiry index: (monotonic creation time, session_id). Entries of deleted
+        # sessions are skipped lazily when they reach the top of the heap.
+        self.expiry_heap: List[Tuple[float, str]] = []
+        # Secondary indexes: field -> value -> sorted (created_at, session_id) keys
+        self.indexes: Dict[str, Dict[str, List[Tuple[str, str]]]] = {field: {} for field in INDEXED_FIELDS}
+        # Sessions sorted by (created_at, session_id) for keyset pagination
+        self.order: List[Tuple[str, str]] = []
+        # Position of each answer in its session's answers list: session_id -> question_id -> index
+        self.answer_positions: Dict[str, Dict[str, int]] = {}
+        
+    def create_session(self, session: Dict[str, Any]):
+        record = SessionRecord.from_dict(session, self.blobs)
+        session_id = record.session_id
+        self.sessions[session_id] = record
+        heapq.heappush(self.expiry_heap, (time.monotonic(), session_id))
+        key = (record.created_at, session_id)
+        for field in INDEXED_FIELDS:
+            bisect.insort(self.indexes[field].setdefault(getattr(record, field), []), key)
+        bisect.insort(self.order, key)
+        
+    def create_many(self, sessions: List[Dict[str, Any]]):
+        for session in sessions:
+            self.create_session(session)
+            
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        record = self.sessions.get(session_id)
+        return record.to_dict() if record else None
+        
+    def add_questions(self, session_id: str, questions: List[Dict[str, Any]]) -> bool:
+        record = self.sessions.get(session_id)
+        if record is None:
+            return False
+        record.questions.extend(make_question(q, self.blobs) for q in questions)
+        return True
+        
+    def update_answers(self, session_id: str, answers: List[Dict[str, Any]]) -> bool:
+        record = self.sessions.get(session_id)
+        if record is None:
+            return False
+        # One answer per question, the last one submitted, at the end like a replaced SQL row
+        deduped: Dict[str, AnswerRecord] = {}
+        for answer in answers:
+            record_answer = AnswerRecord.from_dict(answer)
+            deduped.pop(record_answer.question_id, None)
+            deduped[record_answer.question_id] = record_answer
+        record.answers = list(deduped.values())
+        self.answer_positions[session_id] = {question_id: i for i, question_id in enumerate(deduped)}
+        return True
+        
+    def upsert_answer(self, session_id: str, answer: Dict[str, Any]) -> Optional[bool]:
+        record = self.sessions.get(session_id)
+        if record is None:
+            return None
+        question_id = answer["question_id"]
+        if not any(q.id == question_id for q in record.questions):
+            return None
+        positions = self.answer_positions.setdefault(session_id, {})
+        position = positions.get(question_id)
+        if position is not None:
+            record.answers[position] = AnswerRecord.from_dict(answer)
+            return False
+        positions[question_id] = len(record.answers)
+        record.answers.append(AnswerRecord.from_dict(answer))
+        return True
+        
+    def update_status(self, session_id: str, status: str, error: Optional[str] = None) -> bool:
+        record = self.sessions.get(session_id)
+        if record is None:
+            return False
+        self._unindex(record, "status")
+        record.status = sys.intern(status)
+        record.error = error
+        bisect.insort(self.indexes["status"].setdefault(record.status, []), (record.created_at, session_id))
+        return True
+        
+    def save_evaluations(self, evaluations: List[Dict[str, Any]]):
+        for evaluation in evaluations:
+            record = self.sessions.get(evaluation["session_id"])
+            if record is None:
+                continue
+            scores = {score["question_id"]: score["score"] for score in evaluation["scores"]}
+            for answer in record.answers:
+                answer.score = scores.get(answer.question_id)
+            record.total_score = evaluation["total_score"]
+            record.evaluation = {key: evaluation[key] for key in EVALUATION_FIELDS}
+            
+    def get_evaluation(self, session_id: str) -> Optional[Dict[str, Any]]:
+        record = self.sessions.get(session_id)
+        return dict(record.evaluation) if record and record.evaluation else None
+        
+    def _unindex(self, record: SessionRecord, field: str):
+        """
+        Remove a session from one secondary index
+        """
+        value = getattr(record, field)
+        keys = self.indexes[field].get(value)
+        if keys is not None:
+            _remove_key(keys, (record.created_at, record.session_id))
+            if not keys:
+                del self.indexes[field][value]
+                
+    def _remove(self, session_id: str) -> Optional[SessionRecord]:
+        """
+        Remove a session from the dict, its secondary indexes and the blob table
+        """
+        record = self.sessions.pop(session_id, None)
+        if record is None:
+            return None
+        self.answer_positions.pop(session_id, None)
+        record.release(self.blobs)
+        for field in INDEXED_FIELDS:
+            self._unindex(record, field)
+        _remove_key(self.order, (record.created_at, session_id))
+        return record
+        
+    def delete_session(self, session_id: str) -> bool:
+        return self._remove(session_id) is not None
+        
+    def delete_expired(self, max_age_seconds: float) -> List[str]:
+        cutoff = time.monotonic() - max_age_seconds
+        expired = []
+        while self.expiry_heap and self.expiry_heap[0][0] < cutoff:
+            _, session_id = heapq.heappop(self.expiry_heap)
+            if self._remove(session_id) is not None:
+                expired.append(session_id)
+        return expired
+        
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        return [record.summary() for record in self.sessions.values()]
+        
+    def _key_range(self, filters: Dict[str, Optional[str]],
+                   after: Optional[Tuple[str, str]]) -> Tuple[List[Tuple[str, str]], int, int, List[Tuple[str, str]]]:
+        """
+        Pick the sorted key list to scan for a query and the bounds of its date range
+        
+        Returns:
+            Smallest index list of the equality filters (all sessions if none),
+            start and end positions within it, and the equality filters it doesn't cover
+        """
+        equality = [(field, value) for field, value in filters.items() if field in INDEXED_FIELDS and value is not None]
+        lists = [(self.indexes[field].get(value, []), (field, value)) for field, value in equality]
+        if lists:
+            keys, used = min(lists, key=lambda item: len(item[0]))
+            remaining = [pair for pair in equality if pair != used]
+        else:
+            keys, remaining = self.order, []
+            
+        start = 0
+        if filters.get("created_after") is not None:
+            start = bisect.bisect_left(keys, (filters["created_after"], ""))
+        if after is not None:
+            start = max(start, bisect.bisect_right(keys, after))
+        end = len(keys)
+        if filters.get("created_before") is not None:
+            end = bisect.bisect_left(keys, (filters["created_before"], ""))
+        return keys, start, max(start, end), remaining
+        
+    def _matching_keys(self, filters: Dict[str, Optional[str]],
+                       after: Optional[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+        """
+        Iterate (created_at, session_id) keys matching the filters in order
+        """
+        keys, start, end, remaining = self._key_range(filters, after)
+        for key in itertools.islice(keys, start, end):
+            if remaining:
+                record = self.sessions[key[1]]
+                if any(getattr(record, field) != value for field, value in remaining):
+                    continue
+            yield key
+            
+    def query_sessions(self, filters: Dict[str, Optional[str]], after: Optional[Tuple[str, str]],
+                       limit: int) -> List[Dict[str, Any]]:
+        return [
+            self.sessions[session_id].summary()
+            for _, session_id in itertools.islice(self._matching_keys(filters, after), limit)
+        ]
+        
+    def count_sessions(self, filters: Dict[str, Optional[str]]) -> int:
+        keys, start, end, remaining = self._key_range(filters, None)
+        if not remaining:
+            return end - start
+        return sum(1 for _ in self._matching_keys(filters, None))
+
+def _remove_key(keys: List[Tuple[str, str]], key: Tuple[str, str]):
+    """
+    Remove a key from a sorted key list, if present
+    """
+    position = bisect.bisect_left(keys, key)
+    if position < len(keys) and keys[position] == key:
+        del keys[position]
+
+# SQLite version of schema.sql. Question IDs (q_1, q_2, ...) are only unique
+# within a session, so questions are keyed by (session_id, id) here.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id VARCHAR(36) PRIMARY KEY,
+    domain VARCHAR(100) NOT NULL,
+    interview_type VARCHAR(20) NOT NULL DEFAULT 'All',
+    resume_text TEXT,
+    job_description TEXT,
+    total_score DECIMAL(3,1) NULL,
+    adapter_used VARCHAR(50),
+    status VARCHAR(20) NOT NULL DEFAULT 'active',
+    error TEXT,
+    created_at TIMESTAMP NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions (created_at, id);
+CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions (status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_sessions_interview_type ON sessions (interview_type, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_sessions_domain ON sessions (domain, created_at, id);
+
+CREATE TABLE IF NOT EXISTS questions (
+    id VARCHAR(36) NOT NULL,
+    session_id VARCHAR(36) NOT NULL,
+    position INT NOT NULL,
+    question_text TEXT NOT NULL,
+    predicted_answer TEXT,
+    question_type VARCHAR(50),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (session_id, id),
+    FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS user_answers (
+    id VARCHAR(36) PRIMARY KEY,
+    session_id VARCHAR(36) NOT NULL,
+    question_id VARCHAR(36) NOT NULL,
+    answer_text TEXT NOT NULL,
+    time_spent_seconds INT NULL,
+    score DECIMAL(3,1) NULL,
+    
+    FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE,
+    CONSTRAINT unique_session_question_answer UNIQUE (session_id, question_id)
+);
+
+CREATE TABLE IF NOT EXISTS evaluations (
+    id VARCHAR(36) PRIMARY KEY,
+    session_id VARCHAR(36) NOT NULL,
+    total_score DECIMAL(3,1) NOT NULL,
+    overall_feedback TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    FOREIGN KEY (session_id) REFERENCES sessions(id) ON DELETE CASCADE,
+    CONSTRAINT unique_session_evaluation UNIQUE (session_id)
+);
+"""
+
+class ConnectionPool:
+    """
+    Fixed-size pool of SQLite connections shared between threads
+    """
+    
+    def __init__(self, db_path: str, size: int = 5):
+        self.connections: "queue.Queue[sqlite3.Connection]" = queue.Queue(maxsize=size)
+        for _ in range(size):
+            conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute("PRAGMA journal_mode = WAL")
+            self.connections.put(conn)
+            
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection for one transaction
+        
+        Commits on success and rolls back on error before returning the
+        connection to the pool.
+        """
+        conn = self.connections.get()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self.connections.put(conn)
+
+class SQLSessionStore(SessionStore):
+    """
+    Session storage in the schema.sql tables (SQLite)
+    
+    Lets several workers or instances share sessions through one database.
+    """
+    
+    blocking = True
+    
+    def __init__(self, db_path: str, pool_size: int = 5):
+        self.pool = ConnectionPool(db_path, pool_size)
+        with self.pool.connection() as conn:
+            conn.executescript(SQLITE_SCHEMA)
+            # Databases created before job mode lack the error column
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(sessions)")}
+            if "error" not in columns:
+                conn.execute("ALTER TABLE sessions ADD COLUMN error TEXT")
+            # ... and before answers were scored, the score column
+            answer_columns = {row["name"] for row in conn.execute("PRAGMA table_info(user_answers)")}
+            if "score" not in answer_columns:
+                conn.execute("ALTER TABLE user_answers ADD COLUMN score DECIMAL(3,1) NULL")
+        logger.info(f"Using SQL session store at {db_path}")
+        
+    def create_session(self, session: Dict[str, Any]):
+        self.create_many([session])
+        
+    def create_many(self, sessions: List[Dict[str, Any]]):
+        # One transaction for the whole batch
+        with self.pool.connection() as conn:
+            conn.executemany(
+                "INSERT INTO sessions (id, domain, interview_type, resume_text, job_description, "
+                "total_score, adapter_used, status, error, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (s["session_id"], s["domain"], s["interview_type"], s["resume_text"],
+                     s["job_description"], s["total_score"], s["adapter_used"],
+                     s["status"], s.get("error"), s["created_at"])
+                    for s in sessions
+                ]
+            )
+            for session in sessions:
+                self._insert_questions(conn, session["session_id"], session["questions"], 0)
+                
+    def _insert_questions(self, conn: sqlite3.Connection, session_id: str,
+                          questions: List[Dict[str, Any]], start: int):
+        """
+        Insert questions in one batch, numbering their positions from start
+        """
+        conn.executemany(
+            "INSERT INTO questions (id, session_id, position, question_text, predicted_answer, question_type) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (q["id"], session_id, start + i, q["question_text"], q.get("predicted_answer"), q.get("question_type"))
+                for i, q in enumerate(questions)
+            ]
+        )
+        
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
+            if row is None:
+                return None
+                
+            questions = [
+                {
+                    "id": q["id"],
+                    "question_text": q["question_text"],
+                    "question_type": q["question_type"],
+                    "predicted_answer": q["predicted_answer"]
+                }
+                for q in conn.execute(
+                    "SELECT id, question_text, question_type, predicted_answer FROM questions "
+                    "WHERE session_id = ? ORDER BY position",
+                    (session_id,)
+                )
+            ]
+            answers = [
+                {
+                    "question_id": a["question_id"],
+                    "answer_text": a["answer_text"],
+                    "time_spent_seconds": a["time_spent_seconds"],
+                    "score": a["score"]
+                }
+                for a in conn.execute(
+                    "SELECT question_id, answer_text, time_spent_seconds, score FROM user_answers "
+                    "WHERE session_id = ? ORDER BY rowid",
+                    (session_id,)
+                )
+            ]
+            
+        session = self._row_to_session(row, len(questions), len(answers))
+        session["questions"] = questions
+        session["answers"] = answers
+        return session
+        
+    def _row_to_session(self, row: sqlite3.Row, total_questions: int, questions_answered: int) -> Dict[str, Any]:
+        """
+        Convert a sessions row into the session dict used by SessionManager
+        """
+        return {
+            "session_id": row["id"],
+            "domain": row["domain"],
+            "interview_type": row["interview_type"],
+            "resume_text": row["resume_text"],
+            "job_description": row["job_description"],
+            "adapter_used": row["adapter_used"],
+            "total_questions": total_questions,
+            "questions_answered": questions_answered,
+            "total_score": row["total_score"],
+            "created_at": row["created_at"],
+            "status": row["status"],
+            "error": row["error"]
+        }
+        
+    def add_questions(self, session_id: str, questions: List[Dict[str, Any]]) -> bool:
+        with self.pool.connection() as conn:
+            if conn.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is None:
+                return False
+            start = conn.execute(
+                "SELECT COUNT(*) FROM questions WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+            self._insert_questions(conn, session_id, questions, start)
+        return True
+        
+    def update_answers(self, session_id: str, answers: List[Dict[str, Any]]) -> bool:
+        with self.pool.connection() as conn:
+            if conn.execute("SELECT 1 FROM sessions WHERE id = ?", (session_id,)).fetchone() is None:
+                return False
+            conn.execute("DELETE FROM user_answers WHERE session_id = ?", (session_id,))
+            conn.executemany(
+                "INSERT OR REPLACE INTO user_answers (id, session_id, question_id, answer_text, time_spent_seconds) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (str(uuid.uuid4()), session_id, str(a.get("question_id", "")),
+                     a.get("answer_text", ""), a.get("time_spent_seconds"))
+                    for a in answers
+                ]
+            )
+        return True
+        
+    def upsert_answer(self, session_id: str, answer: Dict[str, Any]) -> Optional[bool]:
+        with self.pool.connection() as conn:
+            # Questions are keyed by (session_id, id), so this also checks the session exists
+            if conn.execute(
+                "SELECT 1 FROM questions WHERE session_id = ? AND id = ?", (session_id, answer["question_id"])
+            ).fetchone() is None:
+                return None
+            existed = conn.execute(
+                "SELECT 1 FROM user_answers WHERE session_id = ? AND question_id = ?", (session_id, answer["question_id"])
+            ).fetchone() is not None
+            conn.execute(
+                "INSERT INTO user_answers (id, session_id, question_id, answer_text, time_spent_seconds) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (session_id, question_id) DO UPDATE SET answer_text = excluded.answer_text, "
+                "time_spent_seconds = excluded.time_spent_seconds, score = NULL",
+                (str(uuid.uuid4()), session_id, answer["question_id"], answer["answer_text"], answer.get("time_spent_seconds"))
+            )
+        return not existed
+        
+    def update_status(self, session_id: str, status: str, error: Optional[str] = None) -> bool:
+        with self.pool.connection() as conn:
+            cursor = conn.execute("UPDATE sessions SET status = ?, error = ? WHERE id = ?", (status, error, session_id))
+            return cursor.rowcount > 0
+            
+    def save_evaluations(self, evaluations: List[Dict[str, Any]]):
+        # One transaction for the whole cohort
+        with self.pool.connection() as conn:
+            conn.executemany(
+                "INSERT INTO evaluations (id, session_id, total_score, overall_feedback, created_at) "
+                "SELECT ?, ?, ?, ?, ? WHERE EXISTS (SELECT 1 FROM sessions WHERE id = ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET total_score = excluded.total_score, "
+                "overall_feedback = excluded.overall_feedback, created_at = excluded.created_at",
+                [
+                    (e["id"], e["session_id"], e["total_score"], e["overall_feedback"], e["created_at"], e["session_id"])
+                    for e in evaluations
+                ]
+            )
+            conn.executemany(
+                "UPDATE sessions SET total_score = ? WHERE id = ?",
+                [(e["total_score"], e["session_id"]) for e in evaluations]
+            )
+            conn.executemany(
+                "UPDATE user_answers SET score = ? WHERE session_id = ? AND question_id = ?",
+                [
+                    (score["score"], e["session_id"], score["question_id"])
+                    for e in evaluations
+                    for score in e["scores"]
+                    if score["score"] is not None
+                ]
+            )
+            
+    def get_evaluation(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT id, session_id, total_score, overall_feedback, created_at FROM evaluations WHERE session_id = ?",
+                (session_id,)
+            ).fetchone()
+        return dict(row) if row else None
+        
+    def delete_session(self, session_id: str) -> bool:
+        with self.pool.connection() as conn:
+            cursor = conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+            return cursor.rowcount > 0
+            
+    def delete_expired(self, max_age_seconds: float) -> List[str]:
+        # Range scan on idx_sessions_created_at
+        cutoff = (datetime.now() - timedelta(seconds=max_age_seconds)).isoformat()
+        with self.pool.connection() as conn:
+            expired = [
+                row["id"] for row in conn.execute("SELECT id FROM sessions WHERE created_at < ?", (cutoff,))
+            ]
+            conn.execute("DELETE FROM sessions WHERE created_at < ?", (cutoff,))
+        return expired
+        
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        return self._select_summaries("", [], "")
+        
+    def _select_summaries(self, where: str, params: List[Any], limit: str) -> List[Dict[str, Any]]:
+        """
+        Select session summaries with question and answer counts
+        """
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                "SELECT s.*, "
+                "(SELECT COUNT(*) FROM questions q WHERE q.session_id = s.id) AS total_questions, "
+                "(SELECT COUNT(*) FROM user_answers a WHERE a.session_id = s.id) AS questions_answered "
+                f"FROM sessions s {where} ORDER BY s.created_at, s.id {limit}",
+                params
+            ).fetchall()
+        return [self._row_to_session(row, row["total_questions"], row["questions_answered"]) for row in rows]
+        
+    def _where(self, filters: Dict[str, Optional[str]], after: Optional[Tuple[str, str]] = None) -> Tuple[str, List[Any]]:
+        """
+        Build the WHERE clause for session filters
+        """
+        clauses = []
+        params: List[Any] = []
+        for field in INDEXED_FIELDS:
+            if filters.get(field) is not None:
+                clauses.append(f"s.{field} = ?")
+                params.append(filters[field])
+        if filters.get("created_after") is not None:
+            clauses.append("s.created_at >= ?")
+            params.append(filters["created_after"])
+        if filters.get("created_before") is not None:
+            clauses.append("s.created_at < ?")
+            params.append(filters["created_before"])
+        if after is not None:
+            clauses.append("(s.created_at, s.id) > (?, ?)")
+            params.extend(after)
+        return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+        
+    def query_sessions(self, filters: Dict[str, Optional[str]], after: Optional[Tuple[str, str]],
+                       limit: int) -> List[Dict[str, Any]]:
+        where, params = self._where(filters, after)
+        return self._select_summaries(where, params + [limit], "LIMIT ?")
+        
+    def count_sessions(self, filters: Dict[str, Optional[str]]) -> int:
+        where, params = self._where(filters)
+        with self.pool.connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM sessions s {where}", params).fetchone()[0]
+
+def create_session_store() -> SessionStore:
+    """
+    Create the session store configured through the environment
+    
+    Returns:
+        SQLSessionStore if SESSION_DB_PATH is set, otherwise InMemorySessionStore
+    """
+    db_path = os.getenv("SESSION_DB_PATH")
+    if db_path:
+        return SQLSessionStore(db_path, pool_size=int(os.getenv("SESSION_DB_POOL_SIZE", "5")))
+    return InMemorySessionStore()
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from session_store import InMemorySessionStore, SQLSessionStore
+
+def make_session(session_id, created_at="2024-01-01T00:00:00", n=3, status="active",
+                 domain="Data Scientist", interview_type="Technical", resume_text=None):
+    """Session dict as SessionManager builds it"""
+    return {
+        "session_id": session_id,
+        "domain": domain,
+        "interview_type": interview_type,
+        "resume_text": resume_text,
+        "job_description": None,
+        "questions": [
+            {"id": f"q_{i}", "question_text": f"Question {i}?", "question_type": "technical",
+             "predicted_answer": f"Answer {i}"}
+            for i in range(1, n + 1)
+        ],
+        "adapter_used": "finetuned_Technical",
+        "total_questions": n,
+        "questions_answered": 0,
+        "answers": [],
+        "total_score": None,
+        "created_at": created_at,
+        "status": status,
+        "error": None
+    }
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Each SessionStore implementation, so the same test checks both"""
+    if request.param == "memory":
+        return InMemorySessionStore()
+    return SQLSessionStore(str(tmp_path / "sessions.db"), pool_size=2)
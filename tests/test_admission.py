@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from admission import AdmissionController, AdmissionRejected
+
+def test_full_queue_is_rejected_with_429():
+    async def run():
+        controller = AdmissionController(initial_limit=1, max_queue=1, queue_timeout=5)
+        await controller.acquire()
+        waiter = asyncio.create_task(controller.acquire())
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire()
+            
+        controller.release()
+        await waiter
+        return controller, rejected.value
+        
+    controller, error = asyncio.run(run())
+    assert error.status_code == 429
+    assert error.retry_after >= 1
+    assert controller.rejected == 1
+    assert controller.inflight == 1
+
+def test_queue_timeout_is_rejected_with_503():
+    async def run():
+        controller = AdmissionController(initial_limit=1, max_queue=4, queue_timeout=0.05)
+        await controller.acquire()
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire()
+        return controller, rejected.value
+        
+    controller, error = asyncio.run(run())
+    assert error.status_code == 503
+    assert controller.timed_out == 1
+    assert controller.waiters == []
+    assert controller.inflight == 1
+
+def test_waiters_are_admitted_by_priority():
+    async def run():
+        controller = AdmissionController(initial_limit=1, queue_timeout=5)
+        await controller.acquire()
+        order = []
+        
+        async def call(priority):
+            async with controller.slot(priority):
+                order.append(priority)
+                
+        tasks = [asyncio.create_task(call(priority)) for priority in ("background", "batch", "interactive")]
+        await asyncio.sleep(0)
+        controller.release()
+        await asyncio.gather(*tasks)
+        return controller, order
+        
+    controller, order = asyncio.run(run())
+    assert order == ["interactive", "batch", "background"]
+    assert controller.inflight == 0
+
+def test_slot_is_released_when_the_call_fails():
+    async def run():
+        controller = AdmissionController(initial_limit=1)
+        with pytest.raises(RuntimeError):
+            async with controller.slot():
+                raise RuntimeError("upstream failed")
+        return controller
+        
+    assert asyncio.run(run()).inflight == 0
+
+@pytest.mark.parametrize("max_queue, queue_timeout, status_code", [(0, 5, 429), (4, 0.05, 503)])
+def test_rejected_generation_returns_status_and_retry_after(monkeypatch, max_queue, queue_timeout, status_code):
+    controller = AdmissionController(initial_limit=1, max_queue=max_queue, queue_timeout=queue_timeout)
+    # The only slot is taken, so the request has to queue
+    controller.inflight = 1
+    monkeypatch.setattr(main.ai_client, "admission", controller)
+    monkeypatch.setattr(main.ai_client, "cache", None)
+    
+    response = TestClient(main.app).post("/gen_questions", data={
+        "domain": "Admission Test", "interview_type": "Technical", "n": "3", "mode": "model"
+    })
+    
+    assert response.status_code == status_code
+    assert int(response.headers["Retry-After"]) >= 1
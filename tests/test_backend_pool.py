@@ -0,0 +1,95 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ai_client import AIClient
+from backend_pool import Backend, BackendPool, NoBackendAvailable
+
+def make_pool(**kwargs):
+    return BackendPool([Backend("http://a", {"finetuned_Dsa"}), Backend("http://b")], **kwargs)
+
+def test_adapter_affinity_spills_over_under_load():
+    pool = make_pool(affinity_slack=2)
+    chosen = []
+    for _ in range(41):
+        backend = pool.choose("finetuned_Dsa")
+        # Requests stay outstanding, as with concurrent calls
+        backend.outstanding += 1
+        chosen.append(backend.url)
+        
+    assert chosen[0] == "http://a"
+    assert chosen[1] == "http://b"
+    assert 0 < chosen.count("http://b") < chosen.count("http://a")
+    a, b = pool.backends
+    assert a.outstanding - b.outstanding <= 3
+
+def test_adapter_affinity_holds_within_slack():
+    pool = make_pool(affinity_slack=2)
+    a, b = pool.backends
+    a.outstanding, b.outstanding = 3, 1
+    assert pool.choose("finetuned_Dsa") is a
+    assert pool.choose("finetuned_Hr") is b
+    
+    a.outstanding = 4
+    assert pool.choose("finetuned_Dsa") is b
+
+def test_circuit_opens_and_half_opens_only_the_chosen_backend():
+    pool = make_pool(failure_threshold=2, reset_timeout=0.05)
+    a, b = pool.backends
+    pool.record_failure(a)
+    assert a.state == "closed"
+    pool.record_failure(a)
+    assert a.state == "open"
+    assert pool.choose("finetuned_Dsa") is b
+    
+    a.opened_at -= 1
+    b.outstanding = 1
+    # Screening alone leaves the circuit open
+    assert pool.choose("finetuned_Dsa", exclude={"http://a"}) is b
+    assert a.state == "open"
+    
+    assert pool.choose("finetuned_Dsa") is a
+    assert a.state == "half_open"
+    a.outstanding = 1
+    # One trial request at a time
+    assert pool.choose("finetuned_Dsa") is b
+    
+    a.outstanding = 0
+    pool.record_failure(a)
+    assert a.state == "open"
+    a.opened_at -= 1
+    pool.choose("finetuned_Dsa")
+    pool.record_success(a, "finetuned_Dsa")
+    assert (a.state, a.consecutive_failures) == ("closed", 0)
+
+def test_no_backend_available_when_every_circuit_is_open():
+    pool = make_pool(failure_threshold=1)
+    for backend in pool.backends:
+        pool.record_failure(backend)
+    with pytest.raises(NoBackendAvailable):
+        pool.choose()
+
+def test_request_fails_over_to_the_next_backend():
+    calls = []
+    
+    def handler(request):
+        calls.append(request.url.host)
+        if request.url.host == "a":
+            return httpx.Response(503, text="overloaded")
+        return httpx.Response(200, json={"text": "Score: 7"})
+        
+    client = AIClient(pool=make_pool(failure_threshold=1))
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
+    text = asyncio.run(client.complete("Grade this", "finetuned_Dsa"))
+    
+    assert text == "Score: 7"
+    assert calls == ["a", "b"]
+    a, b = client.pool.backends
+    assert a.state == "open"
+    assert "finetuned_Dsa" in b.adapters
+    
+    # The open circuit keeps the next request off the failing backend
+    asyncio.run(client.complete("Grade this", "finetuned_Dsa"))
+    assert calls == ["a", "b", "b"]
@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import httpx
+
+from ai_client import AIClient
+from admission import AdmissionController
+
+def model_text(n):
+    return "\n\n".join(f"Q{i}: Question {i}?\nA{i}: Answer {i}." for i in range(1, n + 1))
+
+def make_client(handler, admission):
+    client = AIClient(base_url="http://model", admission=admission)
+    client.cache = None
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+def specs(count):
+    return [
+        {"domain": f"Domain {i}", "interview_type": "Technical", "resume_text": None, "jd_text": None, "n": 2}
+        for i in range(count)
+    ]
+
+def test_fallback_without_batch_endpoint_stays_within_admission_capacity():
+    paths = []
+    in_flight = [0, 0]
+    
+    async def handler(request):
+        paths.append(request.url.path)
+        if request.url.path == "/generate_batch":
+            return httpx.Response(404)
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        await asyncio.sleep(0.001)
+        in_flight[0] -= 1
+        return httpx.Response(200, json={"text": model_text(2)})
+        
+    # 4 slots and 8 queue places for 100 single calls
+    admission = AdmissionController(initial_limit=4, max_limit=4, max_queue=8, queue_timeout=5)
+    client = make_client(handler, admission)
+    
+    results = asyncio.run(client.generate_batch(specs(100), priority="batch"))
+    
+    assert [r for r in results if isinstance(r, Exception)] == []
+    assert all(len(questions) == 2 for questions in results)
+    assert paths.count("/generate") == 100
+    assert in_flight[1] <= 4
+    assert admission.rejected == 0 and admission.timed_out == 0
+
+def test_batched_calls_stay_within_admission_capacity():
+    async def handler(request):
+        body = json.loads(request.content)
+        await asyncio.sleep(0.001)
+        return httpx.Response(200, json={"results": [{"text": model_text(2)} for _ in body["requests"]]})
+        
+    admission = AdmissionController(initial_limit=2, max_limit=2, max_queue=1, queue_timeout=5)
+    client = make_client(handler, admission)
+    client.batch_size = 2
+    
+    results = asyncio.run(client.generate_batch(specs(40), priority="batch"))
+    
+    assert [r for r in results if isinstance(r, Exception)] == []
+    assert admission.rejected == 0
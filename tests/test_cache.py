@@ -0,0 +1,76 @@
+import asyncio
+import hashlib
+
+import cache as cache_module
+from cache import TextCache
+from resume_parser import ResumeParser
+
+def disk_keys(cache):
+    return sorted(row[0] for row in cache.db.execute("SELECT key FROM text_cache"))
+
+def test_disk_hits_are_batched_but_still_count_for_eviction(tmp_path):
+    cache = TextCache(max_entries=1, db_path=str(tmp_path / "cache.db"), max_disk_entries=2, access_batch=8)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    
+    # "a" is only on disk now; the hit doesn't write
+    assert cache.get("a") == "A"
+    assert cache.db.in_transaction is False
+    assert list(cache.pending_access) == ["a"]
+    
+    # Written before eviction, so "b" is the least recently used entry
+    cache.set("c", "C")
+    assert disk_keys(cache) == ["a", "c"]
+    assert cache.pending_access == {}
+
+def test_access_times_are_written_once_the_batch_is_full(tmp_path):
+    cache = TextCache(max_entries=1, db_path=str(tmp_path / "cache.db"), access_batch=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    cache.set("c", "C")
+    
+    cache.get("a")
+    assert len(cache.pending_access) == 1
+    cache.get("b")
+    assert cache.pending_access == {}
+    
+    cache.get("c")
+    cache.flush()
+    assert cache.pending_access == {}
+    assert cache.stats()["disk_hits"] == 3
+
+def test_memory_tier_stays_within_max_bytes():
+    cache = TextCache(max_entries=10, max_bytes=10)
+    cache.set("a", "aaaa")
+    cache.set("b", "bbbb")
+    cache.set("c", "cccc")
+    
+    assert list(cache.entries) == ["b", "c"]
+    assert cache.memory_bytes == 8
+    # A single value larger than the bound is still kept
+    cache.set("d", "d" * 20)
+    assert list(cache.entries) == ["d"]
+    assert cache.memory_bytes == 20
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+    cache = TextCache(ttl_seconds=60, db_path=str(tmp_path / "cache.db"))
+    cache.set("a", "A")
+    
+    now[0] += 59
+    assert cache.get("a") == "A"
+    now[0] += 2
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+def test_resume_text_is_reused_from_disk_by_content_hash(tmp_path):
+    pdf = b"%PDF-1.4 resume bytes"
+    db_path = str(tmp_path / "resumes.db")
+    TextCache(db_path=db_path).set(hashlib.sha256(pdf).hexdigest(), "Extracted resume")
+    
+    # A new process (empty memory tier) finds the text without starting a worker
+    parser = ResumeParser(cache=TextCache(db_path=db_path))
+    assert asyncio.run(parser.parse_pdf(pdf)) == "Extracted resume"
+    assert parser._executor is None
+    assert parser.cache.stats()["disk_hits"] == 1
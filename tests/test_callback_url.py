@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from job_queue import JobQueue
+
+def check(queue, url):
+    asyncio.run(queue.check_callback_url(url))
+
+@pytest.mark.parametrize("url", [
+    "http://127.0.0.1/hook",
+    "http://localhost:8000/hook",
+    "http://169.254.169.254/latest/meta-data",
+    "http://10.0.0.5/hook",
+    "http://192.168.1.1/hook",
+    "http://[::1]/hook",
+    "http://[::ffff:127.0.0.1]/hook",
+    "ftp://example.com/hook",
+    "not a url"
+])
+def test_rejects_non_public_callbacks(url):
+    with pytest.raises(ValueError):
+        check(JobQueue(), url)
+
+def test_accepts_public_address():
+    check(JobQueue(), "https://8.8.8.8/hook")
+
+def test_allowlisted_host_skips_address_check():
+    check(JobQueue(callback_hosts=["LOCALHOST"]), "http://localhost:8000/hook")
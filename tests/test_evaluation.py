@@ -0,0 +1,33 @@
+import asyncio
+import threading
+from datetime import datetime
+
+from conftest import make_session
+from session_manager import SessionManager
+
+def test_evaluate_sessions_runs_only_blocking_store_calls_in_threads(store):
+    store.create_session(make_session("s1", created_at=datetime.now().isoformat(), n=2))
+    store.update_answers("s1", [{"question_id": "q_1", "answer_text": "Answer 1"}])
+    threads = []
+    
+    class RecordingStore:
+        blocking = store.blocking
+        
+        def __getattr__(self, name):
+            method = getattr(store, name)
+            
+            def call(*args, **kwargs):
+                threads.append(threading.current_thread())
+                return method(*args, **kwargs)
+            return call
+            
+    manager = SessionManager(RecordingStore())
+    evaluations, not_found = asyncio.run(manager.evaluate_sessions(["s1", "missing", "s1"]))
+    
+    assert not_found == ["missing"]
+    assert [e["session_id"] for e in evaluations] == ["s1"]
+    assert threads and all((thread is threading.main_thread()) != store.blocking for thread in threads)
+    
+    saved = store.get_session("s1")
+    assert saved["total_score"] == evaluations[0]["total_score"]
+    assert store.get_evaluation("s1")["id"] == evaluations[0]["id"]
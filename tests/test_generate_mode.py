@@ -0,0 +1,34 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from question_parser import build_question
+
+BANKED = [build_question(i, f"Banked {i}?", f"Answer {i}", "technical") for i in range(3)]
+GENERATED = [build_question(i, f"Generated {i}?", f"Answer {i}", "technical") for i in range(3)]
+
+@pytest.fixture
+def sources(monkeypatch):
+    async def generate_questions(**kwargs):
+        return GENERATED
+    monkeypatch.setattr(main.ai_client, "generate_questions", generate_questions)
+    monkeypatch.setattr(main.question_bank, "sample", lambda *args: BANKED)
+    monkeypatch.setattr(main.question_bank, "learn", lambda *args: None)
+
+def generate(**form):
+    response = TestClient(main.app).post("/gen_questions", data={
+        "domain": "Mode Test", "interview_type": "Technical", "n": "3", **form
+    })
+    assert response.status_code == 200
+    return response.json()
+
+def test_generates_by_default_even_when_bank_has_questions(sources):
+    body = generate()
+    assert body["source"] == "model"
+    assert [q["question_text"] for q in body["questions"]] == [q.question_text for q in GENERATED]
+
+@pytest.mark.parametrize("mode", ["auto", "bank"])
+def test_bank_is_opt_in(sources, mode):
+    body = generate(mode=mode)
+    assert body["source"] == "bank"
+    assert [q["question_text"] for q in body["questions"]] == [q.question_text for q in BANKED]
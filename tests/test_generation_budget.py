@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+import httpx
+
+from ai_client import AIClient
+from admission import AdmissionController
+from generation_budget import GenerationBudget
+
+def test_plan_scales_with_n_from_the_interview_type_default():
+    budget = GenerationBudget(headroom=1.5, overhead=10, min_tokens=0)
+    
+    assert budget.plan("finetuned_Hr", "HR", 4) == 4 * 70 * 1.5 + 10
+    assert budget.plan("finetuned_Dsa", "Coding", 4) == 4 * 150 * 1.5 + 10
+    assert budget.plan("finetuned_Other", "Unknown", 1) == 110 * 1.5 + 10
+
+def test_plan_is_clamped():
+    budget = GenerationBudget(min_tokens=128, max_tokens=1000)
+    
+    assert budget.plan("finetuned_Hr", "HR", 1) == 128
+    assert budget.plan("finetuned_Technical", "Technical", 20) == 1000
+
+def test_learned_tokens_per_question_are_used_after_min_samples():
+    budget = GenerationBudget(headroom=1, overhead=0, min_tokens=0, alpha=0.5, min_samples=3)
+    # 40 tokens for 2 questions, then 80 for 2: the average moves halfway each time
+    budget.observe("finetuned_Hr", "word " * 20 + "." * 20, 2)
+    budget.observe("finetuned_Hr", "word " * 40 + "." * 40, 2)
+    assert budget.plan("finetuned_Hr", "HR", 10) == 700
+    
+    budget.observe("finetuned_Hr", "word " * 40 + "." * 40, 2)
+    assert budget.tokens_per_question["finetuned_Hr"] == 35
+    assert budget.plan("finetuned_Hr", "HR", 10) == 350
+    assert budget.stats() == {"finetuned_Hr": {"tokens_per_question": 35.0, "samples": 3}}
+    
+    # Outputs without a parsed question teach nothing
+    budget.observe("finetuned_Hr", "no questions here", 0)
+    assert budget.samples["finetuned_Hr"] == 3
+
+def test_generation_requests_max_new_tokens_from_the_plan():
+    payloads = []
+    
+    def handler(request):
+        payloads.append(json.loads(request.content))
+        return httpx.Response(200, json={"text": "Q1: Question 1?\nA1: Answer 1.\n\nQ2: Question 2?\nA2: Answer 2."})
+        
+    budget = GenerationBudget(headroom=1, overhead=0, min_tokens=0)
+    client = AIClient(base_url="http://model", admission=AdmissionController(), budget=budget)
+    client.cache = None
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
+    asyncio.run(client.generate_questions(domain="Data Scientist", interview_type="HR",
+                                          resume_text=None, jd_text=None, n=2))
+    assert payloads[0]["max_new_tokens"] == 2 * 70
+    assert budget.samples[payloads[0]["adapter"]] == 1
@@ -0,0 +1,138 @@
+import asyncio
+import json
+
+import httpx
+
+import job_queue as job_queue_module
+from admission import AdmissionRejected
+from job_queue import GenerationJob, JobQueue
+from question_parser import build_question
+from session_manager import session_manager
+
+QUESTIONS = [build_question(i, f"Question {i}?", f"Answer {i}", "technical") for i in range(3)]
+
+def fake_generate(*outcomes):
+    """generate_questions raising or returning each outcome in turn"""
+    calls = []
+    
+    async def generate_questions(**kwargs):
+        calls.append(kwargs)
+        outcome = outcomes[min(len(calls), len(outcomes)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+    return generate_questions, calls
+
+async def pending_job(callback_url=None):
+    session_id = await session_manager.create_session(
+        domain="Job Test", interview_type="Technical", questions=[],
+        adapter_used="finetuned_Technical", status="pending"
+    )
+    return GenerationJob(session_id, "Job Test", "Technical", None, None, 3, callback_url)
+
+def run_job(queue, callback_url=None):
+    async def run():
+        job = await pending_job(callback_url)
+        await queue._run(job)
+        return await session_manager.get_session(job.session_id)
+    return asyncio.run(run())
+
+def test_run_activates_session(monkeypatch):
+    generate, calls = fake_generate(QUESTIONS)
+    monkeypatch.setattr(job_queue_module.ai_client, "generate_questions", generate)
+    queue = JobQueue()
+    
+    session = run_job(queue)
+    assert session["status"] == "active"
+    assert session["total_questions"] == 3
+    assert calls[0]["priority"] == "background"
+    assert queue.completed == 1 and queue.failed == 0
+
+def test_run_retries_when_not_admitted(monkeypatch):
+    generate, calls = fake_generate(AdmissionRejected("busy", retry_after=0), QUESTIONS)
+    monkeypatch.setattr(job_queue_module.ai_client, "generate_questions", generate)
+    
+    session = run_job(JobQueue(max_attempts=2))
+    assert session["status"] == "active"
+    assert len(calls) == 2
+
+def test_run_fails_session_on_error(monkeypatch):
+    generate, calls = fake_generate(RuntimeError("model went away"))
+    monkeypatch.setattr(job_queue_module.ai_client, "generate_questions", generate)
+    queue = JobQueue()
+    
+    session = run_job(queue)
+    assert session["status"] == "failed"
+    assert "model went away" in session["error"]
+    assert len(calls) == 1
+    assert queue.failed == 1
+
+def test_stop_fails_running_and_queued_jobs(monkeypatch):
+    async def generate_questions(**kwargs):
+        await asyncio.Event().wait()
+    monkeypatch.setattr(job_queue_module.ai_client, "generate_questions", generate_questions)
+    
+    async def run():
+        queue = JobQueue(workers=1)
+        running, queued = await pending_job(), await pending_job()
+        queue.submit(running)
+        queue.submit(queued)
+        queue.start()
+        while queue.running == 0:
+            await asyncio.sleep(0)
+        await queue.stop()
+        return [await session_manager.get_session(job.session_id) for job in (running, queued)]
+        
+    for session in asyncio.run(run()):
+        assert session["status"] == "failed"
+
+def mock_callbacks(monkeypatch, statuses):
+    """Route the callback client to a handler answering with statuses in turn"""
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(statuses[min(len(requests), len(statuses)) - 1])
+        
+    client = httpx.AsyncClient
+    monkeypatch.setattr(job_queue_module.httpx, "AsyncClient",
+                        lambda **kwargs: client(transport=httpx.MockTransport(handler), **kwargs))
+    sleep = asyncio.sleep
+    monkeypatch.setattr(job_queue_module.asyncio, "sleep", lambda delay: sleep(0))
+    return requests
+
+def test_notify_posts_outcome(monkeypatch):
+    requests = mock_callbacks(monkeypatch, [200])
+    generate, calls = fake_generate(QUESTIONS)
+    monkeypatch.setattr(job_queue_module.ai_client, "generate_questions", generate)
+    
+    session = run_job(JobQueue(callback_hosts=["hooks.test"]), "http://hooks.test/done")
+    assert len(requests) == 1
+    payload = json.loads(requests[0].content)
+    assert payload["session_id"] == session["session_id"]
+    assert payload["status"] == "active"
+    assert payload["total_questions"] == 3
+
+def test_notify_retries_server_errors(monkeypatch):
+    requests = mock_callbacks(monkeypatch, [503, 502, 204])
+    queue = JobQueue(callback_hosts=["hooks.test"])
+    
+    job = asyncio.run(pending_job("http://hooks.test/done"))
+    asyncio.run(queue._notify(job, [], "model went away"))
+    assert len(requests) == 3
+    assert json.loads(requests[0].content)["status"] == "failed"
+
+def test_notify_gives_up_after_callback_attempts(monkeypatch):
+    requests = mock_callbacks(monkeypatch, [500])
+    queue = JobQueue(callback_hosts=["hooks.test"], callback_attempts=2)
+    
+    job = asyncio.run(pending_job("http://hooks.test/done"))
+    asyncio.run(queue._notify(job, [], None))
+    assert len(requests) == 2
+
+def test_notify_refuses_private_callback_url(monkeypatch):
+    requests = mock_callbacks(monkeypatch, [200])
+    
+    job = asyncio.run(pending_job("http://127.0.0.1:8000/hook"))
+    asyncio.run(JobQueue()._notify(job, [], None))
+    assert requests == []
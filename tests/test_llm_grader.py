@@ -0,0 +1,105 @@
+import asyncio
+import importlib
+
+import llm_grader
+from llm_grader import LLMGrader, parse_grade
+
+SESSION = {
+    "session_id": "s1",
+    "interview_type": "HR",
+    "questions": [
+        {"id": f"q_{i}", "question_text": f"Question {i}?", "predicted_answer": f"Key points: topic {i}, tradeoffs"}
+        for i in range(1, 4)
+    ],
+    "answers": [
+        {"question_id": "q_1", "answer_text": "I would talk about topic 1 and its tradeoffs"},
+        {"question_id": "q_2", "answer_text": "Topic 2 has tradeoffs worth explaining"}
+    ]
+}
+
+class FakeClient:
+    """Grades from a reply per question; "hang" never answers"""
+    
+    def __init__(self, replies):
+        self.replies = replies
+        self.adapters = []
+        self.cancelled = 0
+        
+    async def complete(self, prompt, adapter, max_new_tokens):
+        self.adapters.append(adapter)
+        reply = next(r for question, r in self.replies.items() if question in prompt)
+        if reply == "hang":
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+def grade(client, **kwargs):
+    return asyncio.run(LLMGrader(client=client, **kwargs).grade_session(SESSION))
+
+def by_question(evaluation):
+    return {score["question_id"]: score for score in evaluation["scores"]}
+
+def test_parse_grade():
+    assert parse_grade("Score: 7/10\nFeedback: Good  answer.") == (7.0, "Good answer.")
+    assert parse_grade("score = 8.5") == (8.5, "")
+    assert parse_grade("Score: 42") is None
+    assert parse_grade("No grade here") is None
+
+def test_model_grades_every_answer():
+    client = FakeClient({"Question 1?": "Score: 8\nFeedback: Clear.", "Question 2?": "Score: 6\nFeedback: Thin."})
+    
+    evaluation = grade(client)
+    
+    scores = by_question(evaluation)
+    assert (scores["q_1"]["score"], scores["q_1"]["graded_by"]) == (8.0, "model")
+    assert (scores["q_2"]["score"], scores["q_2"]["feedback"]) == (6.0, "Thin.")
+    assert (scores["q_3"]["score"], scores["q_3"]["graded_by"]) == (None, None)
+    assert evaluation["partial"] is False
+    assert evaluation["total_score"] == round((8 + 6 + 0) / 3, 1)
+
+def test_session_timeout_cancels_and_awaits_pending_calls():
+    client = FakeClient({"Question 1?": "Score: 8\nFeedback: Clear.", "Question 2?": "hang"})
+    
+    async def run():
+        evaluation = await LLMGrader(client=client, session_timeout=0.05).grade_session(SESSION)
+        # The hanging call was cancelled and finished unwinding before grade_session returned
+        return evaluation, client.cancelled
+        
+    evaluation, cancelled = asyncio.run(run())
+    
+    assert cancelled == 1
+    scores = by_question(evaluation)
+    assert scores["q_1"]["graded_by"] == "model"
+    assert scores["q_2"]["graded_by"] == "local"
+    assert scores["q_2"]["score"] is not None
+    assert evaluation["partial"] is True
+
+def test_unparseable_or_failed_replies_keep_local_scores():
+    client = FakeClient({"Question 1?": "I cannot grade this.", "Question 2?": RuntimeError("upstream failed")})
+    
+    evaluation = grade(client)
+    
+    scores = by_question(evaluation)
+    assert scores["q_1"]["graded_by"] == scores["q_2"]["graded_by"] == "local"
+    assert evaluation["partial"] is True
+    assert "could not grade any answers" in evaluation["overall_feedback"]
+
+def test_grades_with_the_base_model_unless_an_adapter_is_configured(monkeypatch):
+    replies = {"Question 1?": "Score: 5", "Question 2?": "Score: 5"}
+    client = FakeClient(replies)
+    grade(client)
+    assert client.adapters == [None, None]
+    
+    client = FakeClient(replies)
+    grade(client, adapter="finetuned_Grader")
+    assert client.adapters == ["finetuned_Grader", "finetuned_Grader"]
+    
+    monkeypatch.setenv("GRADING_ADAPTER", "finetuned_Grader")
+    assert importlib.reload(llm_grader).llm_grader.adapter == "finetuned_Grader"
+    monkeypatch.delenv("GRADING_ADAPTER")
+    assert importlib.reload(llm_grader).llm_grader.adapter is None
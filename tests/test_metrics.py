@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from metrics import MetricsRegistry
+
+def test_counter_and_gauge_render_in_prometheus_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("method", "status"))
+    in_flight = registry.gauge("in_flight", "In flight")
+    requests.inc(method="GET", status=200)
+    requests.inc(2, method="GET", status=200)
+    requests.inc(method="POST", status=500)
+    with in_flight.track():
+        assert "in_flight 1" in registry.render()
+        
+    assert registry.render() == (
+        "# HELP requests_total Requests\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{method="GET",status="200"} 3\n'
+        'requests_total{method="POST",status="500"} 1\n'
+        "# HELP in_flight In flight\n"
+        "# TYPE in_flight gauge\n"
+        "in_flight 0\n"
+    )
+
+def test_histogram_buckets_are_cumulative_with_sum_and_count():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency", ("adapter",), buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 2.5):
+        latency.observe(value, adapter="base")
+        
+    assert registry.render().splitlines()[2:] == [
+        'latency_seconds_bucket{adapter="base",le="0.1"} 2',
+        'latency_seconds_bucket{adapter="base",le="1"} 3',
+        'latency_seconds_bucket{adapter="base",le="+Inf"} 4',
+        'latency_seconds_sum{adapter="base"} 3.15',
+        'latency_seconds_count{adapter="base"} 4',
+    ]
+
+def test_label_values_are_escaped_and_checked():
+    registry = MetricsRegistry()
+    errors = registry.counter("errors_total", "Errors", ("reason",))
+    errors.inc(reason='bad "quote"\\path\nline')
+    
+    assert 'errors_total{reason="bad \\"quote\\"\\\\path\\nline"} 1' in registry.render()
+    with pytest.raises(ValueError):
+        errors.inc(cause="x")
+    with pytest.raises(ValueError):
+        registry.counter("errors_total", "Errors again")
+
+def test_callback_metrics_are_read_at_scrape_time():
+    registry = MetricsRegistry()
+    values = {("memory",): 1}
+    registry.callback("cache_hits_total", "Cache hits", "counter", ("tier",), lambda: values)
+    values[("disk",)] = 4
+    
+    assert registry.render().splitlines()[2:] == ['cache_hits_total{tier="disk"} 4', 'cache_hits_total{tier="memory"} 1']
+
+def test_metrics_endpoint_labels_requests_by_route_template():
+    client = TestClient(main.app)
+    client.get("/sessions/metrics-test-session")
+    response = client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",endpoint="/sessions/{session_id}",status="404"}' in response.text
+    assert "metrics-test-session" not in response.text
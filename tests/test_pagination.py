@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from conftest import make_session
+from session_manager import SessionManager
+
+STATUSES = ["active", "completed", "failed"]
+DOMAINS = ["Data Scientist", "Software Engineer"]
+TYPES = ["Technical", "HR"]
+
+@pytest.fixture
+def manager(store):
+    for i in range(40):
+        store.create_session(make_session(
+            f"s{i:02d}",
+            # Some sessions share a timestamp so the session_id tie-break matters
+            created_at=f"2024-01-{1 + i // 2:02d}T10:00:00",
+            status=STATUSES[i % 3],
+            domain=DOMAINS[i % 2],
+            interview_type=TYPES[(i // 4) % 2]
+        ))
+    # Status changes must move sessions between index lists
+    store.update_status("s00", "completed")
+    store.delete_session("s05")
+    return SessionManager(store)
+
+def expected_ids(store, filters):
+    sessions = sorted(store.list_sessions(), key=lambda s: (s["created_at"], s["session_id"]))
+    return [
+        s["session_id"] for s in sessions
+        if all(filters.get(field) is None or s[field] == filters[field] for field in ("status", "domain", "interview_type"))
+        and (filters.get("created_after") is None or s["created_at"] >= filters["created_after"])
+        and (filters.get("created_before") is None or s["created_at"] < filters["created_before"])
+    ]
+
+def all_pages(manager, filters, limit):
+    ids, cursor = [], None
+    while True:
+        page, cursor = asyncio.run(manager.list_sessions_page(filters, cursor, limit))
+        ids.extend(session.session_id for session in page)
+        if cursor is None:
+            return ids
+
+FILTERS = [
+    {},
+    {"status": "active"},
+    {"status": "completed", "domain": "Data Scientist"},
+    {"status": "failed", "domain": "Software Engineer", "interview_type": "HR"},
+    {"created_after": "2024-01-05T10:00:00", "created_before": "2024-01-15"},
+    {"status": "active", "created_after": "2024-01-03"},
+    {"domain": "Unknown"}
+]
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("limit", [1, 7, 100])
+def test_pages_cover_matching_sessions_in_order(manager, filters, limit):
+    full = {"status": None, "interview_type": None, "domain": None, "created_after": None, "created_before": None, **filters}
+    expected = expected_ids(manager.store, {key: value for key, value in full.items()})
+    
+    assert all_pages(manager, full, limit) == expected
+    assert asyncio.run(manager.count_sessions(full)) == len(expected)
+
+def test_date_only_bound_matches_whole_day(manager):
+    filters = {"created_after": "2024-01-02", "created_before": "2024-01-03"}
+    
+    assert [s.session_id for s in asyncio.run(manager.list_sessions_page(filters, None, 50))[0]] == ["s02", "s03"]
+
+@pytest.mark.parametrize("filters", [{"created_after": "zzz"}, {"created_before": "2024-13-01"}])
+def test_malformed_date_filter_is_rejected(manager, filters):
+    with pytest.raises(ValueError):
+        asyncio.run(manager.list_sessions_page(filters, None, 10))
+    with pytest.raises(ValueError):
+        asyncio.run(manager.count_sessions(filters))
+
+def test_malformed_cursor_is_rejected(manager):
+    with pytest.raises(ValueError):
+        asyncio.run(manager.list_sessions_page({}, "not-a-cursor", 10))
@@ -0,0 +1,52 @@
+from prompt_builder import PromptBuilder, estimate_tokens, extract_keywords
+
+RESUME = """JANE DOE
+jane.doe@example.com | +1 (555) 123-4567 | https://linkedin.com/in/janedoe
+Senior data engineer with 7 years of experience.
+Built Spark and Kafka pipelines in Python, orchestrated with Airflow on AWS.
+""" + "\n".join(f"Worked on project {i} using Python, SQL and TensorFlow." for i in range(200))
+
+JD = "We need a data engineer with Kafka, Spark, Snowflake and dbt. 5+ years required."
+
+def test_estimate_tokens_counts_words_by_length_and_punctuation():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a bb, cccc!") == 5
+    assert estimate_tokens("internationalization") == 5
+
+def test_extract_keywords_skips_contact_details_and_headers():
+    keywords = extract_keywords(RESUME)
+    
+    assert keywords["skills"][:2] == ["python", "sql"]
+    assert {"spark", "kafka", "airflow", "aws", "tensorflow"} <= set(keywords["skills"])
+    assert keywords["years"] == 7
+    assert keywords["seniority"] == "senior"
+    assert not any("@" in skill or "JANE" in skill or "DOE" in skill for skill in keywords["skills"])
+
+def test_prompt_fits_the_adapter_budget_however_long_the_resume():
+    builder = PromptBuilder(default_budget=400)
+    prompt, tokens = builder.build("Data Engineer", RESUME * 20, JD, "Technical", 5, "finetuned_Technical")
+    
+    assert tokens == estimate_tokens(prompt) <= 400
+    assert "ROLE skills: " in prompt and "CANDIDATE (7 years, senior) skills: " in prompt
+    assert "jane.doe@example.com" not in prompt
+
+def test_skills_the_candidate_shares_with_the_role_come_first():
+    prompt, _ = PromptBuilder().build("Data Engineer", RESUME, JD, "Technical", 5, "finetuned_Technical")
+    role_line = next(line for line in prompt.splitlines() if line.startswith("ROLE skills: "))
+    
+    role_skills = role_line[len("ROLE skills: "):-len(". Focus on these.")].split(", ")
+    assert set(role_skills[:2]) == {"spark", "kafka"}
+    assert set(role_skills[2:]) == {"snowflake", "dbt"}
+
+def test_a_tight_budget_drops_skills_before_the_instructions():
+    builder = PromptBuilder.from_spec(400, "finetuned_Hr=150, finetuned_Dsa=500")
+    assert builder.budget_for("finetuned_Hr") == 150
+    assert builder.budget_for("finetuned_Dsa") == 500
+    assert builder.budget_for("finetuned_Technical") == 400
+    
+    full, full_tokens = builder.build("Data Engineer", RESUME, JD, "HR", 5, "finetuned_Technical")
+    tight, tight_tokens = builder.build("Data Engineer", RESUME, JD, "HR", 5, "finetuned_Hr")
+    bare, bare_tokens = builder.build("Data Engineer", None, None, "HR", 5, "finetuned_Hr")
+    
+    assert bare_tokens < tight_tokens <= 150 < full_tokens
+    assert tight.startswith(bare.splitlines()[0]) and tight.endswith(bare.splitlines()[-1])
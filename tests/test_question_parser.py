@@ -0,0 +1,51 @@
+import json
+import os
+
+import pytest
+
+from question_parser import StreamingQuestionParser, build_question, iter_question_pairs, parse_questions
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "benchmarks", "data", "model_outputs.jsonl")
+
+with open(DATA_FILE) as f:
+    SAMPLES = [json.loads(line)["text"] for line in f if line.strip()]
+
+TEXTS = SAMPLES + [
+    "**Q1:** What is a join?\n**A1:** Combines rows.\n\n**Q2**: What is an index?\n**A2**: A lookup structure.",
+    "Question 1) Tell me about yourself.\nAnswer 1) Short summary.\nQuestion 2) Why this role?",
+    "__Q1__ Explain FAQ1: handling.\n__A1__ Not a marker inside words.\nQ2: Last one\nA2:",
+    "Preamble without markers, then Q1: Only question",
+    "No markers at all",
+    ""
+]
+
+def stream_pairs(text, size):
+    parser = StreamingQuestionParser()
+    pairs = []
+    for start in range(0, len(text), size):
+        pairs.extend(parser.feed(text[start:start + size]))
+    return pairs + parser.finish()
+
+@pytest.mark.parametrize("size", [1, 2, 5, 23, 24, 25, 100, 10 ** 6])
+@pytest.mark.parametrize("text", TEXTS)
+def test_streaming_matches_batch_parser(text, size):
+    assert stream_pairs(text, size) == list(iter_question_pairs(text))
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_streamed_questions_match_parse_questions(text):
+    n = len(list(iter_question_pairs(text)))
+    questions, parsed = parse_questions(text, n, "Technical")
+    
+    streamed = [build_question(i, q, a, "technical") for i, (q, a) in enumerate(stream_pairs(text, 7))]
+    
+    assert parsed == n
+    assert streamed == questions
+
+def test_parser_can_be_reused_after_finish():
+    parser = StreamingQuestionParser()
+    parser.feed("Q1: First?\nA1: One.")
+    parser.finish()
+    
+    assert parser.feed("Q1: Again?\nA1: Two.") == []
+    assert parser.finish() == [("Again?", "Two.")]
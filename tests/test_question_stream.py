@@ -0,0 +1,55 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+import main
+from question_parser import build_question
+
+def fake_stream(count, error=None):
+    async def stream_questions(**kwargs):
+        for i in range(count):
+            yield build_question(i, f"Question {i}?", f"Answer {i}", "technical")
+        if error:
+            raise error
+    return stream_questions
+
+def post_stream():
+    return TestClient(main.app).post("/gen_questions/stream", data={
+        "domain": "Stream Test", "interview_type": "Technical", "n": "3"
+    })
+
+def test_completed_stream_leaves_session_active(monkeypatch):
+    monkeypatch.setattr(main.ai_client, "stream_questions", fake_stream(3))
+    events = [json.loads(line) for line in post_stream().text.splitlines()]
+    
+    assert [e["type"] for e in events] == ["session", "question", "question", "question", "done"]
+    session = asyncio.run(main.session_manager.get_session(events[0]["session_id"]))
+    assert session["status"] == "active"
+    assert session["total_questions"] == 3
+
+def test_failed_stream_marks_session_failed(monkeypatch):
+    monkeypatch.setattr(main.ai_client, "stream_questions", fake_stream(1, RuntimeError("model went away")))
+    events = [json.loads(line) for line in post_stream().text.splitlines()]
+    
+    assert [e["type"] for e in events] == ["session", "question", "error"]
+    session = asyncio.run(main.session_manager.get_session(events[0]["session_id"]))
+    assert session["status"] == "failed"
+    assert "model went away" in session["error"]
+
+def test_client_disconnect_marks_session_failed(monkeypatch):
+    monkeypatch.setattr(main.ai_client, "stream_questions", fake_stream(3))
+    
+    async def disconnect_after_first_question():
+        response = await main.generate_questions_stream(
+            domain="Stream Test", interview_type="Technical", resume_file=None, jd_text=None, n=3
+        )
+        events = response.body_iterator
+        session_id = json.loads(await events.__anext__())["session_id"]
+        await events.__anext__()
+        await events.aclose()
+        return await main.session_manager.get_session(session_id)
+        
+    session = asyncio.run(disconnect_after_first_question())
+    assert session["status"] == "failed"
+    assert session["total_questions"] == 1
@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import pytest
+
+import resume_parser as resume_parser_module
+import utils
+from cache import TextCache
+from resume_parser import ResumeParser
+from utils import PDFTimeout, extract_pdf_text
+
+class SlowPage:
+    def extract_text(self):
+        time.sleep(0.05)
+        return "page"
+
+class SlowReader:
+    def __init__(self, stream):
+        self.pages = [SlowPage() for _ in range(100)]
+
+def fake_extract(pdf_content, max_pages, timeout_seconds):
+    """Worker task: b"hang" ignores the time limit, b"slow:<s>" takes s seconds"""
+    if pdf_content == b"hang":
+        time.sleep(60)
+    if pdf_content.startswith(b"slow:"):
+        time.sleep(float(pdf_content[5:]))
+    return 1, [f"{pdf_content.decode()} {time.time()}"]
+
+@pytest.fixture
+def parser(monkeypatch):
+    monkeypatch.setattr(resume_parser_module, "extract_pdf_text", fake_extract)
+    parser = ResumeParser(max_workers=2, timeout_seconds=0.5, grace_seconds=0.5)
+    yield parser
+    parser.shutdown()
+
+def test_worker_enforces_time_limit(monkeypatch):
+    monkeypatch.setattr(utils.PyPDF2, "PdfReader", SlowReader)
+    started = time.monotonic()
+    with pytest.raises(PDFTimeout):
+        extract_pdf_text(b"%PDF", max_pages=100, timeout_seconds=0.2)
+    assert time.monotonic() - started < 1
+
+def test_overrun_drains_pool_before_killing_it(parser):
+    async def run():
+        hang = asyncio.create_task(parser.parse_pdf(b"hang"))
+        await asyncio.sleep(0.6)
+        # Still running on the same pool when the first PDF overruns at 1s
+        slow = asyncio.create_task(parser.parse_pdf(b"slow:0.8"))
+        with pytest.raises(Exception, match="timed out"):
+            await hang
+        old = next(iter(parser._retired))
+        workers = list(old._processes.values())
+        
+        # New uploads go to a fresh pool while the old one finishes its other work
+        assert (await parser.parse_pdf(b"fresh")).startswith("fresh")
+        assert parser._executor is not old
+        assert old in parser._retired
+        assert (await slow).startswith("slow:0.8")
+        
+        # Only the overrunning task was left, so the old pool is gone
+        assert parser._retired == {}
+        for worker in workers:
+            worker.join(2)
+            assert not worker.is_alive()
+        await asyncio.sleep(0.2)
+        assert parser.pending == 0
+        
+    asyncio.run(run())
+
+def test_repeat_uploads_are_served_from_cache(parser):
+    parser.cache = TextCache()
+    
+    async def run():
+        first = await parser.parse_pdf(b"resume")
+        second = await parser.parse_pdf(b"resume")
+        return first, second
+        
+    first, second = asyncio.run(run())
+    assert first == second
+    assert parser.cache.memory_hits == 1
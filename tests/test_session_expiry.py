@@ -0,0 +1,78 @@
+import asyncio
+from datetime import timedelta
+
+import session_store
+from conftest import make_session
+from session_manager import SessionManager
+from session_store import InMemorySessionStore
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+        
+    def __call__(self):
+        return self.now
+
+def test_delete_expired_pops_only_expired_sessions_from_the_heap(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_store.time, "monotonic", clock)
+    store = InMemorySessionStore()
+    for i, session_id in enumerate(["s1", "s2", "s3"]):
+        clock.now = 1000.0 + 100 * i
+        store.create_session(make_session(session_id))
+        
+    clock.now = 1250.0
+    assert store.delete_expired(100) == ["s1", "s2"]
+    assert store.expiry_heap == [(1200.0, "s3")]
+    assert [s["session_id"] for s in store.list_sessions()] == ["s3"]
+
+def test_deleted_sessions_are_skipped_when_their_heap_entry_expires(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(session_store.time, "monotonic", clock)
+    store = InMemorySessionStore()
+    store.create_session(make_session("s1"))
+    store.create_session(make_session("s2"))
+    assert store.delete_session("s1")
+    
+    clock.now += 10
+    assert store.delete_expired(5) == ["s2"]
+    assert store.expiry_heap == []
+
+def test_sweeper_evicts_expired_sessions():
+    manager = SessionManager(InMemorySessionStore())
+    manager.session_timeout = timedelta(seconds=0.05)
+    
+    async def run():
+        manager.start_sweeper(interval_seconds=0.02)
+        manager.store.create_session(make_session("s1"))
+        await asyncio.sleep(0.2)
+        remaining = manager.store.list_sessions()
+        await manager.stop_sweeper()
+        return remaining
+        
+    assert asyncio.run(run()) == []
+    assert manager._sweeper is None
+
+def test_sweeper_keeps_running_after_an_error():
+    manager = SessionManager(InMemorySessionStore())
+    manager.session_timeout = timedelta(0)
+    delete_expired = manager.store.delete_expired
+    calls = []
+    
+    def flaky_delete_expired(max_age_seconds):
+        calls.append(max_age_seconds)
+        if len(calls) == 1:
+            raise RuntimeError("store unavailable")
+        return delete_expired(max_age_seconds)
+        
+    manager.store.delete_expired = flaky_delete_expired
+    
+    async def run():
+        manager.store.create_session(make_session("s1"))
+        manager.start_sweeper(interval_seconds=0.01)
+        while len(calls) < 2:
+            await asyncio.sleep(0.01)
+        await manager.stop_sweeper()
+        
+    asyncio.run(run())
+    assert manager.store.get_session("s1") is None
@@ -0,0 +1,53 @@
+from conftest import make_session
+from session_records import BlobTable, SessionRecord
+from session_store import InMemorySessionStore
+
+RESUME = "Ten years of Python, " * 50
+
+def test_equal_texts_share_one_blob_until_the_last_reference_is_released():
+    blobs = BlobTable()
+    first = blobs.intern("".join(["shared ", "text"]))
+    second = blobs.intern("shared text")
+    
+    assert first is second
+    assert blobs.stats() == {"blobs": 1, "characters": len("shared text"), "references": 2}
+    
+    blobs.release(first)
+    assert blobs.stats()["references"] == 1
+    blobs.release(second)
+    assert blobs.blobs == {}
+    
+    # Releasing more than was interned (or None) is harmless
+    blobs.release("shared text")
+    blobs.release(None)
+    assert blobs.intern(None) is None
+    assert blobs.blobs == {}
+
+def test_record_release_frees_texts_it_alone_referenced():
+    blobs = BlobTable()
+    first = SessionRecord.from_dict(make_session("s1", resume_text=RESUME, n=2), blobs)
+    second = SessionRecord.from_dict(make_session("s2", resume_text=RESUME, n=3), blobs)
+    
+    assert first.resume_text is second.resume_text
+    assert blobs.blobs[RESUME][1] == 2
+    
+    second.release(blobs)
+    # Question 3 and its answer were only used by s2
+    assert "Question 3?" not in blobs.blobs and "Answer 3" not in blobs.blobs
+    assert blobs.blobs[RESUME][1] == 1
+    assert blobs.blobs["Question 1?"][1] == 1
+    
+    first.release(blobs)
+    assert blobs.blobs == {}
+
+def test_store_frees_blobs_of_deleted_and_expired_sessions():
+    store = InMemorySessionStore()
+    store.create_session(make_session("s1", resume_text=RESUME))
+    store.create_session(make_session("s2", resume_text=RESUME))
+    
+    assert store.delete_session("s1")
+    assert store.blobs.blobs[RESUME][1] == 1
+    assert store.get_session("s2")["resume_text"] == RESUME
+    
+    assert store.delete_expired(-1) == ["s2"]
+    assert store.blobs.blobs == {}
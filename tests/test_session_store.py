@@ -0,0 +1,125 @@
+from datetime import datetime
+
+import pytest
+
+from conftest import make_session
+from session_store import SessionStore
+
+def answers_of(store, session_id):
+    return [(a["question_id"], a["answer_text"]) for a in store.get_session(session_id)["answers"]]
+
+def questions_answered(store, session_id):
+    [summary] = [s for s in store.list_sessions() if s["session_id"] == session_id]
+    return summary["questions_answered"]
+
+def test_bulk_submit_keeps_last_answer_per_question(store):
+    store.create_session(make_session("s1"))
+    
+    assert store.update_answers("s1", [
+        {"question_id": "q_1", "answer_text": "x"},
+        {"question_id": "q_2", "answer_text": "y"},
+        {"question_id": "q_1", "answer_text": "z"}
+    ])
+    
+    assert answers_of(store, "s1") == [("q_2", "y"), ("q_1", "z")]
+    assert questions_answered(store, "s1") == 2
+
+def test_upsert_after_bulk_submit_replaces_the_single_answer(store):
+    store.create_session(make_session("s1"))
+    store.update_answers("s1", [
+        {"question_id": "q_1", "answer_text": "x"},
+        {"question_id": "q_1", "answer_text": "y"}
+    ])
+    
+    assert store.upsert_answer("s1", {"question_id": "q_1", "answer_text": "new"}) is False
+    assert store.upsert_answer("s1", {"question_id": "q_2", "answer_text": "second"}) is True
+    
+    assert answers_of(store, "s1") == [("q_1", "new"), ("q_2", "second")]
+    assert questions_answered(store, "s1") == 2
+
+def test_upsert_rejects_unknown_session_or_question(store):
+    store.create_session(make_session("s1"))
+    
+    assert store.upsert_answer("missing", {"question_id": "q_1", "answer_text": "x"}) is None
+    assert store.upsert_answer("s1", {"question_id": "q_9", "answer_text": "x"}) is None
+    assert answers_of(store, "s1") == []
+
+def test_session_round_trip(store):
+    session = make_session("s1", n=2, resume_text="Resume")
+    store.create_session(session)
+    
+    loaded = store.get_session("s1")
+    
+    assert loaded["questions"] == session["questions"]
+    assert loaded["answers"] == []
+    assert loaded["total_questions"] == 2
+    for key in ("domain", "interview_type", "resume_text", "job_description", "adapter_used", "created_at", "status", "error"):
+        assert loaded[key] == session[key]
+    assert store.get_session("missing") is None
+
+def test_create_many_and_list_summaries(store):
+    store.create_many([make_session("s2", created_at="2024-01-02T00:00:00"), make_session("s1", n=1)])
+    
+    summaries = sorted(store.list_sessions(), key=lambda s: s["session_id"])
+    
+    assert [(s["session_id"], s["total_questions"], s["questions_answered"]) for s in summaries] == [("s1", 1, 0), ("s2", 3, 0)]
+    assert all("questions" not in s and "answers" not in s for s in summaries)
+
+def test_add_questions_appends_in_order(store):
+    store.create_session(make_session("s1", n=1))
+    
+    assert store.add_questions("s1", [
+        {"id": "q_2", "question_text": "Second?", "question_type": "technical", "predicted_answer": None}
+    ])
+    assert store.add_questions("missing", []) is False
+    assert [q["id"] for q in store.get_session("s1")["questions"]] == ["q_1", "q_2"]
+
+def test_update_status_moves_session_between_filters(store):
+    store.create_session(make_session("s1", status="pending"))
+    
+    assert store.update_status("s1", "failed", "Model unavailable")
+    assert store.update_status("missing", "failed") is False
+    
+    session = store.get_session("s1")
+    assert (session["status"], session["error"]) == ("failed", "Model unavailable")
+    assert store.count_sessions({"status": "pending"}) == 0
+    assert [s["session_id"] for s in store.query_sessions({"status": "failed"}, None, 10)] == ["s1"]
+
+def test_delete_session(store):
+    store.create_session(make_session("s1"))
+    store.create_session(make_session("s2"))
+    
+    assert store.delete_session("s1")
+    assert store.delete_session("s1") is False
+    assert store.get_session("s1") is None
+    assert [s["session_id"] for s in store.list_sessions()] == ["s2"]
+    assert store.count_sessions({"domain": "Data Scientist"}) == 1
+
+def test_delete_expired(store):
+    store.create_session(make_session("s1", created_at=datetime.now().isoformat()))
+    
+    assert store.delete_expired(3600) == []
+    assert store.delete_expired(-1) == ["s1"]
+    assert store.get_session("s1") is None
+
+def test_save_evaluations_scores_answers_and_replaces_earlier_ones(store):
+    store.create_session(make_session("s1", n=2))
+    store.update_answers("s1", [{"question_id": "q_1", "answer_text": "x", "time_spent_seconds": 30}])
+    
+    def evaluation(total_score, feedback):
+        return {"id": f"e-{total_score}", "session_id": "s1", "total_score": total_score, "overall_feedback": feedback,
+                "created_at": "2024-01-01T01:00:00",
+                "scores": [{"question_id": "q_1", "score": total_score}, {"question_id": "q_2", "score": None}]}
+                
+    store.save_evaluations([evaluation(4.0, "First")])
+    store.save_evaluations([evaluation(6.5, "Second"), dict(evaluation(1.0, "Gone"), session_id="missing")])
+    
+    session = store.get_session("s1")
+    assert session["total_score"] == 6.5
+    assert session["answers"] == [{"question_id": "q_1", "answer_text": "x", "time_spent_seconds": 30, "score": 6.5}]
+    assert store.get_evaluation("s1")["overall_feedback"] == "Second"
+    assert store.get_evaluation("missing") is None
+
+def test_store_interface_is_abstract():
+    with pytest.raises(TypeError):
+        SessionStore()
@@ -0,0 +1,93 @@
+import asyncio
+
+import httpx
+import pytest
+
+from ai_client import AIClient, SingleFlight
+from admission import AdmissionController
+
+def test_concurrent_identical_keys_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    
+    async def fn():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+        
+    async def run():
+        return await asyncio.gather(*(flight.do("key", fn) for _ in range(5)))
+        
+    assert asyncio.run(run()) == ["result"] * 5
+    assert len(calls) == 1
+    assert flight.coalesced == 4
+    assert flight.calls == {}
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    
+    async def run():
+        return await asyncio.gather(*(flight.do(key, lambda key=key: asyncio.sleep(0, key)) for key in "abc"))
+        
+    assert asyncio.run(run()) == ["a", "b", "c"]
+    assert flight.coalesced == 0
+
+def test_exception_reaches_every_waiter_and_is_not_cached():
+    flight = SingleFlight()
+    calls = []
+    
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("model went away")
+        
+    async def run():
+        results = await asyncio.gather(*(flight.do("key", fail) for _ in range(3)), return_exceptions=True)
+        # The failed call is forgotten, so the next caller tries again
+        with pytest.raises(RuntimeError):
+            await flight.do("key", fail)
+        return results
+        
+    results = asyncio.run(run())
+    assert [str(r) for r in results] == ["model went away"] * 3
+    assert len(calls) == 2
+
+def test_cancelled_waiter_does_not_cancel_the_shared_call():
+    flight = SingleFlight()
+    
+    async def fn():
+        await asyncio.sleep(0.05)
+        return "result"
+        
+    async def run():
+        first = asyncio.create_task(flight.do("key", fn))
+        second = asyncio.create_task(flight.do("key", fn))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+        
+    assert asyncio.run(run()) == "result"
+
+def test_identical_generations_make_one_upstream_call():
+    requests = []
+    
+    async def handler(request):
+        requests.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"text": "Q1: Question 1?\nA1: Answer 1.\n\nQ2: Question 2?\nA2: Answer 2."})
+        
+    client = AIClient(base_url="http://model", admission=AdmissionController(initial_limit=8))
+    client.cache = None
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    
+    async def run():
+        return await asyncio.gather(*(
+            client.generate_questions(domain="Data Scientist", interview_type="Technical",
+                                      resume_text=None, jd_text=None, n=2)
+            for _ in range(4)
+        ))
+        
+    results = asyncio.run(run())
+    assert len(requests) == 1
+    assert all([q.question_text for q in questions] == ["Question 1?", "Question 2?"] for questions in results)
+    assert client.single_flight.coalesced == 3
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import re
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from tracing import Tracer, span
+
+def test_spans_outside_a_trace_do_nothing():
+    with span("upstream") as stage:
+        assert stage is None
+
+def test_server_timing_totals_each_stage():
+    tracer = Tracer()
+    with tracer.trace("POST /gen_questions") as trace:
+        with span("pdf"):
+            pass
+        with span("upstream", adapter="base") as upstream:
+            with span("parse") as parse:
+                pass
+        with span("upstream"):
+            pass
+            
+    assert parse.parent_id == upstream.span_id
+    assert upstream.parent_id == trace.root.span_id
+    assert re.fullmatch(r"pdf;dur=\d+\.\d, upstream;dur=\d+\.\d, parse;dur=\d+\.\d, total;dur=\d+\.\d",
+                        trace.server_timing())
+    upstream_ms = float(re.search(r"upstream;dur=([\d.]+)", trace.server_timing()).group(1))
+    expected = round(sum(s.duration for s in trace.spans if s.name == "upstream") * 1000, 1)
+    assert upstream_ms == pytest.approx(expected, abs=0.1)
+    assert tracer.get(trace.trace_id) is trace
+
+def test_errors_are_recorded_on_the_failing_span():
+    tracer = Tracer()
+    with pytest.raises(RuntimeError):
+        with tracer.trace("GET /") as trace:
+            with span("upstream"):
+                raise RuntimeError("model went away")
+                
+    assert [s.error for s in trace.spans] == ["model went away", "model went away"]
+
+def test_recent_traces_are_bounded():
+    tracer = Tracer(max_recent=2)
+    ids = []
+    for i in range(3):
+        with tracer.trace(f"GET /{i}") as trace:
+            ids.append(trace.trace_id)
+            
+    assert list(tracer.recent) == ids[1:]
+
+@pytest.mark.parametrize("export_format", ["json", "otlp"])
+def test_traces_are_exported_in_batches(export_format):
+    bodies = []
+    
+    def handler(request):
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200)
+        
+    tracer = Tracer(export_url="http://collector/v1/traces", export_format=export_format, batch_size=2)
+    for i in range(3):
+        with tracer.trace(f"GET /{i}"):
+            with span("upstream"):
+                pass
+                
+    asyncio.run(tracer._flush(httpx.AsyncClient(transport=httpx.MockTransport(handler))))
+    assert tracer.pending == []
+    assert len(bodies) == 2
+    if export_format == "json":
+        assert [len(body["traces"]) for body in bodies] == [2, 1]
+    else:
+        spans = bodies[0]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert [s["kind"] for s in spans] == [2, 1, 2, 1]
+        assert spans[1]["parentSpanId"] == spans[0]["spanId"]
+
+def test_responses_carry_server_timing_and_trace_id():
+    client = TestClient(main.app)
+    response = client.get("/sessions/trace-test-session")
+    
+    assert response.status_code == 404
+    assert re.fullmatch(r"(\w+;dur=\d+\.\d, )*total;dur=\d+\.\d", response.headers["Server-Timing"])
+    trace_id = response.headers["X-Trace-Id"]
+    assert re.fullmatch(r"[0-9a-f]{32}", trace_id)
+    
+    trace = client.get(f"/traces/{trace_id}").json()
+    assert trace["trace_id"] == trace_id
+    assert trace["name"] == "GET /sessions/{session_id}"
+    assert client.get("/traces/unknown").status_code == 404
@@ -0,0 +1,267 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Any, Iterator
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "ai-mock-interviewer-api"
+
+class Span:
+    """
+    One timed stage of a request
+    """
+    
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self._start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.error: Optional[str] = None
+        
+    def finish(self):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self._start
+            
+    @property
+    def end_ns(self) -> int:
+        return self.start_ns + int((self.duration or 0) * 1e9)
+        
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start_ns / 1e9,
+            "duration_ms": round((self.duration or 0) * 1000, 3),
+            "attributes": self.attributes,
+            "error": self.error
+        }
+        
+    def to_otlp(self) -> Dict[str, Any]:
+        otlp_span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 2 if self.parent_id is None else 1,  # SERVER for the request, INTERNAL for stages
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}} for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1}
+        }
+        if self.parent_id:
+            otlp_span["parentSpanId"] = self.parent_id
+        return otlp_span
+
+class Trace:
+    """
+    Spans recorded while handling one request
+    """
+    
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+        self.root = Span(self, name, None, attributes)
+        self.spans.append(self.root)
+        
+    def server_timing(self) -> str:
+        """
+        Build a Server-Timing header value with the total time per stage
+        
+        Returns:
+            e.g. 'pdf;dur=80.1, upstream;dur=1012.4, parse;dur=0.3, total;dur=1100.2'
+        """
+        totals: Dict[str, float] = {}
+        for stage in self.spans[1:]:
+            if stage.duration is not None:
+                totals[stage.name] = totals.get(stage.name, 0.0) + stage.duration
+        entries = [f"{name};dur={duration * 1000:.1f}" for name, duration in totals.items()]
+        if self.root.duration is not None:
+            entries.append(f"total;dur={self.root.duration * 1000:.1f}")
+        return ", ".join(entries)
+        
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name,
+            "duration_ms": round((self.root.duration or 0) * 1000, 3),
+            "spans": [stage.to_dict() for stage in self.spans]
+        }
+
+# Innermost span of the current request, None outside a traced request
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Optional[Span]]:
+    """
+    Time a stage of the current request as a child of the innermost span
+    
+    Does nothing outside a traced request.
+    
+    Args:
+        name: Stage name, also used as the Server-Timing metric name
+        **attributes: Extra details recorded on the span
+        
+    Yields:
+        The span, or None if no request is being traced
+    """
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+        
+    child = Span(parent.trace, name, parent.span_id, attributes)
+    parent.trace.spans.append(child)
+    token = current_span.set(child)
+    try:
+        yield child
+    except Exception as e:
+        child.error = str(e)
+        raise
+    finally:
+        child.finish()
+        try:
+            current_span.reset(token)
+        except ValueError:
+            # Finished in a different context (e.g. an async generator resumed elsewhere)
+            current_span.set(parent)
+
+class Tracer:
+    """
+    Starts a trace per request, keeps recent traces and exports them in batches
+    
+    Traces are exported as JSON ({"traces": [...]}) or as OTLP/HTTP JSON to
+    export_url, e.g. a local collector's http://localhost:4318/v1/traces.
+    """
+    
+    def __init__(self, export_url: Optional[str] = None, export_format: str = "json",
+                 max_recent: int = 200, batch_size: int = 50, flush_interval: float = 5):
+        if export_format not in ("json", "otlp"):
+            raise ValueError(f"Unknown trace export format: {export_format}")
+        self.export_url = export_url
+        self.export_format = export_format
+        self.max_recent = max_recent
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Recently finished traces by ID, oldest first
+        self.recent: "OrderedDict[str, Trace]" = OrderedDict()
+        self.pending: List[Trace] = []
+        self._exporter: Optional[asyncio.Task] = None
+        
+    @contextmanager
+    def trace(self, name: str, **attributes) -> Iterator[Trace]:
+        """
+        Trace the enclosed block as one request
+        
+        Args:
+            name: Request name
+            **attributes: Extra details recorded on the root span
+            
+        Yields:
+            The trace
+        """
+        trace = Trace(name, attributes)
+        token = current_span.set(trace.root)
+        try:
+            yield trace
+        except Exception as e:
+            trace.root.error = str(e)
+            raise
+        finally:
+            trace.root.finish()
+            current_span.reset(token)
+            self._record(trace)
+            
+    def _record(self, trace: Trace):
+        self.recent[trace.trace_id] = trace
+        while len(self.recent) > self.max_recent:
+            self.recent.popitem(last=False)
+        if self.export_url:
+            self.pending.append(trace)
+            # Drop the oldest traces if the collector can't keep up
+            del self.pending[:-self.batch_size * 20]
+            
+    def get(self, trace_id: str) -> Optional[Trace]:
+        """
+        Get a recently finished trace
+        
+        Args:
+            trace_id: Trace identifier (returned in the X-Trace-Id header)
+            
+        Returns:
+            Trace, or None if unknown or already evicted
+        """
+        return self.recent.get(trace_id)
+        
+    def start(self):
+        """
+        Start exporting traces in the background, if an export URL is configured
+        """
+        if not self.export_url or (self._exporter is not None and not self._exporter.done()):
+            return
+        self._exporter = asyncio.create_task(self._export_loop())
+        
+    async def stop(self):
+        """
+        Stop the exporter after sending the remaining traces
+        """
+        if self._exporter is None:
+            return
+        self._exporter.cancel()
+        try:
+            await self._exporter
+        except asyncio.CancelledError:
+            pass
+        self._exporter = None
+        async with httpx.AsyncClient(timeout=5) as client:
+            await self._flush(client)
+            
+    async def _export_loop(self):
+        async with httpx.AsyncClient(timeout=5) as client:
+            while True:
+                await asyncio.sleep(self.flush_interval)
+                await self._flush(client)
+                
+    async def _flush(self, client: httpx.AsyncClient):
+        while self.pending:
+            batch = self.pending[:self.batch_size]
+            del self.pending[:self.batch_size]
+            try:
+                response = await client.post(self.export_url, json=self._encode(batch))
+                if response.status_code >= 300:
+                    logger.warning(f"Trace export returned status {response.status_code}")
+            except httpx.HTTPError as e:
+                # Dropping traces is better than letting them pile up
+                logger.warning(f"Trace export failed, dropping {len(batch)} traces: {type(e).__name__}")
+                
+    def _encode(self, traces: List[Trace]) -> Dict[str, Any]:
+        if self.export_format == "json":
+            return {"traces": [trace.to_dict() for trace in traces]}
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{
+                    "scope": {"name": "tracing"},
+                    "spans": [stage.to_otlp() for trace in traces for stage in trace.spans]
+                }]
+            }]
+        }
+
+# Global tracer instance
+tracer = Tracer(
+    export_url=os.getenv("TRACE_EXPORT_URL") or None,
+    export_format=os.getenv("TRACE_EXPORT_FORMAT", "json"),
+    max_recent=int(os.getenv("TRACE_RECENT", "200"))
+)